@@ -1,6 +1,11 @@
-import graphviz
-def dibujar_AFD(afd, filename="afd", token_type=None):
+try:
     import graphviz
+except ImportError:
+    graphviz = None
+
+
+def afd_a_dot(afd, token_type=None):
+    """Construye el grafo (graphviz.Digraph) del AFD sin renderizarlo."""
     dot = graphviz.Digraph()
     dot.attr(rankdir='LR')
 
@@ -62,12 +67,18 @@ def dibujar_AFD(afd, filename="afd", token_type=None):
             dot.edge(origen_nombre, destino_nombre, label=simbolo, fontsize="10")
 
     dot.attr(overlap="false", splines="true", nodesep="0.5")
+    dot.format = "png"
+    return dot
+
+
+def dibujar_AFD(afd, filename="afd", token_type=None):
+    dot = afd_a_dot(afd, token_type)
     dot.render(filename, format="png", cleanup=True)
     print(f"AFD guardado como {filename}.png")
 
 
-
-def dibujar_AFN(afn, nombre_archivo, estado_a_token=None):
+def afn_a_dot(afn, estado_a_token=None):
+    """Construye el grafo (graphviz.Digraph) del AFN sin renderizarlo."""
     dot = graphviz.Digraph()
     
     # Configurar nodos
@@ -89,6 +100,12 @@ def dibujar_AFN(afn, nombre_archivo, estado_a_token=None):
                 destinos = {destinos}
             for estado_destino in destinos:
                 dot.edge(str(estado_origen), str(estado_destino), label=simbolo)
-    
+
+    dot.format = 'png'
+    return dot
+
+
+def dibujar_AFN(afn, nombre_archivo, estado_a_token=None):
+    dot = afn_a_dot(afn, estado_a_token)
     dot.render(nombre_archivo, format='png', cleanup=True)
     return dot
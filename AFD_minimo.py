@@ -1,3 +1,5 @@
+import perfilado
+
 # Función para minimizar un AFD
 def minimizar_AFD(afd, offset=0):
     estado_a_token_min = {}
@@ -7,9 +9,11 @@ def minimizar_AFD(afd, offset=0):
 
     particiones = [aceptacion, no_aceptacion]
     refinado = True
+    rondas = 0
 
     while refinado:
         refinado = False
+        rondas += 1
         nuevas_particiones = []
 
         for grupo in particiones:
@@ -29,6 +33,11 @@ def minimizar_AFD(afd, offset=0):
                 refinado = True
 
         particiones = nuevas_particiones
+    perfilado.contar("rondas_refinamiento", rondas)
+
+    # Numeración canónica: el orden de las particiones no depende del orden de iteración
+    # de los conjuntos, así el mismo AFD siempre produce los mismos nombres de estado
+    particiones = ordenar_particiones(afd, particiones)
 
     # Construcción del nuevo AFD minimizado
     estado_mapeo = {frozenset(particion): f"q{offset + idx}" for idx, particion in enumerate(particiones)}
@@ -54,7 +63,7 @@ def minimizar_AFD(afd, offset=0):
                 estado_a_token_min[nuevo_estado] = token_type
         nuevo_afd["transiciones"][nuevo_estado] = {}
 
-        for simbolo, destino in afd["transiciones"].get(representativo, {}).items():
+        for simbolo, destino in sorted(afd["transiciones"].get(representativo, {}).items()):
             nuevo_afd["transiciones"][nuevo_estado][simbolo] = estado_mapeo[
                 frozenset(encontrar_particion(destino, particiones))
             ]
@@ -67,3 +76,56 @@ def encontrar_particion(estado, particiones):
         if estado in particion:
             return frozenset(particion)  # ← Ahora devuelve un frozenset
     return frozenset()  # ← Evita errores devolviendo un frozenset vacío
+
+def ordenar_particiones(afd, particiones):
+    """
+    Ordena las particiones en recorrido BFS desde la partición inicial, visitando los
+    símbolos en orden. Las particiones no alcanzables quedan al final en un orden fijo.
+    """
+    particion_de = {}
+    for particion in particiones:
+        congelada = frozenset(particion)
+        for estado in particion:
+            particion_de[estado] = congelada
+
+    inicial = particion_de.get(afd["inicial"])
+    orden = []
+    vistos = set()
+    cola = [inicial] if inicial is not None else []
+    while cola:
+        actual = cola.pop(0)
+        if actual in vistos:
+            continue
+        vistos.add(actual)
+        orden.append(actual)
+        representativo = next(iter(actual))
+        for simbolo, destino in sorted(afd["transiciones"].get(representativo, {}).items()):
+            siguiente = particion_de.get(destino)
+            if siguiente is not None and siguiente not in vistos:
+                cola.append(siguiente)
+
+    restantes = [frozenset(p) for p in particiones if frozenset(p) not in vistos and p]
+    restantes.sort(key=lambda p: sorted(map(repr, p)))
+    return orden + restantes
+
+
+def desplazar_estados(afd, estado_a_token, desplazamiento):
+    """
+    Renombra los estados q{n} de un AFD minimizado a q{n + desplazamiento}. Permite
+    minimizar con numeración local (offset 0) y ubicar el resultado después en el
+    rango global de estados.
+    """
+    if desplazamiento == 0:
+        return afd, estado_a_token
+    nombre = {estado: f"q{int(estado[1:]) + desplazamiento}" for estado in afd["transiciones"]}
+    nuevo_afd = {
+        "estados": {nombre[e] for e in afd["estados"]},
+        "transiciones": {
+            nombre[estado]: {simbolo: nombre[destino] for simbolo, destino in trans.items()}
+            for estado, trans in afd["transiciones"].items()
+        },
+        "inicial": nombre[afd["inicial"]],
+        "aceptacion": {nombre[e] for e in afd["aceptacion"]},
+        "alfabeto": afd["alfabeto"]
+    }
+    return nuevo_afd, {nombre[e]: token for e, token in estado_a_token.items()}
@@ -1,6 +1,9 @@
 import shuntingyard as sy
 import funciones as fun
 import estructuras
+import parser_regex
+import escaner
+import perfilado
 import graphviz_utils as gv_utils
 import sys
 import io
@@ -8,8 +11,9 @@ from nullableVisitor import NullableVisitor
 from firstPosVisitor import FirstPosVisitor
 from lastPosVisitor import LastPosVisitor
 from followPosVisitor import FollowPosVisitor
-from AFDGV import dibujar_AFD, dibujar_AFN
-from AFD_minimo import minimizar_AFD
+from AFDGV import afd_a_dot, afn_a_dot
+from visualizacion import EtapaVisualizacion
+from AFD_minimo import minimizar_AFD, desplazar_estados
 from subconjuntos import fromAFNToAFD
 
 # Configurar la codificación de salida a UTF-8
@@ -39,54 +43,172 @@ def asignar_token_type_a_nodo_final(node, token_type):
 
 # Procesa una lista de expresiones (cada una es una regla en formato "(regla)#")
 # y genera el AFD minimizado para cada regla, actualizando el contador global de pos_id.
-def ERtoAFD_por_regla(lista_expresiones, pos_counter_inicial=1):
+# Con compacto=True el árbol se construye como estructuras.ArbolCompacto.
+# frontend elige cómo se obtiene el árbol: "shunting" (postfix con Shunting Yard) o
+# "descendente" (parser_regex, descenso recursivo directo desde el texto de la regla).
+FRONTENDS = ("shunting", "descendente")
+
+# Construye el AFD minimizado de una sola regla. Las posiciones empiezan en pos_inicial y
+# los estados se nombran desde offset_estados (por defecto, justo después de la última
+# posición, como en el recorrido secuencial). Devuelve None si la regla no tiene "#";
+# si no, (nombre_token, root, pos_siguiente, afd_min, estado_a_token_min, offset_siguiente).
+def construir_afd_regla(expr, pos_inicial=1, offset_estados=None, compacto=False, frontend="shunting", log=print):
+    # Asegurarse de que la expresión tenga el símbolo final "#"
+    corte = expr.rfind("#") + 1
+    if corte == 0:
+        return None
+    core = expr[:corte - 1]
+    expr_solo = f"({core})#"
+
+    nombre_token = expr[corte:].replace("-->", "").strip()
+    log("Procesando regla:", expr_solo.encode('utf-8').decode('utf-8'))
+    if frontend == "shunting":
+        # Convertir a postfix (lista de tokens tipados, sin pasar por texto)
+        with perfilado.etapa("shunting_yard"):
+            postfix = sy.convertir_infix_a_postfix_tokens(expr_solo)
+        log("Postfix:", sy.postfix_a_texto(postfix))
+        construir_arbol, fuente = estructuras.build_expression_tree, postfix
+    else:
+        construir_arbol, fuente = parser_regex.construir_arbol_regex, expr_solo
+
+    if compacto:
+        # Árbol compacto: posiciones y followpos como máscaras de bits en una pasada
+        with perfilado.etapa("arbol_expresion"):
+            arbol = construir_arbol(fuente, compacto=True)
+        arbol.tipo_token = nombre_token
+        with perfilado.etapa("visitantes"):
+            pos_siguiente = arbol.asignar_posiciones(pos_inicial)
+            siguientes = arbol.calcular_posiciones()
+        root = arbol.nodo()
+        with perfilado.etapa("construir_afd"):
+            afd = construir_afd_compacto(arbol, siguientes)
+    else:
+        # Construir el árbol de expresión (AST)
+        with perfilado.etapa("arbol_expresion"):
+            root = construir_arbol(fuente)
+        asignar_token_type_a_nodo_final(root, nombre_token)
+
+        with perfilado.etapa("visitantes"):
+            # Asignar pos_id globalmente usando assign_pos_ids
+            pos_siguiente = assign_pos_ids(root, pos_inicial)
+
+            # Calcular nullable, firstpos, lastpos y followpos
+            visitors = [NullableVisitor(), FirstPosVisitor(), LastPosVisitor(), FollowPosVisitor()]
+            for visitor in visitors:
+                root.accept(visitor)
+            followpos_table = visitors[3].get_followpos_table()
+        # Construir el AFD a partir del árbol y la tabla followpos
+        with perfilado.etapa("construir_afd"):
+            afd = construir_afd(root, followpos_table)
+    perfilado.contar("reglas")
+    perfilado.contar("posiciones", pos_siguiente - pos_inicial)
+    perfilado.contar("estados_afd_reglas", len(afd["transiciones"]))
+
+    afd["token_type_map"] = {}
+    for estado in afd["aceptacion"]:
+        afd["token_type_map"][estado] = nombre_token
+
+    # Minimizar el AFD; minimizar_AFD devuelve (afd_min, nuevo_offset, estado_a_token)
+    if offset_estados is None:
+        offset_estados = pos_siguiente
+    with perfilado.etapa("minimizar_AFD"):
+        afd_min, offset_siguiente, estado_a_token_min = minimizar_AFD(afd, offset_estados)
+    perfilado.contar("particiones", offset_siguiente - offset_estados)
+    return nombre_token, root, pos_siguiente, afd_min, estado_a_token_min, offset_siguiente
+
+def _registrar_regla(nombre_token, root, pos_counter, afd_min, estado_a_token_min, estados_counter, visualizacion):
+    # Estados de aceptación de una regla ya numerada; el árbol y el AFD minimizado
+    # se pasan a la etapa de visualización (no hace nada si el renderizado está apagado)
+    print(f"Estados de aceptación para token '{nombre_token}': {sorted(afd_min['aceptacion'])}")
+    if visualizacion is None:
+        return
+    visualizacion.registrar(gv_utils.expression_tree_a_dot, f"output/trees/expression_tree_rule_{pos_counter}", root)
+    visualizacion.registrar(afd_a_dot, f"output/afd/afd_min_rule_{estados_counter}", afd_min, token_type=estado_a_token_min)
+
+# procesos > 1 construye las reglas en paralelo (ver _ERtoAFD_en_paralelo); el
+# resultado es idéntico al del recorrido secuencial. visualizacion es una
+# EtapaVisualizacion opcional donde se registran el árbol y el AFD de cada regla.
+def ERtoAFD_por_regla(lista_expresiones, pos_counter_inicial=1, compacto=False, frontend="shunting", procesos=None,
+                      visualizacion=None):
+    if frontend not in FRONTENDS:
+        raise ValueError(f"Front end desconocido: {frontend!r}. Opciones: {FRONTENDS}")
+    if procesos is not None and procesos > 1 and len(lista_expresiones) > 1:
+        return _ERtoAFD_en_paralelo(lista_expresiones, pos_counter_inicial, compacto, frontend, procesos, visualizacion)
     afd_list = []
     pos_counter = pos_counter_inicial
     for expr in lista_expresiones:
-        # Asegurarse de que la expresión tenga el símbolo final "#"
-        corte = expr.rfind("#") + 1
-        if corte == 0:
+        resultado = construir_afd_regla(expr, pos_counter, None, compacto, frontend)
+        if resultado is None:
             continue
-        core = expr[:corte - 1]
-        expr_solo = f"({core})#"
-       
-        nombre_token = expr[corte:].replace("-->", "").strip()
-        print("Procesando regla:", expr_solo.encode('utf-8').decode('utf-8'))
-        # Convertir a postfix
-        postfix = sy.convert_infix_to_postfix(expr_solo)
-        print("Postfix:", postfix.encode('utf-8').decode('utf-8'))
-        # Construir el árbol de expresión (AST)
-        root = estructuras.build_expression_tree(postfix)
-        asignar_token_type_a_nodo_final(root, nombre_token)
-        
-        # Asignar pos_id globalmente usando assign_pos_ids
-        pos_counter = assign_pos_ids(root, pos_counter)
-        
-        # Calcular nullable, firstpos, lastpos y followpos
-        visitors = [NullableVisitor(), FirstPosVisitor(), LastPosVisitor(), FollowPosVisitor()]
-        for visitor in visitors:
-            root.accept(visitor)
-        followpos_table = visitors[3].get_followpos_table()
-        
-        # Generar imagen del árbol de expresión para esta regla
-        gv_utils.generate_expression_tree_image(root, f"output/trees/expression_tree_rule_{pos_counter}.png")
-        print("Árbol de expresión generado para regla.")
-        
-        # Construir el AFD a partir del árbol y la tabla followpos
-        afd = construir_afd(root, followpos_table)
-        afd["token_type_map"] = {}
-        for estado in afd["aceptacion"]:
-            afd["token_type_map"][estado] = nombre_token
-
-        # Minimizar el AFD; minimizar_AFD devuelve (afd_min, nuevo_offset)
-        afd_min, pos_counter, estado_a_token_min = minimizar_AFD(afd, pos_counter)
-        #afd_min["token_type"] = nombre_token
-        print(f"Estados de aceptación para token '{nombre_token}': {afd_min['aceptacion']}")
-        # Dibujar el AFD minimizado
-        dibujar_AFD(afd_min, f"output/afd/afd_min_rule_{pos_counter}", token_type=estado_a_token_min)
+        nombre_token, root, pos_regla, afd_min, estado_a_token_min, pos_counter = resultado
+        _registrar_regla(nombre_token, root, pos_regla, afd_min, estado_a_token_min, pos_counter, visualizacion)
         afd_list.append((afd_min, nombre_token))
     return afd_list, pos_counter
 
+# Trabajo de cada proceso: la regla se construye con numeración local (posiciones desde 1,
+# estados desde q0) y los mensajes se devuelven para imprimirlos en orden. Si el proceso
+# principal está perfilando, también se devuelve el reporte de la regla para sumarlo.
+def _construir_regla_en_proceso(argumentos):
+    expr, compacto, frontend, perfilar = argumentos
+    lineas = []
+    perfil = perfilado.activar() if perfilar else None
+    try:
+        resultado = construir_afd_regla(expr, 1, 0, compacto, frontend,
+                                        log=lambda *partes: lineas.append(" ".join(map(str, partes))))
+    finally:
+        if perfil is not None:
+            perfilado.desactivar()
+    return lineas, resultado, perfil.reporte() if perfil is not None else None
+
+# Las reglas son independientes salvo por los contadores globales de posiciones y estados,
+# que sólo se conocen tras construir las reglas anteriores. Cada proceso construye su regla
+# con numeración local y al unir (en el orden de las reglas) se desplazan posiciones y
+# estados al rango global. Como minimizar_AFD numera los estados de forma canónica, los
+# nombres coinciden con los del recorrido secuencial.
+def _ERtoAFD_en_paralelo(lista_expresiones, pos_counter_inicial, compacto, frontend, procesos, visualizacion):
+    from concurrent.futures import ProcessPoolExecutor
+
+    perfil = perfilado.activo()
+    trabajos = [(expr, compacto, frontend, perfil is not None) for expr in lista_expresiones]
+    afd_list = []
+    pos_counter = pos_counter_inicial
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for lineas, resultado, reporte in ejecutor.map(_construir_regla_en_proceso, trabajos):
+            for linea in lineas:
+                print(linea)
+            if reporte is not None:
+                perfil.combinar(reporte)
+            if resultado is None:
+                continue
+            nombre_token, root, pos_local, afd_min, estado_a_token_min, estados_local = resultado
+            desplazar_pos_ids(root, pos_counter - 1)
+            pos_counter += pos_local - 1
+            afd_min, estado_a_token_min = desplazar_estados(afd_min, estado_a_token_min, pos_counter)
+            estados_counter = pos_counter + estados_local
+            _registrar_regla(nombre_token, root, pos_counter, afd_min, estado_a_token_min, estados_counter, visualizacion)
+            afd_list.append((afd_min, nombre_token))
+            pos_counter = estados_counter
+    return afd_list, pos_counter
+
+# Suma delta a los pos_id (y a firstpos/lastpos) de un árbol ya numerado
+def desplazar_pos_ids(root, delta):
+    if delta == 0:
+        return
+    if isinstance(root, estructuras.NodoCompacto):
+        root.arbol.desplazar_posiciones(delta)
+        return
+    pendientes = [root]
+    while pendientes:
+        node = pendientes.pop()
+        if node is None:
+            continue
+        if node.pos_id is not None:
+            node.pos_id += delta
+        node.firstpos = {pos + delta for pos in node.firstpos}
+        node.lastpos = {pos + delta for pos in node.lastpos}
+        pendientes.append(node.left)
+        pendientes.append(node.right)
+
 # Función para construir el AFD (sin minimizar) a partir del AST y la tabla followpos
 def construir_afd(root, followpos_table):
     alfabeto = set()
@@ -142,6 +264,63 @@ def construir_afd(root, followpos_table):
         "aceptacion": list(aceptacion)
     }
 
+# Igual que construir_afd pero sobre un ArbolCompacto: los estados se exploran como
+# máscaras de bits y se convierten a frozenset de pos_id al final, de modo que el
+# resultado tiene exactamente el mismo formato.
+def construir_afd_compacto(arbol, siguientes):
+    base = arbol.base
+    mascara_por_simbolo = {}
+    pos_final = None
+    for nodo in range(len(arbol)):
+        pos = arbol.pos_id[nodo]
+        if pos < 0:
+            continue
+        simbolo = arbol.simbolos[arbol.simbolo[nodo]]
+        if simbolo == '#':
+            pos_final = pos
+        else:
+            mascara_por_simbolo[simbolo] = mascara_por_simbolo.get(simbolo, 0) | (1 << (pos - base))
+    bit_final = 1 << (pos_final - base)
+
+    def mover(estado, mascara_simbolo):
+        U = 0
+        origen = estado & mascara_simbolo
+        while origen:
+            bajo = origen & -origen
+            U |= siguientes[bajo.bit_length() - 1]
+            origen ^= bajo
+        return U
+
+    estado_inicial = arbol.primeros[arbol.izq[arbol.raiz]]
+    por_procesar = [estado_inicial]
+    procesados = {}
+    transiciones_mascara = {}
+    while por_procesar:
+        estado_actual = por_procesar.pop()
+        if estado_actual in procesados:
+            continue
+        procesados[estado_actual] = frozenset(arbol.posiciones(estado_actual))
+        transiciones = {}
+        for simbolo, mascara_simbolo in mascara_por_simbolo.items():
+            U = mover(estado_actual, mascara_simbolo)
+            if U:
+                transiciones[simbolo] = U
+                if U not in procesados:
+                    por_procesar.append(U)
+        transiciones_mascara[estado_actual] = transiciones
+
+    estados = {
+        procesados[estado]: {simbolo: procesados[destino] for simbolo, destino in trans.items()}
+        for estado, trans in transiciones_mascara.items()
+    }
+    return {
+        "estados": list(procesados.values()),
+        "alfabeto": set(mascara_por_simbolo),
+        "transiciones": estados,
+        "inicial": procesados[estado_inicial],
+        "aceptacion": [procesados[e] for e in procesados if e & bit_final]
+    }
+
 # Función simular_afd (para pruebas, se mantiene igual)
 def simular_afd(afd, cadena):
     for simbolo in cadena:
@@ -187,10 +366,11 @@ def unir_afd_individuales(afd_list):
     return afn_global, estado_a_token
 
 # Función para procesar las reglas desde un archivo txt (cada línea en formato "(regla)#")
-def procesar_reglas_y_generar_afd(rules_txt_file):
+def procesar_reglas_y_generar_afd(rules_txt_file, procesos=None, visualizacion=None):
     with open(rules_txt_file, "r", encoding="utf-8") as f:
         reglas = f.read().strip().splitlines()
-    afd_list, ultimo_contador = ERtoAFD_por_regla(reglas, pos_counter_inicial=1)
+    afd_list, ultimo_contador = ERtoAFD_por_regla(reglas, pos_counter_inicial=1, procesos=procesos,
+                                                  visualizacion=visualizacion)
     return afd_list, ultimo_contador
 
 
@@ -255,7 +435,44 @@ def convertir_formato_afd(afd):
         "aceptacion": aceptacion  # Usar la variable corregida
     }
 
-def simular_codigo_con_tokens(afd, estado_a_token, archivo_entrada, archivo_salida):
+# Con usar_mmap=True el archivo se recorre con mmap y con tam_bloque se lee por bloques
+# de ese tamaño ("-" es la entrada estándar); en ambos casos los tokens se escriben a
+# medida que se reconocen (ver escaner.py) y la salida es la misma. memo=True (con mmap)
+# usa el escaneo en tiempo lineal de Reps para entradas con muchos reinicios.
+# fragmentos=N reparte el archivo en N fragmentos escaneados en procesos separados.
+# binario=True escribe el formato binario de escaner.escribir_tokens_binario.
+# agrupar_errores=True reporta cada tramo de caracteres sin token como un solo ERROR
+# (sin agrupar, un ERROR por carácter); con la lectura completa usa el escaneo con mmap.
+def simular_codigo_con_tokens(afd, estado_a_token, archivo_entrada, archivo_salida, usar_mmap=False, tam_bloque=None,
+                              memo=False, fragmentos=None, acciones=None, header="", binario=False,
+                              agrupar_errores=False):
+    if acciones and archivo_entrada != "-":
+        # Las acciones se despachan por id de token, sobre el escáner compilado (mmap)
+        escaner.simular_archivo_mmap(afd, archivo_entrada, archivo_salida, memo, acciones, header, binario,
+                                     agrupar_errores)
+        print(f"\nTokens escritos en {archivo_salida}")
+        return
+    if archivo_entrada == "-":
+        escaner.simular_flujo(afd, sys.stdin.buffer, archivo_salida, tam_bloque or 1 << 16, binario,
+                              agrupar_errores)
+        print(f"\nTokens escritos en {archivo_salida}")
+        return
+    if tam_bloque:
+        with open(archivo_entrada, "r", encoding="utf-8") as f:
+            escaner.simular_flujo(afd, f, archivo_salida, tam_bloque, binario, agrupar_errores)
+        print(f"\nTokens escritos en {archivo_salida}")
+        return
+    if fragmentos and fragmentos > 1:
+        escaner.simular_archivo_paralelo(afd, archivo_entrada, archivo_salida, fragmentos, memo, binario,
+                                         agrupar_errores)
+        print(f"\nTokens escritos en {archivo_salida}")
+        return
+    if usar_mmap or binario or agrupar_errores:
+        escaner.simular_archivo_mmap(afd, archivo_entrada, archivo_salida, memo, binario=binario,
+                                     agrupar_errores=agrupar_errores)
+        print(f"\nTokens escritos en {archivo_salida}")
+        return
+
     with open(archivo_entrada, "r", encoding="utf-8") as f:
         codigo = f.read()
 
@@ -300,68 +517,60 @@ def simular_codigo_con_tokens(afd, estado_a_token, archivo_entrada, archivo_sali
 
     print(f"\nTokens escritos en {archivo_salida}")
 
-# Bloque principal
-if __name__ == "__main__":
-    # Limpiar todos los folders output/afd, output/afn y output/trees
-    import shutil
-    shutil.rmtree("output/afd", ignore_errors=True)
-    shutil.rmtree("output/afn", ignore_errors=True)
-    shutil.rmtree("output/trees", ignore_errors=True)
-    reglas_file = "output/final_infix.txt"
-    afd_list, ultimo_estado = procesar_reglas_y_generar_afd(reglas_file)
-    print("Se generaron", len(afd_list), "AFDs individuales.")
-    print("El contador global de estados final es:", ultimo_estado)
-    
+# Une los AFDs individuales en un AFN global y lo convierte en el AFD final con el
+# algoritmo de subconjuntos. Devuelve (afd_final, estado_a_token).
+def construir_afd_final(afd_list, visualizacion=None):
     # Unir los AFDs en un AFN global
-    afn_global, estado_a_token = unir_afd_individuales(afd_list)
+    with perfilado.etapa("unir_afd_individuales"):
+        afn_global, estado_a_token = unir_afd_individuales(afd_list)
+    perfilado.contar("estados_afn_global", len(afn_global["estados"]))
     print("\nEstados de aceptación del AFN global:")
     print(afn_global["aceptacion"])
 
     print("\nSe generó el AFN global uniendo los AFDs individuales.")
-    
-    # Asegurar que el directorio output/afn existe
-    import os
-    os.makedirs("output/afn", exist_ok=True)
-    
+
     # Visualizar el AFN global
-    dibujar_AFN(afn_global, "output/afn/afn_global", estado_a_token)
-    print("AFN global dibujado en output/afn/afn_global.png")
-    
+    if visualizacion is not None:
+        visualizacion.registrar(afn_a_dot, "output/afn/afn_global", afn_global, estado_a_token)
+
     # Normalizar las transiciones del AFN global
     afn_global = normalizar_transiciones(afn_global)
-    
+
     # Convertir el AFN a formato numérico
     afn_numerico, mapping = convertir_afn_numerico(afn_global)
     print("\nAFN convertido a formato numérico para el algoritmo de subconjuntos.")
-    
+
     # Convertir AFN a AFD usando el algoritmo de subconjuntos
-    afd_final = fromAFNToAFD(afn_numerico)
+    with perfilado.etapa("subconjuntos"):
+        afd_final = fromAFNToAFD(afn_numerico)
+    perfilado.contar("estados_afd_final", len(afd_final["transitions"]))
     print("Los estados finales son:", afd_final["accepted"])
     print("\nSe generó el AFD final usando el algoritmo de subconjuntos.")
-    
-    # El AFD devuelto por fromAFNToAFD no tiene el formato esperado por dibujar_AFD,
-    # por lo que primero necesitamos convertirlo
-    afd_inicial_formato = {
-        "estados": set(afd_final["transitions"].keys()),
-        "transiciones": afd_final["transitions"],
-        "inicial": afd_final["inicial"],
-        "aceptacion": afd_final.get("accepted", [])
-    }
-    
-    # Agregar todos los estados que aparecen en las transiciones
-    for _, transiciones in afd_final["transitions"].items():
-        for _, destinos in transiciones.items():
-            if isinstance(destinos, (set, frozenset)):
-               for s in destinos:
-                    afd_inicial_formato["estados"].add(frozenset([s]) if isinstance(s, int) else s)
-            else:
-                afd_inicial_formato["estados"].add(frozenset([destinos]) if isinstance(destinos, int) else destinos)
 
-    afd_inicial_formato["estados"] = {e for e in afd_inicial_formato["estados"] if isinstance(e, frozenset)}
+    if visualizacion is not None and visualizacion.habilitada:
+        # El AFD devuelto por fromAFNToAFD no tiene el formato esperado por afd_a_dot,
+        # por lo que primero necesitamos convertirlo
+        afd_inicial_formato = {
+            "estados": set(afd_final["transitions"].keys()),
+            "transiciones": afd_final["transitions"],
+            "inicial": afd_final["inicial"],
+            "aceptacion": afd_final.get("accepted", [])
+        }
+
+        # Agregar todos los estados que aparecen en las transiciones
+        for _, transiciones in afd_final["transitions"].items():
+            for _, destinos in transiciones.items():
+                if isinstance(destinos, (set, frozenset)):
+                    for s in destinos:
+                        afd_inicial_formato["estados"].add(frozenset([s]) if isinstance(s, int) else s)
+                else:
+                    afd_inicial_formato["estados"].add(frozenset([destinos]) if isinstance(destinos, int) else destinos)
+
+        afd_inicial_formato["estados"] = {e for e in afd_inicial_formato["estados"] if isinstance(e, frozenset)}
+
+        # Guardar versión inicial del AFD
+        visualizacion.registrar(afd_a_dot, "output/afd/afd_inicial_subconjuntos", afd_inicial_formato)
 
-    # Guardar versión inicial del AFD
-    dibujar_AFD(afd_inicial_formato, "output/afd/afd_inicial_subconjuntos")
-    
     # Si el AFD no tiene estados de aceptación, asignar los estados que contengan algún estado de aceptación del AFN
     if "accepted" in afd_final and (not afd_final["accepted"] or len(afd_final["accepted"]) == 0):
         print("AVISO: El AFD generado no tiene estados de aceptación. Intentando recuperarlos del AFN original.")
@@ -371,11 +580,11 @@ if __name__ == "__main__":
             # Si el estado del AFD (que es un conjunto de estados del AFN) contiene algún estado de aceptación del AFN
             if any(estado_afn in afn_numerico["aceptacion"] for estado_afn in estado_afd):
                 estados_afd_aceptacion.append(estado_afd)
-        
+
         # Asignar los estados de aceptación recuperados
         afd_final["accepted"] = estados_afd_aceptacion
         print(f"Se recuperaron {len(estados_afd_aceptacion)} estados de aceptación para el AFD.")
-    
+
     # Convertir el formato del AFD para la visualización
     afd_final = convertir_formato_afd(afd_final)
     afd_final["estados"] = {e for e in afd_final["estados"] if isinstance(e, frozenset)}
@@ -392,7 +601,7 @@ if __name__ == "__main__":
                 if nombre_original in estado_a_token:
                     estado_final_con_token_nuevo[estado] = estado_a_token[nombre_original]
                     break
-    
+
     afd_final["token_type_map"] = estado_final_con_token_nuevo
     print("\nVerificación de estados de aceptación y tokens en afd_final:")
     for estado in afd_final["aceptacion"]:
@@ -405,9 +614,85 @@ if __name__ == "__main__":
         for estado, token in afd_final["token_type_map"].items():
             print(f"  {estado} => {token}")
 
-    # Generar visualización del AFD final después de la recuperación de estados
-    dibujar_AFD(afd_final, "output/afd/afd_final_subconjuntos",  token_type=estado_final_con_token_nuevo)
-    print("\nSe generó la visualización del AFD final en output/afd/afd_final_subconjuntos")
-    simular_codigo_con_tokens(afd_final, estado_a_token, "output/tokens/test_yalp4.txt", "output/tokens/tokens_yalp4.txt")
-    print("\nSimulación de código con tokens completada. Tokens escritos en output/tokens/tokens_yalp4.txt")
-    print("Fin del proceso.")
\ No newline at end of file
+    # Visualización del AFD final después de la recuperación de estados
+    if visualizacion is not None:
+        visualizacion.registrar(afd_a_dot, "output/afd/afd_final_subconjuntos", afd_final,
+                                token_type=estado_final_con_token_nuevo)
+    return afd_final, estado_a_token
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Genera el AFD del analizador léxico y tokeniza un archivo de entrada")
+    parser.add_argument("--reglas", default="output/final_infix.txt",
+                        help="Archivo con las reglas en formato infix (salida de yalex_parser)")
+    parser.add_argument("--entrada", default="output/tokens/test_yalp4.txt",
+                        help="Archivo a tokenizar ('-' para leer de la entrada estándar)")
+    parser.add_argument("--salida", default="output/tokens/tokens_yalp4.txt", help="Archivo de tokens de salida")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Construir los AFD de las reglas en paralelo con N procesos")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Recorrer el archivo de entrada con mmap y escribir los tokens en streaming")
+    parser.add_argument("--memo", action="store_true",
+                        help="Con --mmap o --fragmentos, escaneo en tiempo lineal (tabulación de Reps)")
+    parser.add_argument("--fragmentos", type=int, default=None,
+                        help="Escanear la entrada en N fragmentos en paralelo (un proceso por fragmento)")
+    parser.add_argument("--bloque", type=int, default=None,
+                        help="Leer la entrada en bloques de N caracteres (tuberías, sockets)")
+    parser.add_argument("--yal", default=None,
+                        help="Archivo .yal cuyas acciones { ... } se ejecutan al tokenizar (omite --bloque y --fragmentos)")
+    parser.add_argument("--binario", action="store_true",
+                        help="Escribir los tokens en formato binario (ver escaner.escribir_tokens_binario) "
+                             "en lugar del formato de texto")
+    parser.add_argument("--agrupar-errores", action="store_true",
+                        help="Reportar cada tramo de caracteres sin token como un solo ERROR")
+    parser.add_argument("--perfil", default=None,
+                        help="Escribir un reporte JSON con el tiempo de cada etapa y los contadores de la "
+                             "construcción (también con PERFIL_LEXER=directorio)")
+    parser.add_argument("--render", action="store_true", default=None,
+                        help="Generar las imágenes de árboles y autómatas (también con RENDER_GRAPHVIZ=1)")
+    args = parser.parse_args(argv)
+
+    perfil = perfilado.iniciar("ERtoAFD2", args.perfil)
+    if perfil is not None:
+        perfil.anotar("reglas", args.reglas)
+        perfil.anotar("entrada", args.entrada)
+        perfil.anotar("procesos", args.procesos)
+    visualizacion = EtapaVisualizacion(habilitada=args.render)
+    if visualizacion.habilitada:
+        # Limpiar las imágenes anteriores de output/afd, output/afn y output/trees
+        import shutil
+        shutil.rmtree("output/afd", ignore_errors=True)
+        shutil.rmtree("output/afn", ignore_errors=True)
+        shutil.rmtree("output/trees", ignore_errors=True)
+
+    with perfilado.etapa("afd_por_regla"):
+        afd_list, ultimo_estado = procesar_reglas_y_generar_afd(args.reglas, procesos=args.procesos,
+                                                                visualizacion=visualizacion)
+    print("Se generaron", len(afd_list), "AFDs individuales.")
+    print("El contador global de estados final es:", ultimo_estado)
+
+    with perfilado.etapa("afd_final"):
+        afd_final, estado_a_token = construir_afd_final(afd_list, visualizacion)
+
+    header, acciones = "", None
+    if args.yal:
+        import yalex_parser
+        header, acciones = yalex_parser.leer_acciones_yal(args.yal)
+
+    with perfilado.etapa("tokenizar_entrada"):
+        simular_codigo_con_tokens(afd_final, estado_a_token, args.entrada, args.salida, usar_mmap=args.mmap,
+                                  tam_bloque=args.bloque, memo=args.memo, fragmentos=args.fragmentos,
+                                  acciones=acciones, header=header, binario=args.binario,
+                                  agrupar_errores=args.agrupar_errores)
+    print(f"\nSimulación de código con tokens completada. Tokens escritos en {args.salida}")
+
+    if visualizacion.habilitada:
+        # Esperar a que terminen las imágenes que se generan en segundo plano
+        with perfilado.etapa("renderizado"):
+            visualizacion.esperar()
+    perfilado.terminar()
+    print("Fin del proceso.")
+
+# Bloque principal
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compara los front ends de expresiones regulares sobre las reglas incluidas:
+  - shunting:    tokenizar -> concatenación -> expansión -> Shunting Yard -> árbol
+  - descendente: parser_regex (descenso recursivo directo al árbol)
+para árboles Node y ArbolCompacto.
+
+Uso: python benchmarks/bench_frontend_regex.py [archivo_reglas] [repeticiones]
+"""
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import shuntingyard as sy
+import estructuras
+import parser_regex
+
+
+def cargar_reglas(archivo):
+    reglas = []
+    with open(archivo, "r", encoding="utf-8") as f:
+        for expr in f.read().strip().splitlines():
+            corte = expr.rfind("#") + 1
+            if corte:
+                reglas.append(f"({expr[:corte - 1]})#")
+    return reglas
+
+
+def forma(nodo):
+    """Estructura (valor, izq, der) de un árbol para comparar ambos front ends."""
+    if nodo is None:
+        return None
+    return (nodo.value, forma(nodo.left), forma(nodo.right))
+
+
+def por_shunting(regla, compacto):
+    return estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens(regla), compacto=compacto)
+
+
+def por_descenso(regla, compacto):
+    return parser_regex.construir_arbol_regex(regla, compacto=compacto)
+
+
+def medir(funcion, reglas, compacto, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for regla in reglas:
+            funcion(regla, compacto)
+    return time.perf_counter() - inicio
+
+
+def main():
+    archivo = sys.argv[1] if len(sys.argv) > 1 else os.path.join(RAIZ, "output", "final_infix.txt")
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    reglas = cargar_reglas(archivo)
+
+    for regla in reglas:
+        assert forma(por_shunting(regla, False)) == forma(por_descenso(regla, False)), regla
+        assert forma(por_shunting(regla, True).nodo()) == forma(por_descenso(regla, True).nodo()), regla
+
+    print(f"{len(reglas)} reglas de {archivo}, {repeticiones} repeticiones")
+    print(f"{'front end':<14} {'árbol':<10} {'total (s)':>10} {'por regla (µs)':>15}")
+    for nombre, funcion in (("shunting", por_shunting), ("descendente", por_descenso)):
+        for compacto in (False, True):
+            total = medir(funcion, reglas, compacto, repeticiones)
+            por_regla = total / (repeticiones * len(reglas)) * 1e6
+            print(f"{nombre:<14} {'compacto' if compacto else 'Node':<10} {total:>10.3f} {por_regla:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compara el escáner compilado con y sin la tabulación de Reps (escaner.escanear_bytes
+con memo=False / memo=True) sobre entradas adversariales:
+  - reglas a*b y a, entrada aaaa...a sin b: cada token 'a' relee el resto de la entrada
+  - reglas (ab)*c y a, entrada abab...ab: lo mismo con un prefijo de dos caracteres
+Sin memo el tiempo crece cuadráticamente con n; con memo, linealmente.
+
+Uso: python benchmarks/bench_maximal_munch.py [n_maximo]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import ERtoAFD2
+import escaner
+
+CASOS = {
+    "a*b | a": (["(a*b)# --> AB", "(a)# --> A"], "a"),
+    "(ab)*c | a": (["((ab)*c)# --> ABC", "(a)# --> A"], "ab"),
+}
+
+
+def compilar_reglas(reglas):
+    with contextlib.redirect_stdout(io.StringIO()):
+        afd_list, _ = ERtoAFD2.ERtoAFD_por_regla(reglas)
+        afd_final, _ = ERtoAFD2.construir_afd_final(afd_list)
+    return escaner.compilar_afd(afd_final)
+
+
+def medir(afd, datos, memo):
+    inicio = time.perf_counter()
+    tokens = sum(1 for _ in escaner.escanear_bytes(afd, datos, memo))
+    return time.perf_counter() - inicio, tokens
+
+
+def main():
+    n_maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    tamanos = []
+    n = 1000
+    while n <= n_maximo:
+        tamanos.append(n)
+        n *= 2
+
+    for nombre, (reglas, patron) in CASOS.items():
+        afd = compilar_reglas(reglas)
+        print(f"\nReglas {nombre}, entrada {patron!r} * k")
+        print(f"{'n (bytes)':>10} {'tokens':>8} {'sin memo (s)':>13} {'con memo (s)':>13} {'µs/byte memo':>13}")
+        for n in tamanos:
+            datos = (patron * (n // len(patron))).encode("utf-8")
+            assert list(escaner.escanear_bytes(afd, datos)) == list(escaner.escanear_bytes(afd, datos, True))
+            sin_memo, tokens = medir(afd, datos, False)
+            con_memo, _ = medir(afd, datos, True)
+            print(f"{len(datos):>10} {tokens:>8} {sin_memo:>13.4f} {con_memo:>13.4f} {con_memo / len(datos) * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compara los lectores de archivos de tokens de lexical_interface (líneas por segundo):
+  - TokenFileReader.read_tokens_from_file: línea por línea con custom_match
+  - TokenFileReader.read_detailed_tokens_from_file: además crea un LexicalToken por línea
+  - TokenFileReader.read_tokens_bulk: por bloques, nombres -> ids con una regex y un dict
+  - TokenFileReader.read_token_ids_from_file: sólo los ids (array('H')) y la tabla de nombres
+La entrada se arma repitiendo syntactic_analyzer/resources/tokens_yalp2.txt.
+
+Uso: python benchmarks/bench_token_reader.py [lineas]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "syntactic_analyzer"))
+
+from lexical_interface import TokenFileReader
+
+MUESTRA = os.path.join(RAIZ, "syntactic_analyzer", "resources", "tokens_yalp2.txt")
+
+LECTORES = {
+    "read_tokens_from_file": TokenFileReader.read_tokens_from_file,
+    "read_detailed_tokens_from_file": TokenFileReader.read_detailed_tokens_from_file,
+    "read_tokens_bulk": TokenFileReader.read_tokens_bulk,
+    "read_token_ids_from_file": TokenFileReader.read_token_ids_from_file,
+}
+
+
+def generar_entrada(ruta, lineas):
+    with open(MUESTRA, "rb") as f:
+        muestra = [linea for linea in f.read().splitlines(keepends=True) if linea.strip()]
+    with open(ruta, "wb") as f:
+        completas, resto = divmod(lineas, len(muestra))
+        data = b"".join(muestra)
+        for _ in range(completas):
+            f.write(data)
+        f.writelines(muestra[:resto])
+
+
+def medir(lector, ruta):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = lector(ruta)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "tokens.txt")
+        generar_entrada(ruta, lineas)
+        print(f"{lineas} líneas, {os.path.getsize(ruta) / 1e6:.1f} MB")
+
+        base = None
+        esperado = None
+        print(f"{'lector':<32} {'tiempo (s)':>11} {'líneas/s':>12} {'x':>7}")
+        for nombre, lector in LECTORES.items():
+            tiempo, resultado = medir(lector, ruta)
+            if nombre == "read_tokens_from_file":
+                esperado = resultado
+            elif nombre == "read_tokens_bulk":
+                assert resultado == esperado
+            base = base or tiempo
+            print(f"{nombre:<32} {tiempo:>11.3f} {lineas / tiempo:>12,.0f} {base / tiempo:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
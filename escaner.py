@@ -0,0 +1,1131 @@
+"""
+Escáner del analizador léxico sobre el AFD final.
+
+compilar_afd convierte el AFD de ERtoAFD2 (estados frozenset, transiciones en dicts
+anidados) a una forma compacta: estados enteros, una tabla de transiciones por estado
+(carácter -> estado) y el id de token de cada estado de aceptación.
+
+escanear_mmap recorre el archivo de entrada a través de un mmap en lugar de leerlo
+completo a un str, y los tokens se van escribiendo a medida que se reconocen, de modo
+que la memoria usada no depende del tamaño del archivo. La entrada se interpreta como
+UTF-8: los bytes ASCII se resuelven directamente y los caracteres multibyte se decodifican
+uno a uno. Igual que al abrir el archivo en modo texto, \\r\\n y \\r se leen como \\n.
+
+escanear_bloques/escanear_flujo consumen la entrada en bloques de tamaño fijo (tuberías,
+sockets): el lexema sin terminar y el último punto de aceptación se conservan entre
+bloques, así el resultado es el mismo que con el texto completo.
+
+Las acciones { ... } de las reglas del .yal se compilan una sola vez (compilar_acciones)
+a una lista de funciones indexada por id de token, así aplicarlas cuesta una llamada
+por token sin buscar el nombre del token.
+
+Los tokens se escriben en el formato de texto `TOKEN 'lexema'` (útil para depurar) o en
+el formato binario de escribir_tokens_binario: encabezado con la tabla de nombres y un
+registro (id, largo, bytes UTF-8) por token, sin relleno ni escapes.
+
+El escaneo no lleva la cuenta de líneas: IndiceLineas guarda el inicio de cada línea
+(una pasada de find sobre el buffer) y la línea/columna de un offset se calcula con
+bisect sólo para los tokens que la necesitan (errores, acciones que usan linea/columna).
+
+exportar_afd copia las tablas planas del AFD (AFDPlano) a memoria compartida o a un
+archivo; adjuntar_afd/cargar_afd las usan sin copiarlas desde otros procesos.
+
+Con agrupar_errores cada tramo de caracteres que no forman ningún token se reporta como
+un solo ERROR en lugar de uno por carácter: el escaneo salta directamente al siguiente
+carácter que puede iniciar un token (los que tienen transición desde el estado inicial).
+
+escanear_paralelo divide un archivo grande en fragmentos alineados a saltos de línea,
+los escanea en procesos separados y une los resultados resincronizando en los bordes.
+"""
+
+import io
+import mmap
+import os
+from array import array
+import re
+import textwrap
+from bisect import bisect_left, bisect_right
+
+ERROR = "ERROR"
+UNKNOWN = "UNKNOWN"
+
+# El id 0 está reservado para ERROR (carácter sin token)
+ID_ERROR = 0
+SIN_TOKEN = -1
+
+# Encabezado del archivo binario de tokens: firma y versión del formato. El formato
+# completo se escribe en escribir_tokens_binario y se lee en leer_encabezado_binario y
+# leer_registros_binario (lexical_interface los usa para leer sin copiar los lexemas)
+MAGIA_BINARIA = b"TOKB\x01"
+
+# Valor que devuelve una acción para descartar el token (p. ej. espacios en blanco)
+OMITIR = object()
+
+_ASCII = [chr(b) for b in range(128)]
+# Un byte que no forma un carácter UTF-8 válido se lee como su escape sustituto
+# (U+DC80..U+DCFF, como errors='surrogateescape'): no tiene transiciones en el AFD
+_INVALIDO = [chr(0xDC00 + b) for b in range(256)]
+_CR = 0x0D
+_LF = 0x0A
+
+
+class AFDCompilado:
+    """
+    AFD con estados numerados 0..n-1.
+
+    transiciones[e] es un dict carácter -> estado; token_estado[e] es el id del token
+    que acepta e (SIN_TOKEN si no es de aceptación) y nombres_token[id] su nombre.
+    """
+    __slots__ = ('inicial', 'transiciones', 'token_estado', 'nombres_token', 'estados')
+
+    def __init__(self, inicial, transiciones, token_estado, nombres_token, estados):
+        self.inicial = inicial
+        self.transiciones = transiciones
+        self.token_estado = token_estado
+        self.nombres_token = nombres_token
+        self.estados = estados
+
+    def __len__(self):
+        return len(self.transiciones)
+
+
+def compilar_afd(afd):
+    """
+    Compila el AFD (formato de ERtoAFD2.construir_afd_final, con "token_type_map").
+    Los estados de aceptación sin token asociado aceptan UNKNOWN, como en
+    simular_codigo_con_tokens.
+    """
+    indice = {}
+    estados = []
+
+    def id_de(estado):
+        numero = indice.get(estado)
+        if numero is None:
+            numero = indice[estado] = len(estados)
+            estados.append(estado)
+        return numero
+
+    id_de(afd["inicial"])
+    for estado, trans in afd["transiciones"].items():
+        id_de(estado)
+        for destino in trans.values():
+            id_de(destino)
+
+    transiciones = [{} for _ in estados]
+    for estado, trans in afd["transiciones"].items():
+        tabla = transiciones[indice[estado]]
+        for simbolo, destino in trans.items():
+            tabla[simbolo] = indice[destino]
+
+    nombres_token = [ERROR]
+    id_token = {ERROR: ID_ERROR}
+    token_estado = array('h', [SIN_TOKEN]) * len(estados)
+    token_type_map = afd.get("token_type_map", {})
+    # En orden de estado, para que los ids de token no dependan del orden del conjunto
+    aceptacion = sorted(indice[estado] for estado in afd["aceptacion"] if estado in indice)
+    for numero in aceptacion:
+        estado = estados[numero]
+        nombre = token_type_map.get(estado, UNKNOWN)
+        if not nombre:
+            # Igual que en simular_codigo_con_tokens, un token vacío no cuenta como aceptación
+            continue
+        if nombre not in id_token:
+            id_token[nombre] = len(nombres_token)
+            nombres_token.append(nombre)
+        token_estado[numero] = id_token[nombre]
+
+    return AFDCompilado(indice[afd["inicial"]], transiciones, token_estado, nombres_token, estados)
+
+
+def _caracter(datos, i):
+    """
+    Decodifica el carácter UTF-8 que empieza en el byte i. Devuelve (carácter, siguiente).
+    Un byte inicial inválido, un byte de continuación suelto o una secuencia truncada
+    se lee como un carácter de un byte sin transiciones (un ERROR para el escaneo).
+    """
+    b = datos[i]
+    if b < 0x80:
+        if b == _CR:
+            # \r\n y \r se normalizan a \n (newline universal del modo texto)
+            if i + 1 < len(datos) and datos[i + 1] == _LF:
+                return '\n', i + 2
+            return '\n', i + 1
+        return _ASCII[b], i + 1
+    if b >= 0xF0:
+        largo = 4
+    elif b >= 0xE0:
+        largo = 3
+    else:
+        largo = 2
+    try:
+        return bytes(datos[i:i + largo]).decode('utf-8'), i + largo
+    except UnicodeDecodeError:
+        return _INVALIDO[b], i + 1
+
+
+def escanear_bytes(afd, datos, memo=False, inicio=0, agrupar_errores=False):
+    """
+    Escanea un buffer de bytes UTF-8 (bytes, bytearray, memoryview o mmap) con la regla
+    del lexema más largo. Genera (id_token, inicio, fin) con offsets en bytes; un carácter
+    que no inicia ningún token se reporta como ID_ERROR.
+
+    Con memo=True se usa la tabulación de Reps (ver _escanear_bytes_memo), que garantiza
+    tiempo lineal aun en entradas que obligan a releer muchas veces el mismo texto.
+    inicio es el offset (inicio de carácter) desde el que se escanea.
+    Con agrupar_errores=True cada tramo de caracteres sin token es un solo ID_ERROR
+    (ver _escanear_agrupando).
+    """
+    if agrupar_errores:
+        return _escanear_agrupando(afd, datos, memo, inicio)
+    if memo:
+        return _escanear_bytes_memo(afd, datos, inicio)
+    return _escanear_bytes(afd, datos, inicio)
+
+
+def _escanear_bytes(afd, datos, inicio):
+    transiciones = afd.transiciones
+    token_estado = afd.token_estado
+    inicial = afd.inicial
+    ascii_ = _ASCII
+    n = len(datos)
+    i = inicio
+    while i < n:
+        estado = inicial
+        ultimo_token = SIN_TOKEN
+        ultimo_fin = i
+        j = i
+        while j < n:
+            b = datos[j]
+            if b < 0x80 and b != _CR:
+                c = ascii_[b]
+                k = j + 1
+            else:
+                c, k = _caracter(datos, j)
+            siguiente = transiciones[estado].get(c)
+            if siguiente is None:
+                break
+            estado = siguiente
+            j = k
+            if token_estado[estado] != SIN_TOKEN:
+                ultimo_token = token_estado[estado]
+                ultimo_fin = j
+
+        if ultimo_token != SIN_TOKEN:
+            yield ultimo_token, i, ultimo_fin
+            i = ultimo_fin
+        else:
+            _, k = _caracter(datos, i)
+            yield ID_ERROR, i, k
+            i = k
+
+
+def _escanear_bytes_memo(afd, datos, inicio):
+    """
+    Maximal munch tabulado (Reps, "Maximal-munch tokenization in linear time", 1998).
+
+    Tras un lexema aceptado (o un ERROR) el escaneo se reinicia antes de donde llegó el
+    AFD, y puede volver a recorrer el mismo texto desde los mismos estados: con reglas
+    como a*b y una entrada aaaa... sin b, cada reinicio llega hasta el final y el costo
+    es cuadrático. Los pares (estado, posición) visitados después del último estado de
+    aceptación no llevan a ninguna aceptación; se guardan como fallidos y un escaneo
+    posterior que llegue a uno de ellos se corta ahí. Cada par falla a lo sumo una vez.
+    """
+    transiciones = afd.transiciones
+    token_estado = afd.token_estado
+    inicial = afd.inicial
+    ascii_ = _ASCII
+    n_estados = len(transiciones)
+    fallidos = set()
+    n = len(datos)
+    i = inicio
+    while i < n:
+        estado = inicial
+        ultimo_token = SIN_TOKEN
+        ultimo_fin = i
+        visitados = []
+        j = i
+        while j < n:
+            clave = j * n_estados + estado
+            if clave in fallidos:
+                break
+            visitados.append(clave)
+            b = datos[j]
+            if b < 0x80 and b != _CR:
+                c = ascii_[b]
+                k = j + 1
+            else:
+                c, k = _caracter(datos, j)
+            siguiente = transiciones[estado].get(c)
+            if siguiente is None:
+                break
+            estado = siguiente
+            j = k
+            if token_estado[estado] != SIN_TOKEN:
+                ultimo_token = token_estado[estado]
+                ultimo_fin = j
+                visitados.clear()
+        fallidos.update(visitados)
+
+        if ultimo_token != SIN_TOKEN:
+            yield ultimo_token, i, ultimo_fin
+            i = ultimo_fin
+        else:
+            _, k = _caracter(datos, i)
+            yield ID_ERROR, i, k
+            i = k
+
+
+def caracteres_iniciales(afd):
+    """Caracteres con transición desde el estado inicial (los únicos que pueden iniciar un token)."""
+    return set(afd.transiciones[afd.inicial])
+
+
+def _patron_sin_inicio(afd):
+    """
+    Expresión regular (sobre bytes) para un tramo de bytes que no puede iniciar ningún
+    token. Un carácter multibyte inicial se representa por su primer byte, así el tramo
+    nunca corta un carácter y, si se detiene en uno que tampoco inicia un token, el
+    escaneo lo reporta como error y el tramo continúa.
+    """
+    iniciales = set()
+    for c in caracteres_iniciales(afd):
+        iniciales.add(c.encode('utf-8')[0])
+        if c == '\n':
+            # \r y \r\n se leen como \n
+            iniciales.add(_CR)
+    if not iniciales:
+        return re.compile(b'.+', re.DOTALL)
+    clase = b''.join(re.escape(bytes([b])) for b in sorted(iniciales))
+    return re.compile(b'[^' + clase + b']+')
+
+
+def _escanear_agrupando(afd, datos, memo, inicio):
+    """
+    Escaneo con recuperación de errores: al encontrar un carácter sin token se saltan de
+    una vez los bytes siguientes que no pueden iniciar un token (según las transiciones
+    del estado inicial) y el escaneo se reinicia ahí; los errores consecutivos se
+    reportan como un solo ID_ERROR que cubre todo el tramo. Los demás tokens son los
+    mismos que sin agrupar. Con memo=True la tabulación se reinicia tras cada salto.
+    """
+    sin_inicio = _patron_sin_inicio(afd).match
+    error_inicio = -1
+    error_fin = -1
+    pos = inicio
+    n = len(datos)
+    while pos < n:
+        reanudar = -1
+        for id_token, ini, fin in escanear_bytes(afd, datos, memo, pos):
+            if id_token == ID_ERROR:
+                if error_inicio < 0:
+                    error_inicio = ini
+                salto = sin_inicio(datos, fin)
+                if salto is not None:
+                    error_fin = reanudar = salto.end()
+                    break
+                error_fin = fin
+                continue
+            if error_inicio >= 0:
+                yield ID_ERROR, error_inicio, error_fin
+                error_inicio = -1
+            yield id_token, ini, fin
+        if reanudar < 0:
+            break
+        pos = reanudar
+    if error_inicio >= 0:
+        yield ID_ERROR, error_inicio, error_fin
+
+
+def unir_errores(tokens):
+    """
+    Une los ERROR consecutivos de una secuencia de (lexema, token) en uno solo, para los
+    escaneos que no pueden saltar en la entrada (por bloques, en paralelo). El resultado
+    es el mismo que con escanear_bytes(..., agrupar_errores=True).
+    """
+    errores = []
+    for texto, token in tokens:
+        if token == ERROR:
+            errores.append(texto)
+            continue
+        if errores:
+            yield "".join(errores), ERROR
+            errores = []
+        yield texto, token
+    if errores:
+        yield "".join(errores), ERROR
+
+
+def lexema(datos, inicio, fin):
+    """
+    Texto del lexema entre los offsets en bytes (con los saltos de línea normalizados).
+    Los bytes inválidos quedan como escapes sustitutos, igual que en _caracter.
+    """
+    texto = bytes(datos[inicio:fin]).decode('utf-8', 'surrogateescape')
+    if '\r' in texto:
+        texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+    return texto
+
+
+def escanear_mmap(afd, archivo_entrada, memo=False, acciones=None, agrupar_errores=False):
+    """
+    Genera (lexema, token) para el archivo de entrada recorriéndolo con mmap, sin
+    cargarlo completo en memoria. El mapeo se cierra al agotar el generador.
+    memo activa el escaneo en tiempo lineal de escanear_bytes. Con acciones (de
+    compilar_acciones) se ejecuta la acción de cada token y se omiten los que devuelven
+    OMITIR. agrupar_errores reporta cada tramo sin token como un solo ERROR.
+    """
+    nombres = afd.nombres_token
+    with open(archivo_entrada, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap no admite archivos vacíos
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            if acciones is None:
+                for id_token, inicio, fin in escanear_bytes(afd, datos, memo, 0, agrupar_errores):
+                    yield lexema(datos, inicio, fin), nombres[id_token]
+            else:
+                for texto, token, _ in escanear_con_acciones(afd, datos, acciones, memo, agrupar_errores):
+                    yield texto, token
+
+
+def escribir_tokens(tokens, archivo_salida):
+    """Escribe los pares (lexema, token) a medida que se generan. Devuelve cuántos escribió."""
+    total = 0
+    with open(archivo_salida, "w", encoding="utf-8") as f:
+        for lexema_, token in tokens:
+            f.write(f"{token:<15} {lexema_!r}\n")
+            total += 1
+    return total
+
+
+def _varint(n, salida):
+    """Agrega n (>= 0) a salida en base 128, 7 bits por byte, el menos significativo primero."""
+    while n >= 0x80:
+        salida.append((n & 0x7F) | 0x80)
+        n >>= 7
+    salida.append(n)
+
+
+def escribir_tokens_binario(tokens, archivo_salida, nombres):
+    """
+    Escribe los pares (lexema, token) en formato binario. Devuelve cuántos escribió.
+
+    Formato:
+        MAGIA_BINARIA
+        varint n, y n nombres de token (varint largo + UTF-8); el id es la posición
+        por token: varint id, varint largo en bytes, lexema en UTF-8
+    Los escapes sustitutos de un lexema (bytes inválidos de la entrada) se escriben
+    como los bytes originales.
+    """
+    id_de = {nombre: i for i, nombre in enumerate(nombres)}
+    buf = bytearray(MAGIA_BINARIA)
+    _varint(len(nombres), buf)
+    for nombre in nombres:
+        datos = nombre.encode('utf-8')
+        _varint(len(datos), buf)
+        buf += datos
+    total = 0
+    with open(archivo_salida, "wb") as f:
+        for lexema_, token in tokens:
+            id_token = id_de[token]
+            datos = lexema_.encode('utf-8', 'surrogateescape')
+            largo = len(datos)
+            if id_token < 0x80:
+                buf.append(id_token)
+            else:
+                _varint(id_token, buf)
+            if largo < 0x80:
+                buf.append(largo)
+            else:
+                _varint(largo, buf)
+            buf += datos
+            total += 1
+            if len(buf) >= 1 << 20:
+                f.write(buf)
+                buf.clear()
+        f.write(buf)
+    return total
+
+
+def leer_varint(datos, pos):
+    """Lee un entero escrito con _varint a partir de pos. Devuelve (valor, siguiente)."""
+    valor = 0
+    desplazamiento = 0
+    while True:
+        b = datos[pos]
+        pos += 1
+        valor |= (b & 0x7F) << desplazamiento
+        if b < 0x80:
+            return valor, pos
+        desplazamiento += 7
+
+
+def leer_encabezado_binario(datos):
+    """
+    Lee la firma y la tabla de nombres de un archivo de escribir_tokens_binario.
+    Devuelve (nombres, offset del primer registro), o None si no empieza con MAGIA_BINARIA.
+    """
+    if datos[:len(MAGIA_BINARIA)] != MAGIA_BINARIA:
+        return None
+    pos = len(MAGIA_BINARIA)
+    n_nombres, pos = leer_varint(datos, pos)
+    nombres = []
+    for _ in range(n_nombres):
+        largo, pos = leer_varint(datos, pos)
+        nombres.append(bytes(datos[pos:pos + largo]).decode('utf-8'))
+        pos += largo
+    return nombres, pos
+
+
+def leer_registros_binario(datos, pos, ids, inicios, fines):
+    """
+    Lee los registros (varint id, varint largo, lexema) desde pos hasta el final de datos
+    y agrega a ids, inicios y fines el id de cada token y los offsets de su lexema en
+    datos, sin copiarlo. Devuelve el offset del fin del último registro, que es mayor
+    que len(datos) si el último está truncado.
+    """
+    n = len(datos)
+    try:
+        while pos < n:
+            # Caso de un byte (id y largo < 128) en línea; si no, el varint completo
+            id_token = datos[pos]
+            pos += 1
+            if id_token >= 0x80:
+                id_token, pos = leer_varint(datos, pos - 1)
+            largo = datos[pos]
+            pos += 1
+            if largo >= 0x80:
+                largo, pos = leer_varint(datos, pos - 1)
+            ids.append(id_token)
+            inicios.append(pos)
+            pos += largo
+            fines.append(pos)
+    except IndexError:
+        # El archivo termina dentro del id o del largo de un registro
+        return n + 1
+    return pos
+
+
+def _escribir(afd, tokens, archivo_salida, binario):
+    if binario:
+        return escribir_tokens_binario(tokens, archivo_salida, afd.nombres_token)
+    return escribir_tokens(tokens, archivo_salida)
+
+
+# --- Posiciones ---
+
+class IndiceLineas:
+    """
+    Offsets de inicio de cada línea de un buffer (bytes, bytearray, mmap o str), con
+    \n, \r\n y \r como saltos de línea igual que el escáner. posicion(offset) devuelve
+    (línea, columna) empezando en 1, con la columna en caracteres.
+    """
+    __slots__ = ('datos', 'inicios')
+
+    def __init__(self, datos):
+        self.datos = datos
+        texto = isinstance(datos, str)
+        lf, cr = ('\n', '\r') if texto else (b'\n', b'\r')
+        inicios = array('q', [0])
+        i = datos.find(lf)
+        while i >= 0:
+            inicios.append(i + 1)
+            i = datos.find(lf, i + 1)
+        i = datos.find(cr)
+        if i >= 0:
+            # \r sueltos (sin \n después) también cortan la línea
+            sueltos = []
+            while i >= 0:
+                if datos[i + 1:i + 2] != lf:
+                    sueltos.append(i + 1)
+                i = datos.find(cr, i + 1)
+            if sueltos:
+                inicios = array('q', sorted(inicios.tolist() + sueltos))
+        self.inicios = inicios
+
+    def __len__(self):
+        return len(self.inicios)
+
+    def linea(self, offset):
+        return bisect_right(self.inicios, offset)
+
+    def posicion(self, offset):
+        linea = bisect_right(self.inicios, offset)
+        inicio = self.inicios[linea - 1]
+        if isinstance(self.datos, str):
+            return linea, offset - inicio + 1
+        segmento = self.datos[inicio:offset]
+        if segmento.isascii():
+            return linea, offset - inicio + 1
+        return linea, len(bytes(segmento).decode('utf-8', 'surrogateescape')) + 1
+
+
+def errores_lexicos(afd, datos, memo=False, agrupar_errores=False):
+    """
+    Genera (línea, columna, carácter) de cada carácter que no inicia ningún token (con
+    agrupar_errores, (línea, columna, tramo) de cada tramo sin token). El índice de
+    líneas se construye sólo si aparece algún error.
+    """
+    indice = None
+    for id_token, inicio, fin in escanear_bytes(afd, datos, memo, 0, agrupar_errores):
+        if id_token == ID_ERROR:
+            if indice is None:
+                indice = IndiceLineas(datos)
+            linea, columna = indice.posicion(inicio)
+            yield linea, columna, lexema(datos, inicio, fin)
+
+
+# --- Acciones de las reglas ---
+
+_USA_POSICION = re.compile(r"\b(linea|columna)\b")
+
+
+def usa_posicion(codigo):
+    """True si el código de la acción usa `linea` o `columna`."""
+    return _USA_POSICION.search(codigo) is not None
+
+
+def codigo_accion(nombre_funcion, codigo):
+    """
+    Fuente de la función de una acción: recibe el lexema y devuelve `valor`, que vale
+    el lexema salvo que el código lo reasigne (valor = int(lexema), valor = OMITIR).
+    Si el código usa `linea` o `columna`, la función las recibe también como argumentos
+    y la posición se calcula sólo para esos tokens.
+    """
+    parametros = "lexema, linea, columna" if usa_posicion(codigo) else "lexema"
+    cuerpo = textwrap.indent(normalizar_sangria(codigo), "    ")
+    return f"def {nombre_funcion}({parametros}):\n    valor = lexema\n{cuerpo}\n    return valor\n"
+
+
+def normalizar_sangria(codigo):
+    """
+    Quita la sangría común del código de una acción conservando la de los bloques
+    anidados. La primera línea va pegada a la llave `{` y no tiene la sangría del
+    resto: se ubica al nivel de las líneas siguientes y, si abre un bloque (termina en
+    ':') cuyo cuerpo quedó a ese mismo nivel, el cuerpo se sangra un nivel más.
+    """
+    lineas = [linea.rstrip() for linea in codigo.strip("\n").splitlines()]
+    if not lineas:
+        return ""
+    primera = lineas[0].strip()
+    resto = textwrap.dedent("\n".join(lineas[1:])).strip("\n")
+    if not primera:
+        return resto
+    if not resto:
+        return primera
+    if primera.endswith(":") and not resto[0].isspace():
+        resto = textwrap.indent(resto, "    ")
+    return primera + "\n" + resto
+
+
+def compilar_acciones(afd, acciones, header=""):
+    """
+    Compila las acciones {token: código} (yalex_parser.extraer_acciones) una sola vez.
+    Devuelve una lista indexada por id de token con la función de cada uno, o None si
+    el token no tiene acción. El header del .yal se ejecuta primero y sus nombres quedan
+    visibles para las acciones.
+    """
+    entorno = {"OMITIR": OMITIR}
+    if header:
+        exec(compile(header, "<header>", "exec"), entorno)
+    tabla = [None] * len(afd.nombres_token)
+    for id_token, nombre in enumerate(afd.nombres_token):
+        codigo = acciones.get(nombre)
+        if codigo:
+            nombre_funcion = f"_accion_{id_token}"
+            exec(compile(codigo_accion(nombre_funcion, codigo), f"<acción {nombre}>", "exec"), entorno)
+            tabla[id_token] = entorno[nombre_funcion]
+    return tabla
+
+
+def escanear_con_acciones(afd, datos, acciones, memo=False, agrupar_errores=False):
+    """
+    Igual que escanear_bytes, pero genera (lexema, token, valor) con el valor que
+    devuelve la acción del token (el lexema si no tiene). Los tokens cuya acción
+    devuelve OMITIR no se generan.
+    """
+    nombres = afd.nombres_token
+    # Acciones que reciben (lexema, linea, columna), ver codigo_accion
+    con_posicion = [accion is not None and accion.__code__.co_argcount == 3 for accion in acciones]
+    indice = None
+    for id_token, inicio, fin in escanear_bytes(afd, datos, memo, 0, agrupar_errores):
+        texto = lexema(datos, inicio, fin)
+        accion = acciones[id_token]
+        if accion is None:
+            yield texto, nombres[id_token], texto
+            continue
+        if con_posicion[id_token]:
+            if indice is None:
+                indice = IndiceLineas(datos)
+            valor = accion(texto, *indice.posicion(inicio))
+        else:
+            valor = accion(texto)
+        if valor is not OMITIR:
+            yield texto, nombres[id_token], valor
+
+
+def escanear_bloques(afd, bloques):
+    """
+    Genera (lexema, token) a partir de un iterable de bloques de texto (str). Cuando el
+    recorrido del AFD llega al final del bloque se pide el siguiente y se sigue desde el
+    mismo estado; sólo se conserva el texto desde el inicio del lexema en curso.
+    """
+    transiciones = afd.transiciones
+    token_estado = afd.token_estado
+    nombres = afd.nombres_token
+    inicial = afd.inicial
+    bloques = iter(bloques)
+    buf = ""
+    i = 0
+    agotado = False
+    while True:
+        if i >= len(buf):
+            if agotado:
+                return
+            buf = next(bloques, None)
+            i = 0
+            if buf is None:
+                return
+            continue
+
+        estado = inicial
+        ultimo_token = SIN_TOKEN
+        ultimo_fin = i
+        j = i
+        while True:
+            if j >= len(buf):
+                if agotado:
+                    break
+                bloque = next(bloques, None)
+                if bloque is None:
+                    agotado = True
+                    break
+                # Arrastrar el lexema sin terminar al nuevo bloque
+                buf = buf[i:] + bloque
+                j -= i
+                ultimo_fin -= i
+                i = 0
+                continue
+            siguiente = transiciones[estado].get(buf[j])
+            if siguiente is None:
+                break
+            estado = siguiente
+            j += 1
+            if token_estado[estado] != SIN_TOKEN:
+                ultimo_token = token_estado[estado]
+                ultimo_fin = j
+
+        if ultimo_token != SIN_TOKEN:
+            yield buf[i:ultimo_fin], nombres[ultimo_token]
+            i = ultimo_fin
+        else:
+            yield buf[i], ERROR
+            i += 1
+
+
+def _leer_bloques(flujo, tam_bloque):
+    while True:
+        bloque = flujo.read(tam_bloque)
+        if not bloque:
+            return
+        yield bloque
+
+
+def escanear_flujo(afd, flujo, tam_bloque=1 << 16):
+    """
+    Genera (lexema, token) leyendo flujo en bloques de tam_bloque caracteres. Un flujo
+    binario (por ejemplo sys.stdin.buffer o socket.makefile('rb')) se decodifica como
+    UTF-8 con saltos de línea universales, igual que open(..., encoding="utf-8"); los
+    bytes inválidos se leen como escapes sustitutos, igual que en escanear_bytes.
+    """
+    if not isinstance(flujo, io.TextIOBase):
+        flujo = io.TextIOWrapper(flujo, encoding="utf-8", errors="surrogateescape")
+    return escanear_bloques(afd, _leer_bloques(flujo, tam_bloque))
+
+
+def simular_flujo(afd, flujo, archivo_salida, tam_bloque=1 << 16, binario=False, agrupar_errores=False):
+    """Tokeniza un flujo por bloques y escribe los tokens en streaming."""
+    if not isinstance(afd, AFDCompilado):
+        afd = compilar_afd(afd)
+    tokens = escanear_flujo(afd, flujo, tam_bloque)
+    if agrupar_errores:
+        tokens = unir_errores(tokens)
+    return _escribir(afd, tokens, archivo_salida, binario)
+
+
+def simular_archivo_mmap(afd, archivo_entrada, archivo_salida, memo=False, acciones=None, header="",
+                         binario=False, agrupar_errores=False):
+    """
+    Tokeniza archivo_entrada vía mmap y escribe los tokens en streaming.
+    acciones es {token: código} con el header del .yal (ver compilar_acciones).
+    Con binario=True se escribe el formato de escribir_tokens_binario.
+    """
+    if not isinstance(afd, AFDCompilado):
+        afd = compilar_afd(afd)
+    if acciones is not None:
+        acciones = compilar_acciones(afd, acciones, header)
+    tokens = escanear_mmap(afd, archivo_entrada, memo, acciones, agrupar_errores)
+    return _escribir(afd, tokens, archivo_salida, binario)
+
+
+# --- Escaneo en paralelo por fragmentos ---
+#
+# El archivo se parte en rangos de bytes que empiezan justo después de un salto de línea.
+# Cada proceso escanea su rango como si un token empezara en su primer byte, y sigue el
+# último token más allá del final del rango si hace falta (el mmap cubre todo el archivo).
+# Al unir, el flujo ya emitido termina en un offset `pos`:
+#   - si algún token del fragmento siguiente empieza en `pos`, desde ahí ambos escaneos
+#     son idénticos (el AFD es determinista) y se toman los tokens del fragmento;
+#   - si no (un token cruzó el borde de forma distinta), se vuelve a escanear desde `pos`
+#     en el proceso principal hasta caer en un inicio de token del fragmento.
+# Como los fragmentos empiezan en líneas nuevas, lo normal es que el borde coincida con
+# el fin de un token WS/WHITESPACE y la resincronización sea inmediata.
+
+_trabajador = {}
+
+
+def _iniciar_trabajador(afd, archivo_entrada, memo):
+    f = open(archivo_entrada, "rb")
+    _trabajador["archivo"] = f
+    _trabajador["datos"] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _trabajador["afd"] = afd
+    _trabajador["memo"] = memo
+
+
+def _escanear_fragmento(rango):
+    """Tokens (ids, inicios, fines) que empiezan dentro de [inicio, fin)."""
+    inicio, fin = rango
+    ids = array('h')
+    inicios = array('q')
+    fines = array('q')
+    for id_token, ini, fin_token in escanear_bytes(_trabajador["afd"], _trabajador["datos"],
+                                                   _trabajador["memo"], inicio):
+        if ini >= fin:
+            break
+        ids.append(id_token)
+        inicios.append(ini)
+        fines.append(fin_token)
+    return ids, inicios, fines
+
+
+def puntos_de_corte(datos, partes):
+    """Offsets de inicio de cada fragmento (justo después de un '\\n') más el largo total."""
+    n = len(datos)
+    cortes = [0]
+    for k in range(1, partes):
+        p = datos.find(b"\n", max(n * k // partes, cortes[-1]))
+        if p < 0:
+            break
+        if p + 1 < n:
+            cortes.append(p + 1)
+    cortes.append(n)
+    return cortes
+
+
+def _unir_fragmentos(afd, datos, cortes, fragmentos, memo):
+    """Genera (id_token, inicio, fin) del archivo completo a partir de los fragmentos."""
+    pos = 0
+    for k, (ids, inicios, fines) in enumerate(fragmentos):
+        fin_fragmento = cortes[k + 1]
+        if pos >= fin_fragmento:
+            # Un token anterior ya cubrió todo el fragmento
+            continue
+        idx = bisect_left(inicios, pos)
+        if idx == len(inicios) or inicios[idx] != pos:
+            # Resincronizar: escanear desde pos hasta caer en un inicio de token del fragmento
+            idx = None
+            for id_token, ini, fin_token in escanear_bytes(afd, datos, memo, pos):
+                if ini >= fin_fragmento:
+                    break
+                j = bisect_left(inicios, ini)
+                if j < len(inicios) and inicios[j] == ini:
+                    idx = j
+                    break
+                yield id_token, ini, fin_token
+                pos = fin_token
+            if idx is None:
+                continue
+        for j in range(idx, len(ids)):
+            yield ids[j], inicios[j], fines[j]
+        pos = fines[-1]
+
+
+def escanear_paralelo(afd, archivo_entrada, procesos=None, memo=False):
+    """
+    Genera (lexema, token) para archivo_entrada escaneando fragmentos del archivo en
+    `procesos` procesos. El resultado es igual al de escanear_mmap.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    procesos = procesos or os.cpu_count() or 1
+    nombres = afd.nombres_token
+    with open(archivo_entrada, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            cortes = puntos_de_corte(datos, procesos)
+            if len(cortes) <= 2:
+                tokens = escanear_bytes(afd, datos, memo)
+                for id_token, inicio, fin in tokens:
+                    yield lexema(datos, inicio, fin), nombres[id_token]
+                return
+            rangos = list(zip(cortes, cortes[1:]))
+            with ProcessPoolExecutor(max_workers=min(procesos, len(rangos)), initializer=_iniciar_trabajador,
+                                     initargs=(afd, archivo_entrada, memo)) as ejecutor:
+                fragmentos = ejecutor.map(_escanear_fragmento, rangos)
+                for id_token, inicio, fin in _unir_fragmentos(afd, datos, cortes, fragmentos, memo):
+                    yield lexema(datos, inicio, fin), nombres[id_token]
+
+
+def simular_archivo_paralelo(afd, archivo_entrada, archivo_salida, procesos=None, memo=False, binario=False,
+                             agrupar_errores=False):
+    """Tokeniza archivo_entrada en paralelo por fragmentos y escribe los tokens en orden."""
+    if not isinstance(afd, AFDCompilado):
+        afd = compilar_afd(afd)
+    tokens = escanear_paralelo(afd, archivo_entrada, procesos, memo)
+    if agrupar_errores:
+        tokens = unir_errores(tokens)
+    return _escribir(afd, tokens, archivo_salida, binario)
+
+
+# ---- Tablas planas y exportación a memoria compartida ----
+#
+# AFDPlano guarda el AFD como en el lexer generado: el alfabeto ordenado, una tabla
+# plana tabla[estado * n_columnas + columna] (-1 sin transición) y el token de cada
+# estado. exportar_afd copia esas tablas a un bloque autodescriptivo (firma, encabezado
+# JSON y los dos arreglos alineados) en un segmento de multiprocessing.shared_memory o
+# en un archivo; adjuntar_afd/cargar_afd lo envuelven como memoryviews de sólo lectura,
+# así N procesos comparten una sola copia física y conectarse no depende del tamaño.
+
+MAGIA_AFD = b"AFDP\x01"
+_ALINEACION = 8
+
+
+class AFDPlano:
+    """
+    AFD con tablas planas. tabla y token_estado pueden ser array o memoryview; memoria
+    es el segmento o mmap que los contiene (None si son arrays propios).
+    """
+    __slots__ = ('inicial', 'alfabeto', 'columna', 'n_columnas', 'tabla', 'token_estado',
+                 'nombres_token', 'memoria')
+
+    def __init__(self, inicial, alfabeto, tabla, token_estado, nombres_token, memoria=None):
+        self.inicial = inicial
+        self.alfabeto = alfabeto
+        self.columna = {c: i for i, c in enumerate(alfabeto)}
+        self.n_columnas = len(alfabeto)
+        self.tabla = tabla
+        self.token_estado = token_estado
+        self.nombres_token = nombres_token
+        self.memoria = memoria
+
+    def __len__(self):
+        return len(self.token_estado)
+
+    def cerrar(self):
+        """Libera las vistas y cierra el segmento o mmap (no elimina el segmento)."""
+        if self.memoria is not None:
+            # Las vistas deben liberarse antes de cerrar el buffer que exportan
+            self.tabla.release()
+            self.token_estado.release()
+            self.memoria.close()
+            self.memoria = None
+
+    __del__ = cerrar
+
+    def escanear(self, texto, memo=False, inicio=0):
+        """
+        Genera (inicio, fin, id_token) de texto (str) con escanear_plano; los offsets
+        son en caracteres de texto.
+        """
+        return escanear_plano(texto, self.inicial, self.columna, self.tabla, self.n_columnas,
+                              self.token_estado, memo, inicio)
+
+    def tokenizar(self, texto, memo=False):
+        """Genera (lexema, token) de texto, con los saltos de línea normalizados como en lexema()."""
+        nombres = self.nombres_token
+        for inicio, fin, id_token in self.escanear(texto, memo):
+            lexema_ = texto[inicio:fin]
+            if '\r' in lexema_:
+                lexema_ = lexema_.replace('\r\n', '\n').replace('\r', '\n')
+            yield lexema_, nombres[id_token]
+
+    def a_compilado(self):
+        """AFDCompilado equivalente (copia las tablas a dicts por estado)."""
+        transiciones = []
+        for estado in range(len(self)):
+            base = estado * self.n_columnas
+            transiciones.append({simbolo: self.tabla[base + col]
+                                 for col, simbolo in enumerate(self.alfabeto)
+                                 if self.tabla[base + col] >= 0})
+        return AFDCompilado(self.inicial, transiciones, array('h', self.token_estado),
+                            list(self.nombres_token), list(range(len(self))))
+
+
+def escanear_plano(texto, inicial, columna, tabla, n_columnas, token_estado, memo=False, inicio=0):
+    """
+    Regla del lexema más largo sobre tablas planas (AFDPlano; generador_lexer copia
+    esta función al lexer generado, por eso no usa nada del módulo). Genera (inicio,
+    fin, id_token) con offsets en caracteres de texto; un carácter sin token es el id 0
+    (ERROR). Igual que escanear_bytes, \r\n y \r se leen como \n, y con memo=True se
+    usa la tabulación de Reps (ver _escanear_bytes_memo) para garantizar tiempo lineal.
+    """
+    n = len(texto)
+    n_estados = len(token_estado)
+    fallidos = set()
+    visitados = []
+    i = inicio
+    while i < n:
+        estado = inicial
+        ultimo_token = -1
+        ultimo_fin = i
+        j = i
+        while j < n:
+            if memo:
+                clave = j * n_estados + estado
+                if clave in fallidos:
+                    break
+                visitados.append(clave)
+            c = texto[j]
+            k = j + 1
+            if c == '\r':
+                c = '\n'
+                if k < n and texto[k] == '\n':
+                    k += 1
+            col = columna.get(c, -1)
+            if col < 0:
+                break
+            estado = tabla[estado * n_columnas + col]
+            if estado < 0:
+                break
+            j = k
+            if token_estado[estado] >= 0:
+                ultimo_token = token_estado[estado]
+                ultimo_fin = j
+                if memo:
+                    visitados.clear()
+        if memo:
+            fallidos.update(visitados)
+            visitados.clear()
+
+        if ultimo_token >= 0:
+            yield i, ultimo_fin, ultimo_token
+            i = ultimo_fin
+        else:
+            k = i + 1
+            if texto[i] == '\r' and k < n and texto[k] == '\n':
+                k += 1
+            yield i, k, 0
+            i = k
+
+
+def aplanar_afd(afd):
+    """
+    Convierte un AFDCompilado (o el AFD de ERtoAFD2) en AFDPlano. Las columnas siguen
+    el orden del alfabeto ordenado, así el resultado es estable.
+    """
+    if not isinstance(afd, AFDCompilado):
+        afd = compilar_afd(afd)
+    alfabeto = "".join(sorted({simbolo for trans in afd.transiciones for simbolo in trans}))
+    columna = {simbolo: i for i, simbolo in enumerate(alfabeto)}
+    n_columnas = len(alfabeto)
+    tabla = array('i', [-1]) * (len(afd) * n_columnas)
+    for estado, trans in enumerate(afd.transiciones):
+        base = estado * n_columnas
+        for simbolo, destino in trans.items():
+            tabla[base + columna[simbolo]] = destino
+    return AFDPlano(afd.inicial, alfabeto, tabla, array('h', afd.token_estado), list(afd.nombres_token))
+
+
+def _alinear(n):
+    return -(-n // _ALINEACION) * _ALINEACION
+
+
+def _bloque_afd(plano):
+    """Encabezado (con relleno) y datos de los arreglos del bloque exportado."""
+    import json
+    import sys
+
+    partes = [('i', bytes(plano.tabla)),
+              ('h', bytes(plano.token_estado))]
+    disposicion = []
+    offset = 0
+    for tipo, datos in partes:
+        disposicion.append([tipo, offset, len(datos)])
+        offset += _alinear(len(datos))
+    metadatos = {
+        'inicial': plano.inicial,
+        'alfabeto': plano.alfabeto,
+        'nombres_token': list(plano.nombres_token),
+        'orden_bytes': sys.byteorder,
+        'disposicion': disposicion,
+    }
+    codificado = json.dumps(metadatos).encode("utf-8")
+    encabezado = MAGIA_AFD + len(codificado).to_bytes(4, "little") + codificado
+    encabezado += bytes(_alinear(len(encabezado)) - len(encabezado))
+    return encabezado, [datos for _, datos in partes]
+
+
+def _escribir_bloque(buffer, encabezado, partes):
+    buffer[:len(encabezado)] = encabezado
+    offset = len(encabezado)
+    for datos in partes:
+        buffer[offset:offset + len(datos)] = datos
+        offset += _alinear(len(datos))
+
+
+def _afd_desde_buffer(buffer, memoria):
+    import json
+    import sys
+
+    vista = memoryview(buffer).toreadonly()
+    if bytes(vista[:len(MAGIA_AFD)]) != MAGIA_AFD:
+        raise ValueError("El bloque no contiene un AFD exportado")
+    inicio = len(MAGIA_AFD) + 4
+    largo = int.from_bytes(vista[len(MAGIA_AFD):inicio], "little")
+    metadatos = json.loads(bytes(vista[inicio:inicio + largo]).decode("utf-8"))
+    if metadatos['orden_bytes'] != sys.byteorder:
+        raise ValueError("El AFD exportado usa otro orden de bytes")
+    base = _alinear(inicio + largo)
+    tabla, token_estado = (vista[base + offset:base + offset + n].cast(tipo)
+                           for tipo, offset, n in metadatos['disposicion'])
+    return AFDPlano(metadatos['inicial'], metadatos['alfabeto'], tabla, token_estado,
+                    metadatos['nombres_token'], memoria)
+
+
+def exportar_afd(afd, ruta=None):
+    """
+    Exporta las tablas planas del AFD. Con ruta, escribe el bloque en ese archivo (para
+    cargar_afd) y devuelve la ruta; sin ruta, lo copia a un segmento nuevo de
+    multiprocessing.shared_memory y devuelve el segmento (quien lo crea debe llamar a
+    close() y unlink() al terminar; los procesos se conectan con adjuntar_afd(seg.name)).
+    """
+    plano = afd if isinstance(afd, AFDPlano) else aplanar_afd(afd)
+    encabezado, partes = _bloque_afd(plano)
+    tamano = len(encabezado) + sum(_alinear(len(datos)) for datos in partes)
+    if ruta is not None:
+        bloque = bytearray(tamano)
+        _escribir_bloque(bloque, encabezado, partes)
+        with open(ruta, "wb") as f:
+            f.write(bloque)
+        return ruta
+
+    from multiprocessing import shared_memory
+
+    segmento = shared_memory.SharedMemory(create=True, size=tamano)
+    _escribir_bloque(segmento.buf, encabezado, partes)
+    return segmento
+
+
+def adjuntar_afd(nombre):
+    """AFDPlano de sólo lectura sobre el segmento de memoria compartida `nombre`."""
+    from multiprocessing import shared_memory
+
+    segmento = shared_memory.SharedMemory(name=nombre)
+    return _afd_desde_buffer(segmento.buf, segmento)
+
+
+def cargar_afd(ruta):
+    """AFDPlano de sólo lectura sobre un mmap del archivo escrito por exportar_afd."""
+    with open(ruta, "rb") as f:
+        datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _afd_desde_buffer(datos, datos)
@@ -1,5 +1,11 @@
+from array import array
+
+from shuntingyard import OP
+
 
 class Node:
+    __slots__ = ('value', 'left', 'right', 'pos_id', 'nullable', 'firstpos', 'lastpos', 'tipo_token')
+
     def __init__(self, value=None, left=None, right=None, pos_id=None, tipo_token=None):
         self.value = value
         self.left = left
@@ -18,9 +24,14 @@ class Node:
         visitor.visit(self)
 
 class Stack:
+    __slots__ = ('stack',)
+
     def __init__(self):
         self.stack = []
 
+    def __len__(self):
+        return len(self.stack)
+
     def push(self, node):
         self.stack.append(node)
 
@@ -30,6 +41,263 @@ class Stack:
         else:
             raise Exception("Stack is empty")
 
+
+# Códigos de operación del árbol compacto (las hojas usan OP_HOJA)
+OP_HOJA = 0
+OP_UNION = 1
+OP_CONCAT = 2
+OP_ESTRELLA = 3
+OP_MAS = 4
+OP_OPCIONAL = 5
+
+CODIGO_OPERADOR = {'|': OP_UNION, '.': OP_CONCAT, '*': OP_ESTRELLA, '+': OP_MAS, '?': OP_OPCIONAL}
+SIMBOLO_OPERADOR = {codigo: simbolo for simbolo, codigo in CODIGO_OPERADOR.items()}
+
+# Operadores (sin comillas) para construir nodos internos
+BINARIOS = {'|', '.', '+'}
+UNARIOS = {'*', '?'}
+OPERADORES = BINARIOS | UNARIOS
+
+
+class ArbolCompacto:
+    """
+    Árbol de expresión almacenado como struct-of-arrays.
+
+    Cada nodo es un índice en los arreglos paralelos `op`, `izq`, `der`, `pos_id` y
+    `simbolo` (índice en la tabla `simbolos` para las hojas, -1 en operadores).
+    Los nodos se agregan en orden postfix, por lo que los hijos siempre tienen un
+    índice menor que el padre y la raíz es el último nodo. nullable se guarda en un
+    bytearray y firstpos/lastpos como máscaras de bits (bit = pos_id - base).
+    """
+    __slots__ = ('op', 'izq', 'der', 'pos_id', 'simbolo', 'simbolos', '_indice_simbolo',
+                 'anulable', 'primeros', 'ultimos', 'base', 'tipo_token', '_vistas')
+
+    def __init__(self):
+        self.op = array('i')
+        self.izq = array('i')
+        self.der = array('i')
+        self.pos_id = array('i')
+        self.simbolo = array('i')
+        self.simbolos = []
+        self._indice_simbolo = {}
+        self.anulable = bytearray()
+        self.primeros = []
+        self.ultimos = []
+        self.base = 1
+        self.tipo_token = None
+        self._vistas = None
+
+    def __len__(self):
+        return len(self.op)
+
+    @property
+    def raiz(self):
+        return len(self.op) - 1
+
+    def agregar_hoja(self, valor):
+        indice = self._indice_simbolo.get(valor)
+        if indice is None:
+            indice = len(self.simbolos)
+            self._indice_simbolo[valor] = indice
+            self.simbolos.append(valor)
+        self.op.append(OP_HOJA)
+        self.izq.append(-1)
+        self.der.append(-1)
+        self.pos_id.append(-1)
+        self.simbolo.append(indice)
+        return len(self.op) - 1
+
+    def agregar_operador(self, codigo, izq, der=-1):
+        self.op.append(codigo)
+        self.izq.append(izq)
+        self.der.append(der)
+        self.pos_id.append(-1)
+        self.simbolo.append(-1)
+        return len(self.op) - 1
+
+    def clonar(self, nodo):
+        """
+        Copia el subárbol con raíz en `nodo` al final del arreglo y devuelve el índice
+        de la copia. El subárbol ocupa el bloque contiguo que empieza en su hoja más
+        a la izquierda, así que basta desplazar los índices de los hijos.
+        """
+        inicio = nodo
+        while self.op[inicio] != OP_HOJA:
+            inicio = self.izq[inicio]
+        desplazamiento = len(self.op) - inicio
+        for k in range(inicio, nodo + 1):
+            izq, der = self.izq[k], self.der[k]
+            self.op.append(self.op[k])
+            self.izq.append(izq + desplazamiento if izq >= 0 else -1)
+            self.der.append(der + desplazamiento if der >= 0 else -1)
+            self.pos_id.append(-1)
+            self.simbolo.append(self.simbolo[k])
+        return len(self.op) - 1
+
+    def valor(self, nodo):
+        """Devuelve el valor textual del nodo (literal de la hoja o símbolo del operador)."""
+        if self.op[nodo] == OP_HOJA:
+            return self.simbolos[self.simbolo[nodo]]
+        return SIMBOLO_OPERADOR[self.op[nodo]]
+
+    def asignar_posiciones(self, contador=1):
+        """
+        Asigna pos_id a las hojas distintas de ε. Las hojas están en orden izquierda a
+        derecha, igual que en el recorrido de assign_pos_ids sobre Node.
+        Devuelve el contador siguiente.
+        """
+        self.base = contador
+        epsilon = self._indice_simbolo.get('ε', -1)
+        op, simbolo, pos_id = self.op, self.simbolo, self.pos_id
+        for nodo in range(len(op)):
+            if op[nodo] == OP_HOJA and simbolo[nodo] != epsilon:
+                pos_id[nodo] = contador
+                contador += 1
+        return contador
+
+    def desplazar_posiciones(self, delta):
+        """
+        Suma delta a todos los pos_id. Las máscaras son relativas a base, así que
+        sólo cambian base y el arreglo pos_id.
+        """
+        self.base += delta
+        pos_id = self.pos_id
+        for nodo in range(len(pos_id)):
+            if pos_id[nodo] >= 0:
+                pos_id[nodo] += delta
+
+    def calcular_posiciones(self):
+        """
+        Calcula nullable, firstpos, lastpos y followpos en una sola pasada hacia
+        adelante (los hijos preceden al padre). Devuelve followpos como lista de
+        máscaras indexada por pos_id - base.
+        """
+        op, izq, der, pos_id = self.op, self.izq, self.der, self.pos_id
+        base = self.base
+        n = len(op)
+        anulable = bytearray(n)
+        primeros = [0] * n
+        ultimos = [0] * n
+        siguientes = [0] * sum(1 for p in pos_id if p >= 0)
+
+        for nodo in range(n):
+            codigo = op[nodo]
+            if codigo == OP_HOJA:
+                if pos_id[nodo] >= 0:
+                    bit = 1 << (pos_id[nodo] - base)
+                    primeros[nodo] = bit
+                    ultimos[nodo] = bit
+                else:
+                    anulable[nodo] = 1
+            elif codigo == OP_UNION:
+                a, b = izq[nodo], der[nodo]
+                anulable[nodo] = anulable[a] or anulable[b]
+                primeros[nodo] = primeros[a] | primeros[b]
+                ultimos[nodo] = ultimos[a] | ultimos[b]
+            elif codigo == OP_CONCAT:
+                a, b = izq[nodo], der[nodo]
+                anulable[nodo] = anulable[a] and anulable[b]
+                primeros[nodo] = primeros[a] | primeros[b] if anulable[a] else primeros[a]
+                ultimos[nodo] = ultimos[a] | ultimos[b] if anulable[b] else ultimos[b]
+                _propagar(siguientes, ultimos[a], primeros[b])
+            elif codigo == OP_ESTRELLA:
+                a = izq[nodo]
+                anulable[nodo] = 1
+                primeros[nodo] = primeros[a]
+                ultimos[nodo] = ultimos[a]
+                _propagar(siguientes, ultimos[nodo], primeros[nodo])
+            # '+' y '?' sin expandir no aportan posiciones (igual que los visitantes)
+
+        self.anulable = anulable
+        self.primeros = primeros
+        self.ultimos = ultimos
+        return siguientes
+
+    def posiciones(self, mascara):
+        """Convierte una máscara de bits en el conjunto de pos_id correspondiente."""
+        resultado = set()
+        base = self.base
+        while mascara:
+            bajo = mascara & -mascara
+            resultado.add(base + bajo.bit_length() - 1)
+            mascara ^= bajo
+        return resultado
+
+    def tabla_followpos(self, siguientes):
+        """Convierte la lista de máscaras de followpos al formato {pos_id: set} de FollowPosVisitor."""
+        return {self.base + i: self.posiciones(mascara) for i, mascara in enumerate(siguientes)}
+
+    def nodo(self, indice=None):
+        """
+        Devuelve una vista tipo Node del nodo indicado (la raíz por defecto). Las vistas
+        se crean bajo demanda y se cachean para que id(vista) sea estable, como espera
+        graphviz_utils.generate_expression_tree_image.
+        """
+        if indice is None:
+            indice = self.raiz
+        if indice < 0:
+            return None
+        if self._vistas is None:
+            self._vistas = {}
+        vista = self._vistas.get(indice)
+        if vista is None:
+            vista = NodoCompacto(self, indice)
+            self._vistas[indice] = vista
+        return vista
+
+
+def _propagar(siguientes, origen, destino):
+    """followpos(i) |= destino para cada bit i de la máscara origen."""
+    while origen:
+        bajo = origen & -origen
+        siguientes[bajo.bit_length() - 1] |= destino
+        origen ^= bajo
+
+
+class NodoCompacto:
+    """Vista de solo lectura de un nodo de ArbolCompacto con la interfaz de Node."""
+    __slots__ = ('arbol', 'indice')
+
+    def __init__(self, arbol, indice):
+        self.arbol = arbol
+        self.indice = indice
+
+    @property
+    def value(self):
+        return self.arbol.valor(self.indice)
+
+    @property
+    def left(self):
+        return self.arbol.nodo(self.arbol.izq[self.indice])
+
+    @property
+    def right(self):
+        return self.arbol.nodo(self.arbol.der[self.indice])
+
+    @property
+    def pos_id(self):
+        pos = self.arbol.pos_id[self.indice]
+        return pos if pos >= 0 else None
+
+    @property
+    def nullable(self):
+        return bool(self.arbol.anulable[self.indice]) if self.arbol.anulable else False
+
+    @property
+    def firstpos(self):
+        return self.arbol.posiciones(self.arbol.primeros[self.indice]) if self.arbol.primeros else set()
+
+    @property
+    def lastpos(self):
+        return self.arbol.posiciones(self.arbol.ultimos[self.indice]) if self.arbol.ultimos else set()
+
+    @property
+    def tipo_token(self):
+        return self.arbol.tipo_token if self.value == '#' else None
+
+    def __repr__(self):
+        return f"Node({self.value}, id={self.pos_id}, nullable={self.nullable}, firstpos={self.firstpos}, lastpos={self.lastpos})"
+
 def tokenize_postfix(postfix_expr):
     """
     Tokeniza la expresión postfix. Agrupa correctamente los literales con escapes como '\'' y '\\'.
@@ -70,7 +338,43 @@ def tokenize_postfix(postfix_expr):
 
 
 
-def build_expression_tree(postfix_expr):
+def _valor_hoja(token):
+    """Obtiene el literal que representa un token operando del postfix."""
+    if token == "'\\''":
+        # Manejo de la secuencia de escape para comillas simples
+        return "'"
+    elif token == "\\":
+        return "\\"
+
+    # Si el token está entre comillas, se trata como literal
+    elif token.startswith("'") and token.endswith("'"):
+        return token[1:-1]
+    elif len(token) == 2 and token[0] == '\\':
+        # Manejo de secuencias de escape
+        escaped_char = token[1]
+        if escaped_char == 'n':
+            return '\n'
+        elif escaped_char == 't':
+            return '\t'
+        else:
+            return escaped_char
+    # Cualquier otro token (incluidos espacios, tabulaciones, etc.) se toma tal cual
+    return token
+
+
+def _elementos_postfix(postfix_expr):
+    """
+    Normaliza la entrada postfix a pares (es_operador, valor). Acepta tanto el texto
+    postfix (se tokeniza con tokenize_postfix) como la lista de tokens tipados de
+    shuntingyard.convertir_infix_a_postfix_tokens.
+    """
+    if isinstance(postfix_expr, str):
+        return [(True, token) if token in OPERADORES else (False, _valor_hoja(token))
+                for token in tokenize_postfix(postfix_expr)]
+    return [(token.tipo == OP, token.valor) for token in postfix_expr]
+
+
+def build_expression_tree(postfix_expr, compacto=False):
     """
     Construye el árbol AST a partir de la expresión postfix.
     
@@ -81,55 +385,55 @@ def build_expression_tree(postfix_expr):
     
     Si un token aparece entre comillas (por ejemplo, "'+'"), se extrae su contenido y se
     trata como operando literal.
+
+    También acepta directamente la lista de tokens tipados producida por
+    shuntingyard.convertir_infix_a_postfix_tokens, sin pasar por texto.
+    Con compacto=True se devuelve un ArbolCompacto en lugar de nodos Node.
     """
-    stack = Stack()
-    tokens = tokenize_postfix(postfix_expr)
-    
-    # Conjunto de operadores (sin comillas) para construir nodos internos
-    operator_set = {'|', '.', '*', '+', '?'}
+    elementos = _elementos_postfix(postfix_expr)
+    if compacto:
+        return _construir_arbol_compacto(elementos)
+
+    stack = []
     
-    for token in tokens:
-        if token in operator_set:
-            # Token es operador (sin comillas)
-            if token in {'|', '.', '+'}:
-                try:
-                    right = stack.pop()
-                    left = stack.pop()
-                except Exception as e:
-                    raise Exception(f"Error al procesar operador '{token}': la pila está vacía. Tokens: {tokens}") from e
-                node = Node(token, left, right)
-            elif token in {'*', '?'}:
-                try:
-                    operand = stack.pop()
-                except Exception as e:
-                    raise Exception(f"Error al procesar operador unario '{token}': la pila está vacía. Tokens: {tokens}") from e
-                node = Node(token, operand, None)
-            stack.push(node)
+    for es_operador, valor in elementos:
+        if not es_operador:
+            stack.append(Node(valor))
+        elif valor in BINARIOS:
+            if len(stack) < 2:
+                raise Exception(f"Error al procesar operador '{valor}': la pila está vacía. Tokens: {elementos}")
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(Node(valor, left, right))
         else:
-            if token == "'\\''":
-                # Manejo de la secuencia de escape para comillas simples
-                node = Node("'")
-            elif token == "\\":
-                node = Node("\\")
-
-            # Si el token está entre comillas, se trata como literal
-            elif token.startswith("'") and token.endswith("'"):
-                literal = token[1:-1]
-                node = Node(literal)
-            elif len(token) == 2 and token[0] == '\\':
-                # Manejo de secuencias de escape
-                escaped_char = token[1]
-                if escaped_char == 'n':
-                    node = Node('\n')
-                elif escaped_char == 't':
-                    node = Node('\t')
-                else:
-                    node = Node(escaped_char)
-            else:
-                # Cualquier otro token (incluidos espacios, tabulaciones, etc.) se toma tal cual
-                node = Node(token)
-            stack.push(node)
+            if not stack:
+                raise Exception(f"Error al procesar operador unario '{valor}': la pila está vacía. Tokens: {elementos}")
+            stack.append(Node(valor, stack.pop(), None))
     
-    if len(stack.stack) != 1:
-        raise Exception(f"Error en la construcción del árbol: la pila debería tener un único elemento, pero tiene {len(stack.stack)}. Tokens procesados: {tokens}")
-    return stack.pop()
\ No newline at end of file
+    if len(stack) != 1:
+        raise Exception(f"Error en la construcción del árbol: la pila debería tener un único elemento, pero tiene {len(stack)}. Tokens procesados: {elementos}")
+    return stack.pop()
+
+
+def _construir_arbol_compacto(elementos):
+    arbol = ArbolCompacto()
+    # La pila guarda índices de nodos en lugar de objetos
+    stack = []
+
+    for es_operador, valor in elementos:
+        if not es_operador:
+            stack.append(arbol.agregar_hoja(valor))
+        elif valor in BINARIOS:
+            if len(stack) < 2:
+                raise Exception(f"Error al procesar operador '{valor}': la pila está vacía. Tokens: {elementos}")
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(arbol.agregar_operador(CODIGO_OPERADOR[valor], left, right))
+        else:
+            if not stack:
+                raise Exception(f"Error al procesar operador unario '{valor}': la pila está vacía. Tokens: {elementos}")
+            stack.append(arbol.agregar_operador(CODIGO_OPERADOR[valor], stack.pop()))
+
+    if len(stack) != 1:
+        raise Exception(f"Error en la construcción del árbol: la pila debería tener un único elemento, pero tiene {len(stack)}. Tokens procesados: {elementos}")
+    return arbol
@@ -0,0 +1,267 @@
+"""
+Generador de analizadores léxicos: escribe un módulo de Python autónomo a partir del
+AFD final (afd_final + token_type_map de ERtoAFD2.construir_afd_final).
+
+El módulo generado sólo depende de la biblioteca estándar. Contiene:
+  - las tablas del AFD compiladas (escaner.compilar_afd) como literales: el alfabeto
+    como str, la tabla de transiciones plana (estado * columnas + columna) y el token de
+    cada estado como bytes que se cargan en array sin recorrer ninguna estructura;
+  - el ciclo de escaneo con la regla del lexema más largo: la fuente de
+    escaner.escanear_plano copiada tal cual (mismo resultado que escanear_bytes,
+    incluido ERROR para caracteres sin token y \\r\\n leído como \\n);
+  - escaner.IndiceLineas, también copiada, para la línea y columna de las acciones;
+  - las acciones { ... } de las reglas como funciones, en una tupla indexada por id de
+    token (tokenizar_valores las ejecuta con una llamada por token);
+  - el header y el trailer del archivo .yal copiados tal cual.
+
+Uso:
+    python generador_lexer.py [--reglas output/final_infix.txt] [--yal archivo.yal]
+                              [--salida output/lexer_generado.py]
+    python output/lexer_generado.py entrada.txt [tokens.txt]
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import sys
+from array import array
+
+import escaner
+
+# Tipos de array (ver escaner.compilar_afd): estados como int32 y token por estado int16
+TIPO_ESTADO = 'i'
+TIPO_TOKEN = 'h'
+
+PLANTILLA = '''\
+# Analizador léxico generado por generador_lexer.py. No editar a mano.
+import sys
+from array import array
+from bisect import bisect_right
+
+# ---- header ----
+{header}
+# ---- fin del header ----
+
+_ALFABETO = {alfabeto!r}
+_COLUMNA = {{c: i for i, c in enumerate(_ALFABETO)}}
+_N_COLUMNAS = {n_columnas}
+_INICIAL = {inicial}
+_NOMBRES = {nombres!r}
+ERROR = {error!r}
+
+# Tabla de transiciones plana (estado * _N_COLUMNAS + columna, -1 sin transición) y token
+# por estado (-1 si no es de aceptación), guardadas en little-endian
+_TABLA = array({tipo_estado!r})
+_TABLA.frombytes({tabla!r})
+_TOKEN_ESTADO = array({tipo_token!r})
+_TOKEN_ESTADO.frombytes({token_estado!r})
+if sys.byteorder == "big":
+    _TABLA.byteswap()
+    _TOKEN_ESTADO.byteswap()
+
+
+# Acciones de las reglas (una función por token, indexadas por id de token)
+OMITIR = object()
+
+{acciones}
+
+_ACCIONES = {tabla_acciones}
+# Acciones que reciben (lexema, linea, columna)
+_CON_POSICION = {con_posicion}
+
+
+{indice_lineas}
+
+
+{escanear_plano}
+
+
+def _escanear(texto, memo=False):
+    """Genera (inicio, fin, id_token) con la regla del lexema más largo (id 0 = ERROR)."""
+    return escanear_plano(texto, _INICIAL, _COLUMNA, _TABLA, _N_COLUMNAS, _TOKEN_ESTADO, memo)
+
+
+def _lexema(texto, inicio, fin):
+    lexema = texto[inicio:fin]
+    if "\\r" in lexema:
+        lexema = lexema.replace("\\r\\n", "\\n").replace("\\r", "\\n")
+    return lexema
+
+
+def tokenizar(texto, memo=False):
+    """Genera (lexema, token) con la regla del lexema más largo."""
+    nombres = _NOMBRES
+    for inicio, fin, id_token in _escanear(texto, memo):
+        yield _lexema(texto, inicio, fin), nombres[id_token]
+
+
+def tokenizar_valores(texto, memo=False):
+    """
+    Genera (lexema, token, valor) ejecutando la acción de cada token (el valor es el
+    lexema si no tiene). Se omiten los tokens cuya acción devuelve OMITIR.
+    """
+    nombres = _NOMBRES
+    acciones = _ACCIONES
+    con_posicion = _CON_POSICION
+    indice = None
+    for inicio, fin, id_token in _escanear(texto, memo):
+        lexema = _lexema(texto, inicio, fin)
+        accion = acciones[id_token]
+        if accion is None:
+            yield lexema, nombres[id_token], lexema
+            continue
+        if con_posicion[id_token]:
+            # La posición se calcula sólo para los tokens cuya acción la usa
+            if indice is None:
+                indice = IndiceLineas(texto)
+            valor = accion(lexema, *indice.posicion(inicio))
+        else:
+            valor = accion(lexema)
+        if valor is not OMITIR:
+            yield lexema, nombres[id_token], valor
+
+
+def tokenizar_archivo(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return list(tokenizar(f.read()))
+
+
+def escribir_tokens(tokens, archivo_salida):
+    with open(archivo_salida, "w", encoding="utf-8") as f:
+        for lexema, token in tokens:
+            f.write(f"{{token:<15}} {{lexema!r}}\\n")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python " + sys.argv[0] + " entrada [salida]")
+        return 1
+    with open(argv[0], "r", encoding="utf-8") as f:
+        tokens = ((lexema, token) for lexema, token, _ in tokenizar_valores(f.read()))
+        if len(argv) > 1:
+            escribir_tokens(tokens, argv[1])
+        else:
+            for lexema, token in tokens:
+                print(f"{{token:<15}} {{lexema!r}}")
+    return 0
+
+
+# ---- trailer ----
+{trailer}
+# ---- fin del trailer ----
+
+if __name__ == "__main__":
+    sys.exit(main())
+'''
+
+
+def _a_bytes(tipo, valores):
+    datos = array(tipo, valores)
+    if sys.byteorder == "big":
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def tablas_planas(afd):
+    """
+    Convierte un escaner.AFDCompilado en (alfabeto, tabla plana, token por estado)
+    con escaner.aplanar_afd (columnas en el orden del alfabeto ordenado).
+    """
+    plano = escaner.aplanar_afd(afd)
+    return plano.alfabeto, list(plano.tabla), list(plano.token_estado)
+
+
+def codigo_acciones(afd, acciones):
+    """
+    Fuente de las funciones de las acciones {token: código}, la tupla _ACCIONES
+    indexada por id de token (None para los tokens sin acción) y la tupla de los que
+    reciben línea y columna.
+    """
+    funciones = []
+    tabla = []
+    con_posicion = []
+    for id_token, nombre in enumerate(afd.nombres_token):
+        codigo = (acciones or {}).get(nombre)
+        if codigo:
+            nombre_funcion = f"_accion_{id_token}"
+            fuente = escaner.codigo_accion(nombre_funcion, codigo)
+            funciones.append(f"# {nombre}\n" + fuente)
+            tabla.append(nombre_funcion)
+            con_posicion.append(escaner.usa_posicion(codigo))
+        else:
+            tabla.append("None")
+            con_posicion.append(False)
+    return "\n\n".join(funciones), "(" + ", ".join(tabla) + ",)", tuple(con_posicion)
+
+
+def generar_codigo_lexer(afd_final, header="", trailer="", acciones=None):
+    """
+    Devuelve el código fuente del módulo generado para afd_final. acciones es
+    {token: código} (yalex_parser.extraer_acciones).
+    """
+    afd = afd_final if isinstance(afd_final, escaner.AFDCompilado) else escaner.compilar_afd(afd_final)
+    alfabeto, tabla, token_estado = tablas_planas(afd)
+    funciones, tabla_acciones, con_posicion = codigo_acciones(afd, acciones)
+    return PLANTILLA.format(
+        indice_lineas=inspect.getsource(escaner.IndiceLineas).rstrip(),
+        escanear_plano=inspect.getsource(escaner.escanear_plano).rstrip(),
+        acciones=funciones,
+        tabla_acciones=tabla_acciones,
+        con_posicion=con_posicion,
+        header=header.strip(),
+        trailer=trailer.strip(),
+        alfabeto=alfabeto,
+        n_columnas=len(alfabeto),
+        inicial=afd.inicial,
+        nombres=tuple(afd.nombres_token),
+        error=escaner.ERROR,
+        tipo_estado=TIPO_ESTADO,
+        tabla=_a_bytes(TIPO_ESTADO, tabla),
+        tipo_token=TIPO_TOKEN,
+        token_estado=_a_bytes(TIPO_TOKEN, token_estado),
+    )
+
+
+def generar_lexer(afd_final, archivo_salida, header="", trailer="", acciones=None):
+    """Escribe el módulo generado en archivo_salida."""
+    with open(archivo_salida, "w", encoding="utf-8") as f:
+        f.write(generar_codigo_lexer(afd_final, header, trailer, acciones))
+
+
+def leer_header_trailer(archivo_yal):
+    """
+    Extrae el header, el trailer y las acciones {token: código} de un .yal con las
+    funciones de yalex_parser.
+    """
+    import yalex_parser
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        codigo = yalex_parser.delete_comments(yalex_parser.leer_archivo_char_por_char(archivo_yal))
+        header, codigo = yalex_parser.extraer_header(codigo)
+        acciones = yalex_parser.extraer_acciones(yalex_parser.extraer_reglas_char_por_char(codigo))
+        trailer, _ = yalex_parser.extraer_trailer_char_por_char(codigo)
+    return header, trailer, acciones
+
+
+def main(argv=None):
+    import ERtoAFD2
+
+    parser = argparse.ArgumentParser(description="Genera un módulo de analizador léxico autónomo")
+    parser.add_argument("--reglas", default="output/final_infix.txt",
+                        help="Archivo con las reglas en formato infix (salida de yalex_parser)")
+    parser.add_argument("--yal", default=None, help="Archivo .yal del que se copian header y trailer")
+    parser.add_argument("--salida", default="output/lexer_generado.py", help="Módulo a generar")
+    args = parser.parse_args(argv)
+
+    header, trailer, acciones = leer_header_trailer(args.yal) if args.yal else ("", "", {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        afd_list, _ = ERtoAFD2.procesar_reglas_y_generar_afd(args.reglas)
+        afd_final, _ = ERtoAFD2.construir_afd_final(afd_list)
+    generar_lexer(afd_final, args.salida, header, trailer, acciones)
+    print(f"Analizador léxico generado en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
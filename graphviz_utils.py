@@ -1,9 +1,12 @@
-from graphviz import Digraph
+try:
+    from graphviz import Digraph
+except ImportError:
+    Digraph = None
 from shuntingyard import *
 import estructuras
-from graphviz import Digraph
 
-def generate_expression_tree_image(root, filename):
+def expression_tree_a_dot(root):
+    """Construye el grafo del árbol de expresión sin renderizarlo."""
     dot = Digraph(format='png')
 
     def esc_val(v: str) -> str:
@@ -35,6 +38,10 @@ def generate_expression_tree_image(root, filename):
             add_nodes_edges(node.right)
 
     add_nodes_edges(root)
+    return dot
+
+def generate_expression_tree_image(root, filename):
+    dot = expression_tree_a_dot(root)
     dot.render(filename, cleanup=True)
 
 
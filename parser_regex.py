@@ -0,0 +1,145 @@
+"""
+Front end alternativo para las reglas de YALex: un parser de descenso recursivo que
+construye el árbol de expresión directamente a partir de los tokens de
+shuntingyard.tokenizar_regex, sin pasar por la forma postfix.
+
+Gramática (de menor a mayor precedencia):
+    union    := concat ('|' concat)*
+    concat   := posfijo ('.'? posfijo)*
+    posfijo  := atomo ('*' | '+' | '?')*
+    atomo    := LITERAL | ε | '(' union ')' | '(' ')'
+
+X+ se construye como (X.X*) y X? como (X|ε), igual que shuntingyard.expandir_operadores,
+de modo que el árbol resultante es idéntico al del camino Shunting Yard.
+"""
+
+from estructuras import Node, ArbolCompacto, CODIGO_OPERADOR
+from shuntingyard import tokenizar_regex, LITERAL, EPSILON, OP, LPAREN, RPAREN
+
+
+class _ConstructorNodos:
+    """Crea nodos estructuras.Node."""
+
+    def hoja(self, valor):
+        return Node(valor)
+
+    def operador(self, valor, izq, der=None):
+        return Node(valor, izq, der)
+
+    def clonar(self, nodo):
+        if nodo is None:
+            return None
+        return Node(nodo.value, self.clonar(nodo.left), self.clonar(nodo.right))
+
+    def resultado(self, raiz):
+        return raiz
+
+
+class _ConstructorCompacto:
+    """Agrega los nodos a un ArbolCompacto; los nodos son índices."""
+
+    def __init__(self):
+        self.arbol = ArbolCompacto()
+
+    def hoja(self, valor):
+        return self.arbol.agregar_hoja(valor)
+
+    def operador(self, valor, izq, der=-1):
+        return self.arbol.agregar_operador(CODIGO_OPERADOR[valor], izq, der)
+
+    def clonar(self, nodo):
+        return self.arbol.clonar(nodo)
+
+    def resultado(self, raiz):
+        return self.arbol
+
+
+class _ParserRegex:
+    def __init__(self, tokens, constructor):
+        self.tokens = tokens
+        self.pos = 0
+        self.c = constructor
+
+    def _actual(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def parse(self):
+        raiz = self._union()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Error: token inesperado {self.tokens[self.pos].valor!r} en la posición {self.pos}.")
+        if raiz is None:
+            raise ValueError("Error: la expresión está vacía.")
+        return self.c.resultado(raiz)
+
+    def _union(self):
+        izq = self._concat()
+        token = self._actual()
+        while token is not None and token.tipo == OP and token.valor == '|':
+            self.pos += 1
+            der = self._concat()
+            if izq is None or der is None:
+                raise ValueError("Error: '|' debe tener operandos a ambos lados.")
+            izq = self.c.operador('|', izq, der)
+            token = self._actual()
+        return izq
+
+    def _concat(self):
+        izq = None
+        while True:
+            token = self._actual()
+            if token is None:
+                break
+            if token.tipo == OP and token.valor == '.':
+                # Concatenación explícita
+                self.pos += 1
+                continue
+            if token.tipo not in (LITERAL, EPSILON, LPAREN):
+                break
+            der = self._posfijo()
+            if der is None:
+                continue
+            izq = der if izq is None else self.c.operador('.', izq, der)
+        return izq
+
+    def _posfijo(self):
+        nodo = self._atomo()
+        token = self._actual()
+        while token is not None and token.tipo == OP and token.valor in ('*', '+', '?'):
+            self.pos += 1
+            if nodo is None:
+                raise ValueError(f"Error: '{token.valor}' debe estar precedido por un operando.")
+            if token.valor == '*':
+                nodo = self.c.operador('*', nodo)
+            elif token.valor == '+':
+                copia = self.c.clonar(nodo)
+                nodo = self.c.operador('.', nodo, self.c.operador('*', copia))
+            else:
+                nodo = self.c.operador('|', nodo, self.c.hoja('ε'))
+            token = self._actual()
+        return nodo
+
+    def _atomo(self):
+        token = self._actual()
+        self.pos += 1
+        if token.tipo == LITERAL:
+            return self.c.hoja(token.valor)
+        if token.tipo == EPSILON:
+            return self.c.hoja('ε')
+        # token.tipo == LPAREN
+        nodo = self._union()
+        cierre = self._actual()
+        if cierre is None or cierre.tipo != RPAREN:
+            raise ValueError("Error: paréntesis desbalanceados en la expresión.")
+        self.pos += 1
+        return nodo
+
+
+def construir_arbol_regex(expresion, compacto=False):
+    """
+    Construye el árbol de expresión (Node o ArbolCompacto) directamente desde el
+    texto infix de la regla en una sola pasada de descenso recursivo.
+    """
+    constructor = _ConstructorCompacto() if compacto else _ConstructorNodos()
+    return _ParserRegex(tokenizar_regex(expresion), constructor).parse()
@@ -0,0 +1,155 @@
+"""
+Perfilado opcional del generador de analizadores léxicos.
+
+Mide cuánto tarda cada etapa de la construcción (yalex_parser, Shunting Yard, árbol de
+expresión, visitantes, construir_afd, minimizar_AFD, unir_afd_individuales,
+subconjuntos, renderizado) y acumula contadores (posiciones, estados, particiones,
+cierres ε) para comparar construcciones entre cambios de la especificación.
+
+Está apagado por defecto: etapa() devuelve un context manager vacío compartido y
+contar() sólo consulta una variable global. Se activa con --perfil ARCHIVO (ERtoAFD2,
+yalex_parser) o con la variable de entorno PERFIL_LEXER=DIRECTORIO, que escribe
+DIRECTORIO/<programa>.json. El reporte es un JSON con el tiempo total, las etapas
+(llamadas y segundos acumulados) y los contadores.
+
+Uso:
+    perfilado.iniciar("ERtoAFD2", args.perfil)
+    with perfilado.etapa("minimizar_AFD"):
+        ...
+    perfilado.contar("particiones", n)
+    perfilado.terminar()
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+VARIABLE_ENTORNO = "PERFIL_LEXER"
+
+_NULO = nullcontext()
+
+# Perfil de la construcción en curso (None si el perfilado está apagado)
+_perfil = None
+
+
+class Perfil:
+    """Tiempos por etapa y contadores de una construcción."""
+
+    def __init__(self, programa=""):
+        self.programa = programa
+        self.etapas = {}
+        self.contadores = {}
+        self.datos = {}
+        self.ruta = None
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def etapa(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar_etapa(nombre, time.perf_counter() - inicio)
+
+    def sumar_etapa(self, nombre, segundos, llamadas=1):
+        etapa = self.etapas.get(nombre)
+        if etapa is None:
+            etapa = self.etapas[nombre] = [0, 0.0]
+        etapa[0] += llamadas
+        etapa[1] += segundos
+
+    def contar(self, nombre, n=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def anotar(self, clave, valor):
+        """Guarda un dato descriptivo de la construcción (archivo de reglas, opciones...)."""
+        self.datos[clave] = valor
+
+    def combinar(self, reporte):
+        """Suma las etapas y contadores de un reporte (p. ej. el de un proceso trabajador)."""
+        for nombre, etapa in reporte["etapas"].items():
+            self.sumar_etapa(nombre, etapa["segundos"], etapa["llamadas"])
+        for nombre, n in reporte["contadores"].items():
+            self.contar(nombre, n)
+
+    def reporte(self):
+        return {
+            "programa": self.programa,
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_segundos": round(time.perf_counter() - self._inicio, 6),
+            "datos": self.datos,
+            "etapas": {nombre: {"llamadas": llamadas, "segundos": round(segundos, 6)}
+                       for nombre, (llamadas, segundos) in self.etapas.items()},
+            "contadores": self.contadores,
+        }
+
+    def escribir(self, ruta):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.reporte(), f, ensure_ascii=False, indent=2)
+        return ruta
+
+
+def ruta_reporte(programa, ruta=None):
+    """Archivo del reporte: el indicado o DIRECTORIO/<programa>.json según PERFIL_LEXER."""
+    if ruta:
+        return ruta
+    directorio = os.environ.get(VARIABLE_ENTORNO, "").strip()
+    if directorio:
+        return os.path.join(directorio, f"{programa}.json")
+    return None
+
+
+def activo():
+    """Perfil en curso, o None si el perfilado está apagado."""
+    return _perfil
+
+
+def activar(programa=""):
+    global _perfil
+    _perfil = Perfil(programa)
+    return _perfil
+
+
+def desactivar():
+    global _perfil
+    perfil, _perfil = _perfil, None
+    return perfil
+
+
+def iniciar(programa, ruta=None):
+    """
+    Activa el perfilado si se pidió (ruta o PERFIL_LEXER). Devuelve el Perfil o None.
+    El reporte se escribe con terminar().
+    """
+    ruta = ruta_reporte(programa, ruta)
+    if ruta is None:
+        return None
+    perfil = activar(programa)
+    perfil.ruta = ruta
+    return perfil
+
+
+def terminar():
+    """Escribe el reporte del perfil en curso y apaga el perfilado. Devuelve la ruta o None."""
+    perfil = desactivar()
+    if perfil is None or perfil.ruta is None:
+        return None
+    perfil.escribir(perfil.ruta)
+    print(f"Reporte de perfilado escrito en {perfil.ruta}")
+    return perfil.ruta
+
+
+def etapa(nombre):
+    """Context manager que mide la etapa (no hace nada si el perfilado está apagado)."""
+    if _perfil is None:
+        return _NULO
+    return _perfil.etapa(nombre)
+
+
+def contar(nombre, n=1):
+    if _perfil is not None:
+        _perfil.contar(nombre, n)
@@ -1,10 +1,34 @@
+from collections import namedtuple
+
+# Tipos de token del front end de expresiones regulares
+LITERAL = 'LITERAL'
+EPSILON = 'EPSILON'
+OP = 'OP'
+LPAREN = 'LPAREN'
+RPAREN = 'RPAREN'
+
+Token = namedtuple('Token', ['tipo', 'valor'])
+
 operadores = {'+', '?', '*', '|', '.', '(', ')', "'"}
 
+# Operadores unarios posfijos (se aplican al átomo que los precede)
+POSFIJOS = {'*', '+', '?'}
+
+# Secuencias de escape reconocidas dentro y fuera de comillas
+ESCAPES = {'n': '\n', 't': '\t'}
+
+TOKEN_LPAREN = Token(LPAREN, '(')
+TOKEN_RPAREN = Token(RPAREN, ')')
+TOKEN_UNION = Token(OP, '|')
+TOKEN_CONCAT = Token(OP, '.')
+TOKEN_ESTRELLA = Token(OP, '*')
+TOKEN_EPSILON = Token(EPSILON, 'ε')
+
 
 def get_precedence(operator):
     precedencia = {
         '|': 2,
-        '.': 3,  
+        '.': 3,
         '*': 4,
         '+': 1,
         '?': 1
@@ -12,193 +36,213 @@ def get_precedence(operator):
     return precedencia.get(operator, 0)
 
 
-def expand_operators(expression):
-    expanded_expression = []
+def tokenizar_regex(expresion):
+    """
+    Lexer único del front end: convierte la expresión infix en una lista de tokens
+    tipados (LITERAL, EPSILON, OP, LPAREN, RPAREN).
+
+    - 'X' es un literal; dentro de las comillas se aceptan los escapes \\n, \\t, \\' y \\\\.
+      Un literal de varios caracteres ('ab') equivale a la concatenación de sus caracteres.
+    - \\n y \\t fuera de comillas son salto de línea y tabulación.
+    - ( ) | . * + ? son operadores; ε es la cadena vacía.
+    - Cualquier otro carácter (letras, dígitos, ':', '=', '#', ...) es un literal.
+    """
+    tokens = []
     i = 0
-
-    while i < len(expression):
-        char = expression[i]
-
-        if char == '+':
-            if expanded_expression and expanded_expression[-1] == ')':
-                # Extraer la expresión entre paréntesis como base
-                sub_expr = ''
-                count = 0
-                while expanded_expression:
-                    token = expanded_expression.pop()
-                    if token == ')':
-                        count += 1
-                    if token == '(':
-                        count -= 1
-                    sub_expr = token + sub_expr
-                    if count == 0:
-                        break
-                expanded_expression.append(f'({sub_expr}.{sub_expr}*)')
-        elif char == '?':
-            if expanded_expression:
-                base = expanded_expression.pop()
-                expanded_expression.append('(')
-                expanded_expression.append(base)
-                expanded_expression.append('|')
-                expanded_expression.append('ε')
-                expanded_expression.append(')')
-            else:
-                raise ValueError("Error: '?' debe estar precedido por un operando.")
-        #elif char == '\\':
-         #   if i + 1 < len(expression):
-          #      expanded_expression.append(f'\\{expression[i+1]}')
-           #     i += 2
-            #    continue
-        elif char == "'":
+    n = len(expresion)
+    while i < n:
+        c = expresion[i]
+        if c == "'" and expresion[i + 1:i + 3] == "\\'" and expresion[i + 3:i + 4] != "'":
+            # '\' sin la comilla escapada cerrando: es la barra invertida literal
+            tokens.append(Token(LITERAL, '\\'))
+            i += 3
+        elif c == "'":
             j = i + 1
-            while j < len(expression) and expression[j] != "'":
-                j += 1
-            if j < len(expression):
-                contenido = expression[i+1:j]
-                if len(contenido) == 1:
-                    expanded_expression.append(contenido)
-                i = j
+            contenido = []
+            while j < n and expresion[j] != "'":
+                if expresion[j] == '\\' and j + 1 < n:
+                    siguiente = expresion[j + 1]
+                    contenido.append(ESCAPES.get(siguiente, siguiente))
+                    j += 2
+                else:
+                    contenido.append(expresion[j])
+                    j += 1
+            if j >= n:
+                raise ValueError("Literal entre comillas simples no cerrado correctamente.")
+            if len(contenido) > 1:
+                tokens.append(TOKEN_LPAREN)
+                tokens.extend(Token(LITERAL, ch) for ch in contenido)
+                tokens.append(TOKEN_RPAREN)
+            elif contenido:
+                tokens.append(Token(LITERAL, contenido[0]))
+            i = j + 1
+        elif c == '\\' and i + 1 < n and expresion[i + 1] in ESCAPES:
+            tokens.append(Token(LITERAL, ESCAPES[expresion[i + 1]]))
+            i += 2
+        elif c == '(':
+            tokens.append(TOKEN_LPAREN)
+            i += 1
+        elif c == ')':
+            tokens.append(TOKEN_RPAREN)
+            i += 1
+        elif c in '|.*+?':
+            tokens.append(Token(OP, c))
+            i += 1
+        elif c == 'ε':
+            tokens.append(TOKEN_EPSILON)
+            i += 1
         else:
-            if expanded_expression:
-                prev = expanded_expression[-1]
-                # Insertar el operador de concatenación ('.') si se cumple alguna de estas condiciones:
-                # 1. Si el token previo no es un operador y el actual tampoco lo es.
-                # 2. Si el token previo es ')' o '*' y el actual no es operador.
-                # 3. Si el token previo es un literal mapeado (placeholder) y el actual es '('.
-                if ((prev not in operadores and char not in operadores) or \
-                    (prev in [')', '*'] and char not in operadores) or \
-                    (prev in placeholder_to_literal and char == '(')):
-                    expanded_expression.append('.')
-            expanded_expression.append(char)
-        
-        i += 1
-
-    return ''.join(expanded_expression).replace('()', '')
-
-def concatImplicita(infix):
+            tokens.append(Token(LITERAL, c))
+            i += 1
+    return tokens
+
+
+def _termina_operando(token):
+    return token.tipo in (LITERAL, EPSILON, RPAREN) or (token.tipo == OP and token.valor in POSFIJOS)
+
+
+def _inicia_operando(token):
+    return token.tipo in (LITERAL, EPSILON, LPAREN)
+
+
+def insertar_concatenacion(tokens):
+    """Inserta el operador de concatenación explícito y descarta los grupos vacíos '()'."""
+    resultado = []
+    for token in tokens:
+        if token.tipo == RPAREN and resultado and resultado[-1].tipo == LPAREN:
+            # Grupo vacío: se elimina junto con la concatenación que lo precedía
+            resultado.pop()
+            if resultado and resultado[-1] is TOKEN_CONCAT:
+                resultado.pop()
+            continue
+        if resultado and _termina_operando(resultado[-1]) and _inicia_operando(token):
+            resultado.append(TOKEN_CONCAT)
+        resultado.append(token)
+    return resultado
+
+
+def _inicio_atomo(tokens):
+    """Índice donde empieza el átomo al final de la lista (literal o grupo balanceado)."""
+    k = len(tokens) - 1
+    # Un átomo ya cerrado con '*' (por ejemplo (ab)*) se toma completo
+    while k > 0 and tokens[k].tipo == OP and tokens[k].valor in POSFIJOS:
+        k -= 1
+    if tokens[k].tipo != RPAREN:
+        return k
+    profundidad = 0
+    while k >= 0:
+        if tokens[k].tipo == RPAREN:
+            profundidad += 1
+        elif tokens[k].tipo == LPAREN:
+            profundidad -= 1
+            if profundidad == 0:
+                return k
+        k -= 1
+    raise ValueError("Error: paréntesis desbalanceados en la expresión.")
+
+
+def expandir_operadores(tokens):
+    """
+    Reescribe los operadores posfijos que no soporta el árbol:
+      X+ -> (X.X*)
+      X? -> (X|ε)
+    """
     resultado = []
-    for i in range(len(infix)):
-        if i > 0:
-            prev = infix[i - 1]
-            curr = infix[i]
-            # Si el token previo es un operando, o es ')' o uno de los operadores de cierre
-            # (por ejemplo, '*' o '+' o '?'), y el token actual es un operando, '(' o el marcador final '#',
-            # se inserta el operador de concatenación.
-            if ((prev.isalnum() or prev in [')', '*', '+', '?', '#']) and
-                (curr.isalnum() or curr == '(' or curr == '#' )):
-                resultado.append('.')
-            resultado.append(curr)
+    for token in tokens:
+        if token.tipo == OP and token.valor in ('+', '?'):
+            if not resultado or not _termina_operando(resultado[-1]):
+                raise ValueError(f"Error: '{token.valor}' debe estar precedido por un operando.")
+            inicio = _inicio_atomo(resultado)
+            atomo = resultado[inicio:]
+            del resultado[inicio:]
+            resultado.append(TOKEN_LPAREN)
+            resultado.extend(atomo)
+            if token.valor == '+':
+                resultado.append(TOKEN_CONCAT)
+                resultado.extend(atomo)
+                resultado.append(TOKEN_ESTRELLA)
+            else:
+                resultado.append(TOKEN_UNION)
+                resultado.append(TOKEN_EPSILON)
+            resultado.append(TOKEN_RPAREN)
         else:
-            resultado.append(infix[i])
-    return "".join(resultado)
+            resultado.append(token)
+    return resultado
+
 
-def ShuntingYard(expresion):
+def ShuntingYard(tokens):
+    """Algoritmo de Shunting Yard sobre tokens tipados; devuelve la lista postfix."""
     stack = []
     output = []
-    for char in expresion:
-        if char in operadores:
-            if char == '(':
-                stack.append(char)
-            elif char == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                stack.pop()
-            else:
-                while stack and get_precedence(stack[-1]) >= get_precedence(char):
-                    output.append(stack.pop())
-                stack.append(char)
+    for token in tokens:
+        if token.tipo == LPAREN:
+            stack.append(token)
+        elif token.tipo == RPAREN:
+            while stack and stack[-1].tipo != LPAREN:
+                output.append(stack.pop())
+            if not stack:
+                raise ValueError("Error: paréntesis desbalanceados en la expresión.")
+            stack.pop()
+        elif token.tipo == OP:
+            precedencia = get_precedence(token.valor)
+            while stack and stack[-1].tipo == OP and get_precedence(stack[-1].valor) >= precedencia:
+                output.append(stack.pop())
+            stack.append(token)
         else:
-            output.append(char)
+            output.append(token)
 
     while stack:
-        output.append(stack.pop())
-
-    return ''.join(output)
-
-literal_to_placeholder = {
-    "+": "\ue000",
-    "-": "\ue001",
-    "*": "\ue002",
-    "/": "\ue003",
-    "(": "\ue004",
-    ")": "\ue005",
-    ".": "\ue006",
-    "|": "\ue007",
-    "?": "\ue008",
-    "\\'": "\ue00b",
-    "\\": "\ue00c",
-}
-    
-    
-placeholder_to_literal = {v: k for k, v in literal_to_placeholder.items()}
-
-def map_literal_tokens(expresion):
+        token = stack.pop()
+        if token.tipo == LPAREN:
+            raise ValueError("Error: paréntesis desbalanceados en la expresión.")
+        output.append(token)
+
+    return output
+
+
+def convertir_infix_a_postfix_tokens(expresion):
     """
-    Recorre la expresión infix y reemplaza cada literal (del tipo: 'X' donde X es un solo carácter)
-    por un placeholder único.
+    Convierte la expresión infix a una lista postfix de tokens tipados, lista para
+    estructuras.build_expression_tree. Sólo quedan los operadores '|', '.' y '*'.
     """
-    new_expr = ""
-    i = 0
-    while i < len(expresion):
-        if expresion[i] == "'":
-            # Caso especial: literal escapado como '\\''
-            if i + 3 < len(expresion) and expresion[i+1] == '\\' and expresion[i+2] == "'" and expresion[i+3] == "'":
-                char = "\\'"
-                if char in literal_to_placeholder:
-                    new_expr += literal_to_placeholder[char]
-                else:
-                    new_expr += "'" + char + "'"
-                i += 4
-                continue
-            # Comprobar que es un literal de un solo caracter: debe tener la forma 'X'
-            if i + 2 < len(expresion) and expresion[i+2] == "'":
-                char = expresion[i+1]
-                if char in literal_to_placeholder:
-                    new_expr += literal_to_placeholder[char]
-                else:
-                    # Si no está mapeado, lo dejamos con sus comillas
-                    new_expr += "'" + char + "'"
-                i += 3
-                continue
-        new_expr += expresion[i]
-        i += 1
-    return new_expr
-
-def restore_literal_tokens(expresion):
+    tokens = tokenizar_regex(expresion)
+    tokens = insertar_concatenacion(tokens)
+    tokens = expandir_operadores(tokens)
+    return ShuntingYard(tokens)
+
+
+def postfix_a_texto(tokens):
     """
-    Recorre la expresión (por ejemplo, el resultado postfix) y reemplaza los placeholders
-    por sus literales originales, mostrándolos con comillas simples.
+    Serializa una lista postfix de tokens al formato de texto que entiende
+    estructuras.tokenize_postfix (literales especiales entre comillas simples).
     """
-    new_expr = ""
-    for ch in expresion:
-        if ch in placeholder_to_literal:
-            new_expr += "'" + placeholder_to_literal[ch] + "'"
+    partes = []
+    barra_previa = False
+    for token in tokens:
+        valor = token.valor
+        if token.tipo != LITERAL:
+            texto = valor
+        elif valor == '\n':
+            texto = '\\n'
+        elif valor == '\t':
+            texto = '\\t'
+        elif valor == "'":
+            texto = "'\\''"
+        elif valor in operadores:
+            texto = f"'{valor}'"
+        elif barra_previa and valor in ESCAPES:
+            # Evita que una barra invertida suelta seguida de n/t se lea como escape
+            texto = f"'{valor}'"
         else:
-            new_expr += ch
-    return new_expr
+            texto = valor
+        barra_previa = texto == '\\'
+        partes.append(texto)
+    return ''.join(partes)
 
 
 def convert_infix_to_postfix(expresion):
     """
-    Convierte la expresión infix a postfix.
-    Se reemplazan secuencias especiales, se mapean los literales a placeholders,
-    se aplican las funciones de expansión, concatenación implícita y Shunting Yard,
-    y finalmente se restauran los literales.
+    Convierte la expresión infix a postfix en formato de texto.
+    Equivale a serializar el resultado de convertir_infix_a_postfix_tokens.
     """
-    # Reemplazar secuencias especiales para evitar interferencias (opcional)
-    expresion = expresion.replace("\\n", "ĉ").replace("\\t", "ŵ")
-    
-    # Mapear los literales a placeholders
-    mapped_expr = map_literal_tokens(expresion)
-    
-    # Aplicar la expansión de operadores y la concatenación implícita
-    expanded_expression = expand_operators(mapped_expr)
-    expanded_expression = concatImplicita(expanded_expression)
-    
-    # Aplicar el algoritmo de Shunting Yard (que trabaja a nivel de caracteres)
-    postfix = ShuntingYard(expanded_expression)
-    postfix = postfix.replace('ĉ', '\\n').replace('ŵ', '\\t')
-    
-    # Restaurar los literales a su forma original (con comillas)
-    postfix = restore_literal_tokens(postfix)
-    return postfix
+    return postfix_a_texto(convertir_infix_a_postfix_tokens(expresion))
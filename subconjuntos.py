@@ -1,4 +1,9 @@
-from graphviz import Digraph
+try:
+    from graphviz import Digraph
+except ImportError:
+    Digraph = None
+
+import perfilado
 
 # Alias para tipos (opcional)
 AFDState = frozenset[int]
@@ -56,6 +61,7 @@ def findClosure(afn: dict, state: int, alreadyEvaluated: set) -> tuple[set, set]
         (incluido el propio state)
       - inputs es el conjunto de símbolos (distintos de ε) que salen del cierre.
     """
+    perfilado.contar("cierres_epsilon")
     if state in alreadyEvaluated:
         return set(), set()
     alreadyEvaluated.add(state)
@@ -78,6 +84,9 @@ def newAFD(transitions: AFDTransitions, accepted: list[AFDState], inicial: froze
 
 def generate_dfa_graph(afd, filename="afd_graph"):
     """Genera el grafo del AFD usando Graphviz, renombrando los estados como (por ejemplo, {q0, q1, ...})."""
+    if Digraph is None:
+        print("La biblioteca 'graphviz' no está instalada; no se genera el grafo del AFD.")
+        return
     dot = Digraph()
     dot.attr(rankdir='LR')
     
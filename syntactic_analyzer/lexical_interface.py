@@ -4,9 +4,25 @@ Este módulo maneja la lectura y procesamiento de tokens desde archivos de salid
 """
 
 import os
-from typing import List
+import re
+import sys
+import ast
+import mmap
+from array import array
+from collections import defaultdict
+from typing import List, Iterator, Optional, Tuple, Union, Iterable
 from dataclasses import dataclass
 
+# Raíz del repositorio: el índice de líneas es el del escáner (escaner.IndiceLineas)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from escaner import IndiceLineas, MAGIA_BINARIA, leer_encabezado_binario, leer_registros_binario
+
+# NumPy es opcional: CompiledTokenMap lo usa para aplicar la tabla en bloque si está
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class CustomMatch:
     """Clase que imita la funcionalidad básica de re.match para el patrón específico requerido"""
@@ -79,6 +95,281 @@ class LexicalToken:
         return f"{self.token_type}('{self.value}')"
 
 
+# Encabezado de los archivos binarios de tokens (el formato se define en escaner)
+BINARY_MAGIC = MAGIA_BINARIA
+
+
+def is_binary_token_file(tokens_file: str) -> bool:
+    """True si el archivo empieza con el encabezado del formato binario"""
+    with open(tokens_file, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+# Nombre del token al inicio de cada línea del archivo de tokens de texto
+_TOKEN_NAME = re.compile(rb'^(\S+)', re.MULTILINE)
+
+
+class TokenView:
+    """
+    Vista liviana de un token dentro de un TokenBuffer: sólo guarda el buffer y el
+    índice; el tipo y el lexema se leen del buffer cuando se piden.
+    """
+    __slots__ = ('buffer', 'index')
+    
+    def __init__(self, buffer: 'TokenBuffer', index: int):
+        self.buffer = buffer
+        self.index = index
+    
+    @property
+    def token_type(self) -> str:
+        return self.buffer.token_names[self.buffer.ids[self.index]]
+    
+    @property
+    def value(self) -> str:
+        return self.buffer.lexeme(self.index)
+    
+    @property
+    def line(self) -> int:
+        return self.buffer.position(self.index)[0]
+    
+    @property
+    def column(self) -> int:
+        return self.buffer.position(self.index)[1]
+    
+    @property
+    def start(self) -> int:
+        return self.buffer.starts[self.index]
+    
+    @property
+    def end(self) -> int:
+        return self.buffer.ends[self.index]
+    
+    def to_token(self) -> LexicalToken:
+        """Materializa el token como LexicalToken"""
+        line, column = self.buffer.position(self.index)
+        return LexicalToken(self.token_type, self.value, line, column)
+    
+    def __repr__(self):
+        return f"{self.token_type}('{self.value}')"
+
+
+class LineIndex(IndiceLineas):
+    """
+    escaner.IndiceLineas con los nombres del resto del módulo: los inicios de línea
+    (con \\n, \\r\\n y \\r como saltos de línea) y la columna en caracteres se calculan
+    en un solo lugar, igual que en el escáner.
+    """
+    __slots__ = ()
+    
+    source = property(lambda self: self.datos)
+    starts = property(lambda self: self.inicios)
+    line = IndiceLineas.linea
+    position = IndiceLineas.posicion
+
+
+class TokenBuffer:
+    """
+    Tokens guardados en columnas en lugar de un objeto por token:
+      - ids: id del tipo de token (array('H')), con los nombres en token_names
+      - starts/ends: offsets del lexema en el buffer fuente (array('I'), 'Q' si el
+        buffer no cabe en 32 bits)
+    El lexema se obtiene al pedirlo cortando el buffer fuente. Si source es bytes los
+    offsets son en bytes y el lexema se decodifica como UTF-8. Según layout, source es:
+      - SOURCE: el texto escaneado (el lexema es el corte)
+      - LITERALS: un archivo de tokens de texto (el corte es un literal de Python)
+      - RECORDS: un archivo binario de tokens (el corte son los bytes del registro)
+    La línea y columna no se guardan: se calculan la primera vez que se pide una
+    posición (LineIndex del texto, o una pasada por los lexemas con RECORDS).
+    """
+    SOURCE = 'source'
+    LITERALS = 'literals'
+    RECORDS = 'records'
+    
+    def __init__(self, source: Union[str, bytes, memoryview] = b"", token_names: Optional[List[str]] = None,
+                 layout: str = SOURCE):
+        self.source = source
+        self.layout = layout
+        # Tabla de nombres de token: cada nombre se guarda una sola vez
+        self.token_names: List[str] = list(token_names or [])
+        self.token_ids = {name: i for i, name in enumerate(self.token_names)}
+        offset_type = 'I' if len(source) <= 0xFFFFFFFF else 'Q'
+        self.ids = array('H')
+        self.starts = array(offset_type)
+        self.ends = array(offset_type)
+        self._line_index = None
+        self._record_positions = None
+    
+    def intern(self, token_type: str) -> int:
+        """Devuelve el id del tipo de token, agregándolo a la tabla si es nuevo"""
+        token_id = self.token_ids.get(token_type)
+        if token_id is None:
+            token_id = self.token_ids[token_type] = len(self.token_names)
+            self.token_names.append(token_type)
+        return token_id
+    
+    def append(self, token_id: int, start: int, end: int) -> None:
+        """Agrega un token por id de tipo y offsets en el buffer fuente"""
+        self.ids.append(token_id)
+        self.starts.append(start)
+        self.ends.append(end)
+    
+    @property
+    def line_index(self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(self.source)
+        return self._line_index
+    
+    def position(self, index: int) -> Tuple[int, int]:
+        """
+        (línea, columna) del token index. Para un buffer leído de un archivo de tokens
+        de texto es la línea del archivo y columna 1, como en read_detailed_tokens_from_file.
+        """
+        if self.layout == self.LITERALS:
+            return self.line_index.line(self.starts[index]), 1
+        if self.layout == self.RECORDS:
+            if self._record_positions is None:
+                self._record_positions = self._compute_record_positions()
+            lines, columns = self._record_positions
+            return lines[index], columns[index]
+        return self.line_index.position(self.starts[index])
+    
+    def _compute_record_positions(self) -> Tuple[array, array]:
+        """
+        Posición de cada token de un archivo binario: los lexemas concatenados son el
+        texto original, así que basta contar los saltos de línea en una pasada.
+        """
+        source = self.source
+        lines = array('I')
+        columns = array('I')
+        line = 1
+        column = 1
+        for start, end in zip(self.starts, self.ends):
+            lines.append(line)
+            columns.append(column)
+            chunk = source[start:end]
+            newlines = chunk.count(b'\n')
+            if newlines:
+                line += newlines
+                chunk = chunk[chunk.rfind(b'\n') + 1:]
+                column = 1
+            column += len(chunk) if chunk.isascii() else len(bytes(chunk).decode('utf-8', 'surrogateescape'))
+        return lines, columns
+    
+    def lexeme(self, index: int) -> str:
+        """Lexema del token index, cortado del buffer fuente"""
+        text = self.source[self.starts[index]:self.ends[index]]
+        if not isinstance(text, str):
+            # Los bytes inválidos quedan como escapes sustitutos, igual que en el escáner
+            text = bytes(text).decode('utf-8', 'surrogateescape')
+            if '\r' in text:
+                # Igual que el escáner: \r\n y \r se leen como \n
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if self.layout == self.LITERALS:
+            text = ast.literal_eval(text)
+        return text
+    
+    def token_type(self, index: int) -> str:
+        return self.token_names[self.ids[index]]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index: int) -> TokenView:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("índice de token fuera de rango")
+        return TokenView(self, index)
+    
+    def __iter__(self) -> Iterator[TokenView]:
+        for index in range(len(self.ids)):
+            yield TokenView(self, index)
+    
+    def token_types(self) -> List[str]:
+        """Lista de nombres de token (la entrada de LRParser.parse)"""
+        names = self.token_names
+        return [names[token_id] for token_id in self.ids]
+    
+    @classmethod
+    def from_scan(cls, source: Union[str, bytes], tokens, token_names: List[str]) -> 'TokenBuffer':
+        """
+        Construye el buffer a partir de la salida del escáner: tuplas
+        (id_token, inicio, fin) con offsets en source (escaner.escanear_bytes) y la
+        tabla de nombres del AFD compilado (nombres_token).
+        """
+        buffer = cls(source, token_names)
+        append = buffer.append
+        for token_id, start, end in tokens:
+            append(token_id, start, end)
+        return buffer
+    
+    @classmethod
+    def from_token_file(cls, tokens_file: str) -> 'TokenBuffer':
+        """
+        Construye el buffer desde un archivo de tokens (TOKEN_TYPE 'value' por línea) sin
+        crear objetos por línea: el valor queda como offsets del literal dentro del
+        archivo. La línea del token es la del archivo, como en read_detailed_tokens_from_file.
+        """
+        with open(tokens_file, 'rb') as f:
+            data = f.read()
+        buffer = cls(data, layout=cls.LITERALS)
+        intern = buffer.intern
+        append = buffer.append
+        pos = 0
+        line_number = 0
+        n = len(data)
+        while pos < n:
+            line_end = data.find(b'\n', pos)
+            if line_end < 0:
+                line_end = n
+            line_number += 1
+            # TOKEN_TYPE, espacios y el literal del valor entre comillas
+            name_end = pos
+            while name_end < line_end and data[name_end] not in b' \t\r':
+                name_end += 1
+            start = name_end
+            while start < line_end and data[start] in b' \t':
+                start += 1
+            end = line_end
+            while end > start and data[end - 1] in b' \t\r':
+                end -= 1
+            if name_end > pos and end - start >= 2 and data[start] in b'\'"' and data[end - 1] == data[start]:
+                append(intern(data[pos:name_end].decode('utf-8')), start, end)
+            elif end > pos:
+                print(f"Advertencia: No se pudo parsear línea {line_number}: {data[pos:end].decode('utf-8', 'replace')}")
+            pos = line_end + 1
+        return buffer
+    
+    @classmethod
+    def from_binary_file(cls, tokens_file: str) -> 'TokenBuffer':
+        """
+        Construye el buffer desde un archivo binario de tokens (escaner.escribir_tokens_binario)
+        sin copiar los lexemas: el archivo se mapea con mmap y cada token queda como
+        offsets de sus bytes dentro del mapeo.
+        """
+        with open(tokens_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"{tokens_file} no es un archivo binario de tokens")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = leer_encabezado_binario(data)
+        if header is None:
+            raise ValueError(f"{tokens_file} no es un archivo binario de tokens")
+        names, pos = header
+        
+        buffer = cls(data, names, layout=cls.RECORDS)
+        pos = leer_registros_binario(data, pos, buffer.ids, buffer.starts, buffer.ends)
+        if pos != len(data):
+            raise ValueError(f"{tokens_file}: registro truncado al final del archivo")
+        return buffer
+    
+    def write_text(self, output_file: str) -> None:
+        """Exporta los tokens al formato de texto TOKEN_TYPE 'value' (para depurar)"""
+        names = self.token_names
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for index, token_id in enumerate(self.ids):
+                f.write(f"{names[token_id]:<15} {self.lexeme(index)!r}\n")
+
+
 class TokenFileReader:
     """Lector de archivos de tokens del analizador léxico"""
     
@@ -94,7 +385,7 @@ class TokenFileReader:
         Lee tokens desde un archivo de salida del analizador léxico.
         
         Args:
-            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value'
+            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value' o binario
             
         Returns:
             list: Lista de nombres de tokens (sin whitespace)
@@ -102,6 +393,11 @@ class TokenFileReader:
         tokens = []
         
         try:
+            if is_binary_token_file(tokens_file):
+                buffer = TokenBuffer.from_binary_file(tokens_file)
+                ignored = TokenFileReader.IGNORED_TOKENS
+                return [name for name in buffer.token_types() if name not in ignored]
+            
             with open(tokens_file, 'r', encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
@@ -135,7 +431,7 @@ class TokenFileReader:
         Lee tokens detallados desde un archivo de salida del analizador léxico.
         
         Args:
-            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value'
+            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value' o binario
             
         Returns:
             list: Lista de objetos LexicalToken
@@ -143,6 +439,9 @@ class TokenFileReader:
         tokens = []
         
         try:
+            if is_binary_token_file(tokens_file):
+                return [view.to_token() for view in TokenBuffer.from_binary_file(tokens_file)]
+            
             with open(tokens_file, 'r', encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
@@ -166,6 +465,80 @@ class TokenFileReader:
             return []
         
         return tokens
+    
+    @staticmethod
+    def read_token_ids_from_file(tokens_file: str, block_size: int = 1 << 22) -> Tuple[array, List[str]]:
+        """
+        Lee sólo los tipos de token de un archivo grande, por bloques y sin objetos por
+        línea: en cada bloque una expresión regular toma el nombre al inicio de cada
+        línea y un dict lo convierte a id, ambos recorridos en C. Los valores no se leen
+        ni se validan.
+        
+        Args:
+            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value' o binario
+            block_size: Bytes por bloque leído
+            
+        Returns:
+            Tuple[array, List[str]]: ids de token por línea (array('H')) y tabla de nombres
+        """
+        if is_binary_token_file(tokens_file):
+            buffer = TokenBuffer.from_binary_file(tokens_file)
+            return buffer.ids, buffer.token_names
+        
+        # Un nombre nuevo recibe el siguiente id al buscarlo por primera vez
+        name_ids = defaultdict()
+        name_ids.default_factory = name_ids.__len__
+        ids = array('H')
+        findall = _TOKEN_NAME.findall
+        carry = b''
+        with open(tokens_file, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                # Sólo líneas completas; el resto pasa al bloque siguiente
+                cut = block.rfind(b'\n') + 1
+                if cut == 0:
+                    carry += block
+                    continue
+                ids.extend(map(name_ids.__getitem__, findall(carry + block[:cut] if carry else block[:cut])))
+                carry = block[cut:]
+        if carry:
+            ids.extend(map(name_ids.__getitem__, findall(carry)))
+        names = [name.decode('utf-8') for name in name_ids]
+        return ids, names
+    
+    @staticmethod
+    def read_tokens_bulk(tokens_file: str) -> List[str]:
+        """
+        Igual que read_tokens_from_file para archivos bien formados, pero con el lector
+        por bloques (read_token_ids_from_file): filtra los ignorados por id.
+        """
+        ids, names = TokenFileReader.read_token_ids_from_file(tokens_file)
+        keep = [None if name in TokenFileReader.IGNORED_TOKENS else name for name in names]
+        return [name for name in map(keep.__getitem__, ids) if name is not None]
+    
+    @staticmethod
+    def read_token_buffer_from_file(tokens_file: str) -> TokenBuffer:
+        """
+        Lee tokens en un TokenBuffer columnar (ver TokenBuffer.from_token_file y
+        TokenBuffer.from_binary_file).
+        
+        Args:
+            tokens_file: Archivo con tokens en formato TOKEN_TYPE 'value' o binario
+            
+        Returns:
+            TokenBuffer: tokens del archivo, incluidos los de whitespace
+        """
+        try:
+            if is_binary_token_file(tokens_file):
+                return TokenBuffer.from_binary_file(tokens_file)
+            return TokenBuffer.from_token_file(tokens_file)
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {tokens_file}")
+        except Exception as e:
+            print(f"Error leyendo archivo de tokens: {e}")
+        return TokenBuffer()
 
 
 class TokenMapper:
@@ -254,6 +627,93 @@ class TokenMapper:
         return syntax_tokens
 
 
+class CompiledTokenMap:
+    """
+    Traducción compilada de ids de token del léxico a ids de terminal del sintáctico,
+    construida una sola vez con TOKEN_MAPPING, IGNORED_TOKENS y los terminales de la
+    gramática. table[id_lexico] es el id del terminal (índice en terminals), DROP si
+    el token se ignora o UNKNOWN para los tokens de error del léxico, que se pasan al
+    parser para que reporte el error en su posición.
+    
+    Al construirla se valida que todo token del léxico tenga un terminal, así un
+    token no declarado en la gramática falla aquí y no a mitad del análisis.
+    """
+    DROP = -2
+    UNKNOWN = -1
+    
+    def __init__(self, lexer_tokens: Iterable[str], terminals: Iterable[str], mapping: Optional[dict] = None,
+                 ignored: Optional[Iterable[str]] = None, error_tokens: Iterable[str] = ('ERROR',)):
+        """
+        Args:
+            lexer_tokens: Nombres de token del léxico, en orden de id
+            terminals: Terminales del sintáctico, en orden de id (p. ej. CompiledSLRTable.terminals)
+            mapping: Nombre del léxico -> terminal (por defecto TokenMapper.TOKEN_MAPPING)
+            ignored: Tokens que se descartan (por defecto TokenFileReader.IGNORED_TOKENS)
+            error_tokens: Tokens del léxico que no son terminales y se pasan como UNKNOWN
+            
+        Raises:
+            ValueError: si algún token del léxico no corresponde a un terminal
+        """
+        mapping = TokenMapper.TOKEN_MAPPING if mapping is None else mapping
+        ignored = set(TokenFileReader.IGNORED_TOKENS if ignored is None else ignored)
+        error_tokens = set(error_tokens)
+        self.lexer_tokens = list(lexer_tokens)
+        self.terminals = list(terminals)
+        self.terminal_ids = {terminal: i for i, terminal in enumerate(self.terminals)}
+        
+        table = []
+        missing = []
+        for name in self.lexer_tokens:
+            if name in ignored:
+                table.append(self.DROP)
+                continue
+            terminal = mapping.get(name, name)
+            terminal_id = self.terminal_ids.get(terminal)
+            if terminal_id is None:
+                if name not in error_tokens:
+                    missing.append(name if terminal == name else f"{name} -> {terminal}")
+                terminal_id = self.UNKNOWN
+            table.append(terminal_id)
+        if missing:
+            raise ValueError("Tokens del analizador léxico sin terminal en la gramática: " + ", ".join(missing))
+        
+        self.table = array('h', table)
+        # Nombre que recibe el parser por id del léxico (None si se descarta)
+        self.names = [None if terminal_id == self.DROP
+                      else self.terminals[terminal_id] if terminal_id >= 0 else name
+                      for name, terminal_id in zip(self.lexer_tokens, table)]
+        self._np_table = np.array(table, dtype=np.int16) if np is not None else None
+    
+    @classmethod
+    def for_grammar(cls, lexer_tokens: Iterable[str], grammar, **kwargs) -> 'CompiledTokenMap':
+        """
+        Construye el mapa con los terminales de la gramática en el orden de
+        compile_slr_table (ordenados, con '$' al final).
+        """
+        terminals = sorted(set(grammar.terminals) - {'$'}) + ['$']
+        return cls(lexer_tokens, terminals, **kwargs)
+    
+    def map_ids(self, ids) -> array:
+        """
+        Aplica la tabla a una secuencia de ids del léxico y descarta los ignorados.
+        Con NumPy y un array('H') se hace con take y una máscara.
+        
+        Returns:
+            array: ids de terminal (array('h'); UNKNOWN para los tokens de error)
+        """
+        if self._np_table is not None and isinstance(ids, array) and ids.typecode == 'H':
+            mapped = self._np_table.take(np.frombuffer(ids, dtype=np.uint16))
+            result = array('h')
+            result.frombytes(mapped[mapped != self.DROP].tobytes())
+            return result
+        drop = self.DROP
+        return array('h', [terminal_id for terminal_id in map(self.table.__getitem__, ids) if terminal_id != drop])
+    
+    def map_names(self, ids) -> List[str]:
+        """Igual que map_ids pero devuelve nombres de terminal (entrada de LRParser.parse)"""
+        return [name for name in map(self.names.__getitem__, ids) if name is not None]
+
+
 class LexicalInterface:
     """Interfaz principal entre el analizador léxico y sintáctico"""
     
@@ -283,10 +743,27 @@ class LexicalInterface:
         
         return syntax_tokens
     
+    def load_terminal_ids_from_file(self, tokens_file: str, terminals: Iterable[str]) -> Tuple[array, CompiledTokenMap]:
+        """
+        Carga un archivo de tokens como ids de terminal, con el lector por bloques y un
+        CompiledTokenMap construido para los tokens del archivo.
+        
+        Args:
+            tokens_file: Ruta al archivo de tokens (texto o binario)
+            terminals: Terminales del sintáctico, en orden de id
+            
+        Returns:
+            Tuple[array, CompiledTokenMap]: ids de terminal y el mapa usado
+            
+        Raises:
+            ValueError: si el archivo tiene tokens sin terminal en la gramática
+        """
+        ids, names = self.reader.read_token_ids_from_file(tokens_file)
+        token_map = CompiledTokenMap(names, terminals)
+        return token_map.map_ids(ids), token_map
+    
 def main():
     """Función principal para pruebas del módulo"""
-    import sys
-    
     if len(sys.argv) != 2:
         print("Uso: python lexical_interface.py <archivo_tokens>")
         sys.exit(1)
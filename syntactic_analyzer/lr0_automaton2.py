@@ -26,6 +26,8 @@ class Grammar:
     start_symbol: str = None
     ignored_tokens: Set[str] = field(default_factory=set)
     production_list: List[Any] = field(default_factory=list)
+    # Código de las acciones semánticas declaradas en el .yalp: {nt: {índice de regla: código}}
+    actions: Dict[str, Dict[int, str]] = field(default_factory=dict)
 
 
 @dataclass
@@ -34,6 +36,7 @@ class Production:
     left: str  # Lado izquierdo (no-terminal)
     right: List[str]  # Lado derecho (lista de símbolos)
     number: int  # Número de producción
+    action: Optional[str] = None  # Código de la acción semántica declarada, si existe
     
     def __repr__(self) -> str:
         return f"{self.number}: {self.left} -> {' '.join(self.right)}"
@@ -128,13 +131,17 @@ def load_grammar_from_json(json_file: str) -> Grammar:
             grammar.productions[nt] = rules
         grammar.start_symbol = data['start_symbol']
         grammar.ignored_tokens = set(data.get('ignored_tokens', []))
+        grammar.actions = {
+            nt: {int(idx): code for idx, code in actions.items()}
+            for nt, actions in data.get('actions', {}).items()
+        }
         
         # Crear la lista numerada de producciones
         grammar.production_list = []
         number = 0
         for nt, rules in grammar.productions.items():
-            for rule in rules:
-                prod = Production(nt, rule, number)
+            for rule_idx, rule in enumerate(rules):
+                prod = Production(nt, rule, number, grammar.actions.get(nt, {}).get(rule_idx))
                 grammar.production_list.append(prod)
                 number += 1
         
@@ -208,7 +215,7 @@ def augment_grammar(grammar: Grammar) -> None:
         for idx, (nt, rules) in enumerate(grammar.productions.items()):
             for rule_idx, rule in enumerate(rules):
                 number = idx * 10 + rule_idx  # Numeración que deja espacio entre reglas
-                prod = Production(nt, rule, number)
+                prod = Production(nt, rule, number, grammar.actions.get(nt, {}).get(rule_idx))
                 grammar.production_list.append(prod)
         
         print(f"\nGramática aumentada con: {new_start} -> {original_start}")
@@ -364,7 +371,7 @@ def build_lr0_automaton(grammar: Grammar) -> List[State]:
     # Diccionario para mapear conjuntos de ítems a números de estado
     # Esto nos ayuda a no crear estados duplicados
     item_sets_to_state = {}
-    item_sets_to_state[frozenset(item.production.number for item in initial_state_items)] = 0
+    item_sets_to_state[frozenset((item.production.number, item.dot_position) for item in initial_state_items)] = 0
     
     # Cola de estados por procesar
     states_queue = [0]  # Empezar procesando el estado 0
@@ -389,8 +396,8 @@ def build_lr0_automaton(grammar: Grammar) -> List[State]:
             if not goto_items:  # Si no hay ítems, no hay transición
                 continue
             
-            # Crear una clave para el conjunto de ítems (usando frozenset de números de producción)
-            goto_items_key = frozenset(item.production.number for item in goto_items)
+            # Crear una clave para el conjunto de ítems (producción y posición del punto)
+            goto_items_key = frozenset((item.production.number, item.dot_position) for item in goto_items)
             
             # Verificar si este conjunto de ítems ya existe como estado
             if goto_items_key in item_sets_to_state:
@@ -446,18 +453,19 @@ def goto(items: Set[Item], symbol: str, grammar: Grammar) -> Set[Item]:
     return closure(next_items, grammar) if next_items else set()
 
 
-def export_to_graphviz(states, filename="lr0_automaton"):
+def automaton_to_dot(states):
     """
-    Exporta el autómata LR(0) a un archivo de imagen usando Graphviz.
-    
+    Construye el grafo (Digraph) del autómata LR(0) sin renderizarlo.
+
     Args:
         states: lista de objetos State con los estados del autómata
-        filename: nombre base para .dot y .png
+
+    Returns:
+        Digraph, o None si la biblioteca graphviz no está disponible
     """
     if Digraph is None:
-        print("No se puede generar el gráfico: la biblioteca graphviz no está disponible")
-        return
-        
+        return None
+
     dot = Digraph('LR0', comment='Autómata LR(0)')
     dot.attr(rankdir='LR', fontsize='10')
     dot.attr('node', shape='box', fontname='Courier', fontsize='9')
@@ -494,7 +502,23 @@ def export_to_graphviz(states, filename="lr0_automaton"):
                 continue
             dot.edge(f"I{state.number}", f"I{target_state}", label=str(symbol))
 
-    # 3) renderizar
+    return dot
+
+
+def export_to_graphviz(states, filename="lr0_automaton"):
+    """
+    Exporta el autómata LR(0) a un archivo de imagen usando Graphviz.
+    
+    Args:
+        states: lista de objetos State con los estados del autómata
+        filename: nombre base para .dot y .png
+    """
+    dot = automaton_to_dot(states)
+    if dot is None:
+        print("No se puede generar el gráfico: la biblioteca graphviz no está disponible")
+        return
+
+    # Renderizar
     try:
         dot.render(filename, format='png', cleanup=True)
         print(f"Grafo generado: {filename}.png")
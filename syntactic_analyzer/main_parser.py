@@ -1,11 +1,16 @@
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # Importar componentes necesarios del analizador sintáctico
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from yapar_parser2 import parse_yalp_file, parse_yalp_to_json
 
+# Raíz del repositorio, para el interruptor de renderizado del generador léxico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from visualizacion import VARIABLE_ENTORNO, render_habilitado
+
 # Importar componentes de LR(0)
 from lr0_automaton2 import (
     load_grammar_from_json, augment_grammar, create_initial_items,
@@ -142,6 +147,7 @@ def print_sets_table(sets, title):
 # Variables globales para almacenar la gramática y la tabla SLR
 global_grammar = None
 global_slr_table = None
+global_trace_file = None
 
 # Función principal
 def main():
@@ -159,7 +165,19 @@ def main():
         required=True,
         help="Archivo con tokens de salida del analizador léxico (requerido)"
     )
+    parser.add_argument(
+        "--render",
+        action="store_true",
+        default=None,
+        help=f"Generar la imagen PNG del autómata LR(0) (también con {VARIABLE_ENTORNO}=1)"
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Archivo donde guardar la traza binaria del análisis (ver parse_trace.replay_trace)"
+    )
     args = parser.parse_args()
+    render = render_habilitado(args.render)
     
     # Verificar si el archivo YALP existe
     if not os.path.exists(args.yalp_file):
@@ -233,9 +251,14 @@ def main():
     
     states = build_lr0_automaton(grammar)
     
-    # Generar visualización gráfica del autómata
+    # Generar visualización gráfica del autómata sólo si se pidió; el proceso 'dot'
+    # corre en un hilo en segundo plano mientras se construye la tabla SLR
     automaton_filename = os.path.join(resources_dir, f"{file_name_without_ext}_automaton")
-    export_to_graphviz(states, filename=automaton_filename)
+    render_executor = None
+    render_future = None
+    if render:
+        render_executor = ThreadPoolExecutor(max_workers=1)
+        render_future = render_executor.submit(export_to_graphviz, states, filename=automaton_filename)
     
     # Mostrar cada estado con sus items
     print("\n" + "=" * 80)
@@ -299,7 +322,10 @@ def main():
     print("\n" + "=" * 80)
     print("VISUALIZACIÓN DEL AUTÓMATA LR(0)")
     print("=" * 80)
-    print(f"La imagen del autómata LR(0) se ha generado en: {automaton_filename}.png")
+    if render:
+        print(f"La imagen del autómata LR(0) se está generando en: {automaton_filename}.png")
+    else:
+        print(f"Imagen del autómata omitida (use --render o {VARIABLE_ENTORNO}=1 para generarla)")
     
     # Construir y mostrar la tabla SLR
     print("\n" + "=" * 80)
@@ -312,9 +338,10 @@ def main():
     print_table_ascii(slr_table)
     
     # Guardar la gramática y la tabla SLR como variables globales para su uso posterior
-    global global_grammar, global_slr_table
+    global global_grammar, global_slr_table, global_trace_file
     global_grammar = grammar
     global_slr_table = slr_table
+    global_trace_file = args.trace
     
     # Cargar tokens usando la interfaz léxica
     print("\n" + "=" * 80)
@@ -331,6 +358,11 @@ def main():
         print(f"Error: No se pudieron cargar tokens válidos desde {args.tokens_file}")
         sys.exit(1)
     
+    # Esperar a que termine la imagen del autómata
+    if render_future is not None:
+        render_future.result()
+        render_executor.shutdown()
+
     # Retornar la gramática y la tabla para uso externo
     return grammar, slr_table, tokens_inputs
 
@@ -351,7 +383,13 @@ if __name__ == "__main__":
     
     # Crear el parser LR y ejecutar el análisis
     parser = LRParser(slr_table, grammar)
-    success, message = parser.parse(tokens_inputs, verbose=True)
+    if global_trace_file:
+        from parse_trace import BinaryTraceRecorder
+        with BinaryTraceRecorder(global_trace_file) as recorder:
+            success, message = parser.parse(tokens_inputs, verbose=True, observer=recorder)
+        print(f"Traza del análisis guardada en: {global_trace_file}")
+    else:
+        success, message = parser.parse(tokens_inputs, verbose=True)
     
     print("\nResultado:", "ACEPTADA" if success else "RECHAZADA")
     print("Mensaje:", message)
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""
+Observadores del análisis sintáctico LR.
+
+Los parsers (parsing_LR.LRParser, slr_table.SLRParser) no imprimen ni registran nada
+en su ciclo principal: si reciben un observador usan un ciclo aparte que lo llama en
+cada shift, reduce, accept y error; sin observador el ciclo no tiene ninguna
+comprobación de traza.
+
+Callbacks, llamados después de actualizar la pila (todos reciben la pila de estados
+viva; si se guarda, hay que copiarla):
+    shift(state, token, target, stack)
+    reduce(state, production, target, stack)   state: tope antes de reducir
+    accept(state, stack)
+    error(state, token, message, stack)
+
+BinaryTraceRecorder escribe los eventos en un formato binario compacto y
+replay_trace los vuelve a emitir sobre otro observador (p. ej. PrintObserver) para
+inspeccionar un análisis fuera de línea.
+"""
+
+from collections import deque
+
+# Firma y versión del archivo de traza
+TRACE_MAGIC = b"LRTR\x01"
+
+# Tipos de registro
+_NAME = 0
+_SHIFT = 1
+_REDUCE = 2
+_ACCEPT = 3
+_ERROR = 4
+
+_FLUSH_SIZE = 1 << 16
+
+
+class ParseObserver:
+    """Observador base: todos los eventos se ignoran."""
+
+    def shift(self, state, token, target, stack):
+        pass
+
+    def reduce(self, state, production, target, stack):
+        pass
+
+    def accept(self, state, stack):
+        pass
+
+    def error(self, state, token, message, stack):
+        pass
+
+
+class MultiObserver(ParseObserver):
+    """Reenvía cada evento a varios observadores, en orden."""
+
+    def __init__(self, *observers):
+        self.observers = observers
+
+    def shift(self, state, token, target, stack):
+        for observer in self.observers:
+            observer.shift(state, token, target, stack)
+
+    def reduce(self, state, production, target, stack):
+        for observer in self.observers:
+            observer.reduce(state, production, target, stack)
+
+    def accept(self, state, stack):
+        for observer in self.observers:
+            observer.accept(state, stack)
+
+    def error(self, state, token, message, stack):
+        for observer in self.observers:
+            observer.error(state, token, message, stack)
+
+
+class PrintObserver(ParseObserver):
+    """Muestra cada paso: número, pila de estados, token y acción."""
+
+    def __init__(self, out=None):
+        self.out = out
+        self.step = 0
+        print(f"{'Paso':<5} {'Pila':<15} {'Token':<15} {'Acción'}", file=self.out)
+        print("─" * 50, file=self.out)
+
+    def _line(self, stack, token, action):
+        self.step += 1
+        print(f"{self.step:<5} {' '.join(map(str, stack)):<15} {token:<15} {action}", file=self.out)
+
+    def shift(self, state, token, target, stack):
+        self._line(stack[:-1], token, f"s{target}")
+
+    def reduce(self, state, production, target, stack):
+        print(f"{'':<5} Reducir por: {production} (goto {target})", file=self.out)
+
+    def accept(self, state, stack):
+        self._line(stack, "$", "acc")
+
+    def error(self, state, token, message, stack):
+        self._line(stack, token, "err")
+        print(f"      {message}", file=self.out)
+
+
+class RingObserver(ParseObserver):
+    """
+    Conserva los últimos `size` eventos como dicts (step, kind, state, symbol, target,
+    stack) en un buffer circular.
+    """
+
+    def __init__(self, size):
+        self.steps = deque(maxlen=size)
+        self.count = 0
+
+    def _add(self, kind, state, symbol, target, stack):
+        self.count += 1
+        self.steps.append({
+            'step': self.count,
+            'kind': kind,
+            'state': state,
+            'symbol': symbol,
+            'target': target,
+            'stack': stack[:],
+        })
+
+    def shift(self, state, token, target, stack):
+        self._add('shift', state, token, target, stack)
+
+    def reduce(self, state, production, target, stack):
+        self._add('reduce', state, production, target, stack)
+
+    def accept(self, state, stack):
+        self._add('accept', state, '$', None, stack)
+
+    def error(self, state, token, message, stack):
+        self._add('error', state, token, message, stack)
+
+
+def _write_varint(n, out):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class BinaryTraceRecorder(ParseObserver):
+    """
+    Escribe los eventos en un archivo binario:
+        TRACE_MAGIC, luego registros (tipo: 1 byte, campos varint)
+        NAME    largo, UTF-8           define el siguiente id de nombre de token
+        SHIFT   estado, id token, destino
+        REDUCE  estado, número de producción, aridad, destino
+        ACCEPT  estado
+        ERROR   estado, id token, largo, mensaje UTF-8
+    La pila no se guarda: replay_trace la reconstruye con los destinos y la aridad.
+    Se usa como context manager o llamando a close().
+    """
+
+    def __init__(self, target):
+        if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+            self.file = open(target, 'wb')
+            self._owns_file = True
+        else:
+            self.file = target
+            self._owns_file = False
+        self.names = {}
+        self.buffer = bytearray(TRACE_MAGIC)
+
+    def _name_id(self, name):
+        name_id = self.names.get(name)
+        if name_id is None:
+            name_id = self.names[name] = len(self.names)
+            data = name.encode('utf-8')
+            self.buffer.append(_NAME)
+            _write_varint(len(data), self.buffer)
+            self.buffer += data
+        return name_id
+
+    def _record(self, kind, *fields):
+        buffer = self.buffer
+        buffer.append(kind)
+        for field in fields:
+            _write_varint(field, buffer)
+        if len(buffer) >= _FLUSH_SIZE:
+            self.flush()
+
+    def shift(self, state, token, target, stack):
+        self._record(_SHIFT, state, self._name_id(token), target)
+
+    def reduce(self, state, production, target, stack):
+        self._record(_REDUCE, state, production.number, len(production.right), target)
+
+    def accept(self, state, stack):
+        self._record(_ACCEPT, state)
+
+    def error(self, state, token, message, stack):
+        data = message.encode('utf-8')
+        self._record(_ERROR, state, self._name_id(token), len(data))
+        self.buffer += data
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def replay_trace(source, observer, grammar=None):
+    """
+    Emite sobre `observer` los eventos de una traza de BinaryTraceRecorder, en orden,
+    reconstruyendo la pila de estados.
+
+    Args:
+        source: ruta del archivo o bytes de la traza
+        observer: ParseObserver que recibe los eventos
+        grammar: Grammar con production_list; si se da, reduce recibe el objeto
+            Production, si no, su número
+
+    Returns:
+        int: cantidad de eventos emitidos
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+    if not data.startswith(TRACE_MAGIC):
+        raise ValueError("El archivo no es una traza de BinaryTraceRecorder")
+
+    productions = {}
+    if grammar is not None:
+        productions = {prod.number: prod for prod in grammar.production_list}
+    names = []
+    stack = [0]
+    events = 0
+    pos = len(TRACE_MAGIC)
+    n = len(data)
+    while pos < n:
+        kind = data[pos]
+        pos += 1
+        if kind == _NAME:
+            length, pos = _read_varint(data, pos)
+            names.append(data[pos:pos + length].decode('utf-8'))
+            pos += length
+            continue
+        state, pos = _read_varint(data, pos)
+        if kind == _SHIFT:
+            token_id, pos = _read_varint(data, pos)
+            target, pos = _read_varint(data, pos)
+            stack.append(target)
+            observer.shift(state, names[token_id], target, stack)
+        elif kind == _REDUCE:
+            number, pos = _read_varint(data, pos)
+            arity, pos = _read_varint(data, pos)
+            target, pos = _read_varint(data, pos)
+            if arity:
+                del stack[-arity:]
+            stack.append(target)
+            observer.reduce(state, productions.get(number, number), target, stack)
+        elif kind == _ACCEPT:
+            observer.accept(state, stack)
+            stack = [0]
+        elif kind == _ERROR:
+            token_id, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            message = data[pos:pos + length].decode('utf-8')
+            pos += length
+            observer.error(state, names[token_id], message, stack)
+            stack = [0]
+        else:
+            raise ValueError(f"Registro de traza desconocido {kind} en el byte {pos - 1}")
+        events += 1
+    return events
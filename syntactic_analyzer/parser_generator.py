@@ -0,0 +1,222 @@
+"""
+Generador de analizadores sintácticos.
+Escribe un módulo de Python autónomo con la tabla SLR(1) compilada (CompiledSLRTable):
+ACTION y GOTO planos, aridad y lado izquierdo de cada producción, y un ciclo
+shift-reduce derivado de parsing_LR.LRParser. El módulo generado sólo usa la
+biblioteca estándar y no analiza la gramática al importarse.
+
+Uso:
+    python parser_generator.py -y resources/slr-1.yalp -o slr1_parser.py
+    python slr1_parser.py tokens.txt
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+import io
+import tempfile
+from array import array
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from yapar_parser2 import parse_yalp_to_json
+from lr0_automaton2 import load_grammar_from_json, augment_grammar, build_lr0_automaton
+from slr_table import build_slr_table_for_lr0, compile_slr_table, CompiledSLRTable
+
+PARSER_TEMPLATE = '''\
+# Analizador sintáctico SLR(1) generado por parser_generator.py. No editar a mano.
+import sys
+from array import array
+
+TERMINALS = {terminals!r}
+NON_TERMINALS = {non_terminals!r}
+TERMINAL_IDS = {{t: i for i, t in enumerate(TERMINALS)}}
+N_TERMINALS = {n_terminals}
+N_NON_TERMINALS = {n_non_terminals}
+ACCEPT_PRODUCTION = {accept_production}
+
+# Producciones (índice denso): texto, número original, aridad y no terminal izquierdo
+PRODUCTIONS = {productions!r}
+PRODUCTION_NUMBERS = {production_numbers!r}
+
+
+def _load(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+# ACTION: 0 error, s + 1 shift, -(p + 1) reduce (ACCEPT_PRODUCTION es accept).
+# GOTO: -1 sin transición. Guardadas en little-endian.
+ACTION = _load("i", {action!r})
+GOTO = _load("i", {goto!r})
+PRODUCTION_ARITY = _load("i", {arity!r})
+PRODUCTION_LHS = _load("i", {lhs!r})
+
+IGNORED_TOKENS = {ignored!r}
+
+
+def parse(tokens):
+    """
+    Analiza una lista de nombres de token (sin tokens ignorados).
+    Returns:
+        Tuple[bool, str]: (exito, mensaje), con los mensajes de LRParser.parse
+    """
+    action = ACTION
+    goto = GOTO
+    arity = PRODUCTION_ARITY
+    lhs = PRODUCTION_LHS
+    terminal_ids = TERMINAL_IDS
+    n_terminals = N_TERMINALS
+    n_non_terminals = N_NON_TERMINALS
+    accept = ACCEPT_PRODUCTION
+
+    tokens = list(tokens)
+    if not tokens or tokens[-1] != "$":
+        tokens.append("$")
+    stack = [0]
+    index = 0
+    token = tokens[0]
+    column = terminal_ids.get(token, -1)
+    while True:
+        state = stack[-1]
+        code = action[state * n_terminals + column] if column >= 0 else 0
+        if code > 0:
+            stack.append(code - 1)
+            index += 1
+            token = tokens[index]
+            column = terminal_ids.get(token, -1)
+        elif code < 0:
+            production = -code - 1
+            if production == accept:
+                return True, "Cadena aceptada"
+            n = arity[production]
+            if n:
+                del stack[-n:]
+            state = stack[-1]
+            target = goto[state * n_non_terminals + lhs[production]]
+            if target < 0:
+                return False, f"Error: No hay transicion GOTO desde estado {{state}} con {{NON_TERMINALS[lhs[production]]}}"
+            stack.append(target)
+        else:
+            return False, f"Error sintactico en estado {{state}} con token '{{token}}'"
+
+
+def read_tokens(tokens_file):
+    """Lee un archivo de tokens del analizador léxico (TOKEN 'lexema' por línea)."""
+    tokens = []
+    with open(tokens_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            name = line.split(None, 1)[0]
+            if name not in IGNORED_TOKENS:
+                tokens.append(name)
+    return tokens
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python " + sys.argv[0] + " archivo_tokens")
+        return 1
+    success, message = parse(read_tokens(argv[0]))
+    print("Resultado:", "ACEPTADA" if success else "RECHAZADA")
+    print("Mensaje:", message)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+'''
+
+# Tokens que el analizador léxico emite pero la gramática no usa (igual que TokenFileReader)
+DEFAULT_IGNORED_TOKENS = ('WS', 'WHITESPACE')
+
+
+def _to_bytes(values):
+    data = array('i', values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def build_slr_from_yalp(yalp_file):
+    """
+    Construye la gramática aumentada y la tabla SLR(1) a partir de un archivo .yalp,
+    con los mismos pasos que main_parser (FIRST/FOLLOW, aumento, autómata LR(0), tabla).
+
+    Returns:
+        Tuple[Grammar, SLRTable]
+    """
+    from main_parser import calculate_first_sets, calculate_follow_sets
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "grammar.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_yalp_to_json(yalp_file, json_file)
+            grammar = load_grammar_from_json(json_file)
+            first_sets = calculate_first_sets(grammar)
+            follow_sets = calculate_follow_sets(grammar, first_sets)
+            augment_grammar(grammar)
+            states = build_lr0_automaton(grammar)
+            table = build_slr_table_for_lr0(states, grammar, follow_sets)
+    return grammar, table
+
+
+def generate_parser_source(compiled, ignored_tokens=DEFAULT_IGNORED_TOKENS):
+    """
+    Devuelve el código fuente del módulo generado para un CompiledSLRTable.
+    """
+    return PARSER_TEMPLATE.format(
+        terminals=tuple(compiled.terminals),
+        non_terminals=tuple(compiled.non_terminals),
+        n_terminals=compiled.n_terminals,
+        n_non_terminals=compiled.n_non_terminals,
+        accept_production=compiled.accept_production,
+        productions=tuple(str(prod) for prod in compiled.productions),
+        production_numbers=tuple(compiled.production_numbers),
+        action=_to_bytes(compiled.action),
+        goto=_to_bytes(compiled.goto),
+        arity=_to_bytes(compiled.production_arity),
+        lhs=_to_bytes(compiled.production_lhs),
+        ignored=tuple(sorted(ignored_tokens)),
+    )
+
+
+def generate_parser(table, grammar, output_file, ignored_tokens=DEFAULT_IGNORED_TOKENS):
+    """
+    Escribe el módulo del parser generado.
+
+    Args:
+        table: SLRTable o CompiledSLRTable
+        grammar: Grammar aumentada
+        output_file: ruta del módulo .py a generar
+    """
+    compiled = table if isinstance(table, CompiledSLRTable) else compile_slr_table(table, grammar)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(generate_parser_source(compiled, ignored_tokens))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un módulo de analizador sintáctico SLR(1) autónomo")
+    parser.add_argument("--yalp-file", "-y", required=True, help="Archivo YALP con la gramática")
+    parser.add_argument("--output", "-o", required=True, help="Módulo .py a generar")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.yalp_file):
+        print(f"Error: No se encuentra el archivo de gramática {args.yalp_file}")
+        sys.exit(1)
+
+    grammar, table = build_slr_from_yalp(args.yalp_file)
+    if table.has_conflicts():
+        table.print_conflicts()
+    generate_parser(table, grammar, args.output)
+    print(f"Analizador sintáctico generado en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,186 +1,546 @@
 """
 Implementacion del algoritmo de parsing LR
-Este archivo implementa un analizador sintactico LR que muestra los pasos detallados
-del proceso de analisis, incluyendo cada accion de shift/reduce y estado.
+Este archivo implementa un analizador sintactico LR sobre la tabla SLR compilada. Los
+pasos del analisis (shift/reduce y estado) se obtienen con un observador de
+parse_trace; sin observador el ciclo principal no hace ninguna comprobacion de traza.
 """
 
 import os
 import sys
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional, Set, Any
+import re
+from typing import List, Dict, Tuple, Optional, Set, Any, Callable
 
 # Importar componentes necesarios
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from slr_table import ActionType, Action, SLRTable, build_slr_table_for_lr0
+from slr_table import (ActionType, Action, SLRTable, build_slr_table_for_lr0, compile_slr_table,
+                       CompiledSLRTable, share_compiled_table, attach_compiled_table)
 from lr0_automaton2 import Grammar, Production, Item, State, build_lr0_automaton
+from parse_trace import ParseObserver
+from yapar_parser2 import ERROR_TOKEN
+
+# $1, $2, ... dentro de una accion declarada en el .yalp
+_ACTION_ARG = re.compile(r"\$(\d+)")
+
+
+def compile_semantic_action(code: str, arity: int, namespace: Optional[Dict[str, Any]] = None) -> Callable:
+    """
+    Compila el codigo de una accion { ... } del .yalp a una funcion de aridad fija.
+    El codigo es una expresion de Python; $i es el valor del i-esimo simbolo del lado
+    derecho y el resultado de la expresion es el valor ($$) del no terminal.
+    
+    Args:
+        code: Expresion de la accion, p. ej. "$1 + $3"
+        arity: Largo del lado derecho de la produccion
+        namespace: Nombres globales disponibles para la expresion
+        
+    Returns:
+        Callable: funcion que recibe los valores del lado derecho
+    """
+    def replace(match):
+        position = int(match.group(1))
+        if not 1 <= position <= arity:
+            raise ValueError(f"${position} fuera de rango en la accion {{ {code} }} (aridad {arity})")
+        return f"_{position}"
+    
+    params = ", ".join(f"_{i}" for i in range(1, arity + 1))
+    source = f"lambda {params}: ({_ACTION_ARG.sub(replace, code)})"
+    return eval(compile(source, f"<accion {code!r}>", "eval"), dict(namespace or {}))
+
+
+def _parse_batch(compiled: CompiledSLRTable, token_sequences) -> List[Tuple[bool, str]]:
+    """
+    Analiza varias secuencias de tokens sobre una tabla compilada. Las referencias a la
+    tabla se toman una sola vez y la pila de estados se reutiliza entre entradas.
+    Los resultados y mensajes son los de LRParser.parse.
+    """
+    action = compiled.action
+    goto = compiled.goto
+    arity = compiled.production_arity
+    lhs = compiled.production_lhs
+    terminal_ids = compiled.terminal_ids
+    n_terminals = compiled.n_terminals
+    n_non_terminals = compiled.n_non_terminals
+    accept = compiled.accept_production
+    non_terminals = compiled.non_terminals
+    end_column = terminal_ids.get("$", -1)
+    
+    results = []
+    append_result = results.append
+    stack = [0]
+    for tokens in token_sequences:
+        # La pila conserva su capacidad; sólo se vacía hasta el estado inicial
+        del stack[1:]
+        n_tokens = len(tokens)
+        # El "$" final se agrega de forma virtual, sin copiar la secuencia
+        if n_tokens and tokens[-1] == "$":
+            n_tokens -= 1
+        index = 0
+        if index < n_tokens:
+            token = tokens[0]
+            column = terminal_ids.get(token, -1)
+        else:
+            token = "$"
+            column = end_column
+        while True:
+            state = stack[-1]
+            code = action[state * n_terminals + column] if column >= 0 else 0
+            if code > 0:
+                stack.append(code - 1)
+                index += 1
+                if index < n_tokens:
+                    token = tokens[index]
+                    column = terminal_ids.get(token, -1)
+                else:
+                    token = "$"
+                    column = end_column
+            elif code < 0:
+                production = -code - 1
+                if production == accept:
+                    append_result((True, "Cadena aceptada"))
+                    break
+                n = arity[production]
+                if n:
+                    del stack[-n:]
+                state = stack[-1]
+                target = goto[state * n_non_terminals + lhs[production]]
+                if target < 0:
+                    left = non_terminals[lhs[production]]
+                    append_result((False, f"Error: No hay transicion GOTO desde estado {state} con {left}"))
+                    break
+                stack.append(target)
+            else:
+                append_result((False, f"Error sintactico en estado {state} con token '{token}'"))
+                break
+    return results
+
+
+def _resume_stack(compiled: CompiledSLRTable, stack: List[int], column: int) -> bool:
+    """
+    Recuperacion en modo panico: desapila hasta un estado con accion para el terminal
+    `column`, directamente o despues de un GOTO sobre algun no terminal (que se apila,
+    como si se hubiera reducido la frase erronea a ese no terminal). Devuelve False,
+    sin modificar la pila, si ningun estado sirve.
+    """
+    if column < 0:
+        return False
+    action = compiled.action
+    goto = compiled.goto
+    n_terminals = compiled.n_terminals
+    n_non_terminals = compiled.n_non_terminals
+    for depth in range(len(stack), 0, -1):
+        top = stack[depth - 1]
+        if action[top * n_terminals + column]:
+            del stack[depth:]
+            return True
+        base = top * n_non_terminals
+        for non_terminal in range(n_non_terminals):
+            target = goto[base + non_terminal]
+            if target >= 0 and action[target * n_terminals + column]:
+                del stack[depth:]
+                stack.append(target)
+                return True
+    return False
+
+
+def _parse_traced(compiled: CompiledSLRTable, tokens, observer: ParseObserver) -> Tuple[bool, str]:
+    """
+    Ciclo de _parse_batch para una entrada, llamando al observador en cada evento.
+    Se mantiene aparte para que el camino sin traza no tenga comprobaciones.
+    """
+    action = compiled.action
+    goto = compiled.goto
+    arity = compiled.production_arity
+    lhs = compiled.production_lhs
+    terminal_ids = compiled.terminal_ids
+    n_terminals = compiled.n_terminals
+    n_non_terminals = compiled.n_non_terminals
+    accept = compiled.accept_production
+    productions = compiled.productions
+    
+    input_tokens = list(tokens)
+    if not input_tokens or input_tokens[-1] != "$":
+        input_tokens.append("$")
+    stack = [0]
+    index = 0
+    token = input_tokens[0]
+    column = terminal_ids.get(token, -1)
+    while True:
+        state = stack[-1]
+        code = action[state * n_terminals + column] if column >= 0 else 0
+        if code > 0:
+            stack.append(code - 1)
+            observer.shift(state, token, code - 1, stack)
+            index += 1
+            token = input_tokens[index]
+            column = terminal_ids.get(token, -1)
+        elif code < 0:
+            production = -code - 1
+            if production == accept:
+                observer.accept(state, stack)
+                return True, "Cadena aceptada"
+            n = arity[production]
+            if n:
+                del stack[-n:]
+            top = stack[-1]
+            target = goto[top * n_non_terminals + lhs[production]]
+            if target < 0:
+                message = f"Error: No hay transicion GOTO desde estado {top} con {compiled.non_terminals[lhs[production]]}"
+                observer.error(top, token, message, stack)
+                return False, message
+            stack.append(target)
+            observer.reduce(state, productions[production], target, stack)
+        else:
+            message = f"Error sintactico en estado {state} con token '{token}'"
+            observer.error(state, token, message, stack)
+            return False, message
+
+
+def _print_result(result: Tuple[bool, str]) -> None:
+    """Resultado de parse(verbose=True): accept o el mensaje de error"""
+    success, message = result
+    if success:
+        print(f"ACCION accept")
+        print("\n!Cadena aceptada por el analizador sintactico!")
+    else:
+        print(f"ERROR: {message}")
+
+
+# Tabla compartida de cada proceso del pool de parse_many (ver _init_worker)
+_worker_table: Optional[CompiledSLRTable] = None
+
+
+def _init_worker(shared_name: str) -> None:
+    """Inicializador del pool: conecta la tabla del segmento de memoria compartida"""
+    global _worker_table
+    _worker_table = attach_compiled_table(shared_name)
+
+
+def _parse_chunk(token_sequences) -> List[Tuple[bool, str]]:
+    return _parse_batch(_worker_table, token_sequences)
+
 
 class LRParser:
     """
     Analizador sintactico LR que muestra los pasos detallados del analisis.
     """
-    def __init__(self, table: SLRTable, grammar: Grammar):
+    def __init__(self, table: SLRTable, grammar: Grammar,
+                 actions: Optional[Dict[int, Callable]] = None,
+                 action_namespace: Optional[Dict[str, Any]] = None):
         """
         Inicializa el analizador con una tabla SLR y una gramatica.
         
         Args:
             table: Tabla SLR con las acciones y transiciones
             grammar: Gramatica del lenguaje a analizar
+            actions: Acciones semanticas por numero de produccion (tienen prioridad
+                sobre las declaradas en el .yalp)
+            action_namespace: Nombres globales para las acciones declaradas en el .yalp
         """
         self.table = table
         self.grammar = grammar
         
-    def parse(self, tokens: List[str], verbose: bool = True) -> Tuple[bool, str]:
+        # Acciones semanticas por numero de produccion; las declaradas en el .yalp se
+        # compilan una sola vez aqui
+        self.actions: Dict[int, Callable] = {}
+        for prod in (grammar.production_list if grammar else []):
+            if getattr(prod, 'action', None):
+                self.actions[prod.number] = compile_semantic_action(prod.action, len(prod.right), action_namespace)
+        if actions:
+            self.actions.update(actions)
+        
+        # Tabla compilada y acciones por indice denso, se construyen en el primer uso
+        self._compiled = None
+        self._handlers = None
+    
+    def register_action(self, production_number: int, action: Callable) -> None:
+        """
+        Registra la accion semantica de una produccion. La accion recibe los valores
+        de los simbolos del lado derecho ($1..$n) y devuelve el valor del no terminal.
         """
-        Analiza una secuencia de tokens usando el algoritmo LR y muestra cada paso.
+        self.actions[production_number] = action
+        self._handlers = None
+    
+    def _compiled_table(self) -> CompiledSLRTable:
+        """Tabla compilada (compile_slr_table), construida una sola vez"""
+        if self._compiled is None:
+            if isinstance(self.table, CompiledSLRTable):
+                self._compiled = self.table
+            else:
+                self._compiled = compile_slr_table(self.table, self.grammar)
+        return self._compiled
+    
+    def parse_with_actions(self, tokens: List[str], values: Optional[List[Any]] = None) -> Tuple[bool, str, Any]:
+        """
+        Analiza la secuencia de tokens ejecutando las acciones semanticas en cada reduce.
+        Mantiene una pila de valores paralela a la de estados; sin accion registrada el
+        valor del no terminal es el de su primer simbolo ($$ = $1), o None si la
+        produccion es vacia.
         
         Args:
             tokens: Lista de tokens a analizar
-            verbose: Si es True, muestra cada paso del analisis
+            values: Valores de los tokens (p. ej. los lexemas), paralela a tokens; si es
+                None, el valor de cada token es su nombre
             
         Returns:
-            Tuple[bool, str]: (exito, mensaje de resultado)
+            Tuple[bool, str, Any]: (exito, mensaje de resultado, valor del simbolo inicial)
         """
-        # Agregar simbolo de fin de entrada
-        input_tokens = tokens.copy()
-        if input_tokens[-1] != "$":
+        compiled = self._compiled_table()
+        if self._handlers is None:
+            self._handlers = [self.actions.get(number) for number in compiled.production_numbers]
+        handlers = self._handlers
+        action = compiled.action
+        goto = compiled.goto
+        arity = compiled.production_arity
+        lhs = compiled.production_lhs
+        terminal_ids = compiled.terminal_ids
+        n_terminals = compiled.n_terminals
+        n_non_terminals = compiled.n_non_terminals
+        accept = compiled.accept_production
+        
+        input_tokens = list(tokens)
+        if not input_tokens or input_tokens[-1] != "$":
             input_tokens.append("$")
-            
-        # Pila: almacena estados y simbolos alternados, empezando con estado 0
+        token_values = input_tokens if values is None else values
+        
+        # Pila de estados y pila de valores (un valor por simbolo)
         stack = [0]
-        # Indice del token actual
+        value_stack = []
         index = 0
+        token = input_tokens[0]
+        column = terminal_ids.get(token, -1)
+        while True:
+            state = stack[-1]
+            code = action[state * n_terminals + column] if column >= 0 else 0
+            if code > 0:
+                stack.append(code - 1)
+                value_stack.append(token_values[index])
+                index += 1
+                token = input_tokens[index]
+                column = terminal_ids.get(token, -1)
+            elif code < 0:
+                production = -code - 1
+                if production == accept:
+                    return True, "Cadena aceptada", value_stack[-1] if value_stack else None
+                n = arity[production]
+                func = handlers[production]
+                # Despacho por aridad: los argumentos se toman del tope de la pila y el
+                # resultado reemplaza a $1, sin copiar el segmento de la pila
+                if func is None:
+                    if n == 0:
+                        value_stack.append(None)
+                    elif n > 1:
+                        del value_stack[1 - n:]
+                elif n == 1:
+                    value_stack[-1] = func(value_stack[-1])
+                elif n == 2:
+                    second = value_stack.pop()
+                    value_stack[-1] = func(value_stack[-1], second)
+                elif n == 3:
+                    third = value_stack.pop()
+                    second = value_stack.pop()
+                    value_stack[-1] = func(value_stack[-1], second, third)
+                elif n == 0:
+                    value_stack.append(func())
+                else:
+                    args = value_stack[-n:]
+                    del value_stack[1 - n:]
+                    value_stack[-1] = func(*args)
+                if n:
+                    del stack[-n:]
+                state = stack[-1]
+                target = goto[state * n_non_terminals + lhs[production]]
+                if target < 0:
+                    left = compiled.non_terminals[lhs[production]]
+                    return False, f"Error: No hay transicion GOTO desde estado {state} con {left}", None
+                stack.append(target)
+            else:
+                return False, f"Error sintactico en estado {state} con token '{token}'", None
         
-        # Mostrar tokens de entrada
-        if verbose:
-            print("\n========== ANALISIS SINTACTICO LR ==========")
-            #print("Tokens de entrada:", input_tokens[:-1])  # No mostrar $ en la salida
-            print("="*45)
+    def parse_many(self, token_sequences, processes: Optional[int] = None,
+                   chunk_size: int = 1000) -> List[Tuple[bool, str]]:
+        """
+        Analiza muchas secuencias de tokens independientes con la tabla compilada,
+        reutilizando la misma pila de estados entre entradas.
         
-        # Bucle principal del algoritmo
+        Args:
+            token_sequences: Iterable de secuencias de tokens (listas o tuplas)
+            processes: Si es mayor que 1, reparte las entradas en un pool de procesos
+                que comparten la tabla en un segmento de memoria compartida
+            chunk_size: Entradas por tarea enviada al pool
+            
+        Returns:
+            List[Tuple[bool, str]]: (exito, mensaje) por entrada, en el mismo orden y
+            con los mismos mensajes que parse
+        """
+        compiled = self._compiled_table()
+        if not processes or processes <= 1:
+            return _parse_batch(compiled, token_sequences)
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        sequences = list(token_sequences)
+        chunks = [sequences[i:i + chunk_size] for i in range(0, len(sequences), chunk_size)]
+        if len(chunks) <= 1:
+            return _parse_batch(compiled, sequences)
+        
+        shm, shared_name = share_compiled_table(compiled)
+        try:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(shared_name,)) as pool:
+                results = []
+                for chunk_results in pool.map(_parse_chunk, chunks):
+                    results.extend(chunk_results)
+                return results
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def parse_with_recovery(self, tokens: List[str], sync_tokens=('SEMICOLON',),
+                            max_errors: Optional[int] = None) -> Tuple[bool, List[str]]:
+        """
+        Analiza la secuencia completa reportando todos los errores sintacticos en una
+        sola pasada, con la tabla compilada de la SLRTable existente.
+        
+        Si la gramatica usa el terminal reservado `error` (p. ej. `stmt: error SEMICOLON`)
+        la recuperacion es la de yacc: se desapilan estados hasta uno con shift sobre
+        error, se desplaza error y se descartan tokens hasta uno con accion valida. Los
+        errores no se reportan hasta desplazar 3 tokens despues de la recuperacion.
+        
+        Sin producciones de error (o si ningun estado de la pila desplaza error) se usa
+        modo panico: se descartan tokens hasta un token de sincronizacion (sync_tokens
+        o el fin de entrada) y se desapilan estados hasta uno que, directamente o por
+        GOTO sobre algun no terminal, tenga accion para ese token o para el siguiente.
+        
+        Args:
+            tokens: Lista de tokens a analizar
+            sync_tokens: Tokens de sincronizacion del modo panico
+            max_errors: Detenerse despues de esta cantidad de errores
+            
+        Returns:
+            Tuple[bool, List[str]]: (exito sin errores, mensajes de error en orden)
+        """
+        compiled = self._compiled_table()
+        action = compiled.action
+        goto = compiled.goto
+        arity = compiled.production_arity
+        lhs = compiled.production_lhs
+        terminal_ids = compiled.terminal_ids
+        n_terminals = compiled.n_terminals
+        n_non_terminals = compiled.n_non_terminals
+        accept = compiled.accept_production
+        error_column = terminal_ids.get(ERROR_TOKEN, -1)
+        end_column = terminal_ids["$"]
+        sync = {terminal_ids[t] for t in sync_tokens if t in terminal_ids}
+        sync.add(end_column)
+        
+        input_tokens = list(tokens)
+        if not input_tokens or input_tokens[-1] != "$":
+            input_tokens.append("$")
+        columns = [terminal_ids.get(token, -1) for token in input_tokens]
+        
+        errors = []
+        stack = [0]
+        index = 0
+        # Tokens que faltan desplazar para volver a reportar errores
+        recovering = 0
+        last_recovery = -1
         while True:
-            current_state = stack[-1]
-            current_token = input_tokens[index]
+            state = stack[-1]
+            column = columns[index]
+            code = action[state * n_terminals + column] if column >= 0 else 0
+            if code > 0:
+                stack.append(code - 1)
+                index += 1
+                if recovering:
+                    recovering -= 1
+                continue
+            if code < 0:
+                production = -code - 1
+                if production == accept:
+                    return not errors, errors
+                n = arity[production]
+                if n:
+                    del stack[-n:]
+                state = stack[-1]
+                target = goto[state * n_non_terminals + lhs[production]]
+                if target < 0:
+                    errors.append(f"Error: No hay transicion GOTO desde estado {state} con "
+                                  f"{compiled.non_terminals[lhs[production]]}")
+                    return False, errors
+                stack.append(target)
+                continue
             
-            # Obtener la accion para el estado y token actuales
-            action = self.table.get_action(current_state, current_token)
+            # Error sintactico
+            if not recovering:
+                errors.append(f"Error sintactico en estado {state} con token "
+                              f"'{input_tokens[index]}' (posicion {index})")
+                if max_errors and len(errors) >= max_errors:
+                    return False, errors
             
-            if verbose:
-                # Mostrar estado actual y entrada restante
-                #print(f"\n[Estado {current_state}] ", end="")
-                pass
+            if error_column >= 0:
+                if recovering == 3:
+                    # Ningun token desplazado desde el ultimo error: se descarta el token
+                    if column == end_column:
+                        return False, errors
+                    index += 1
+                    continue
+                depth = len(stack)
+                while depth and action[stack[depth - 1] * n_terminals + error_column] <= 0:
+                    depth -= 1
+                if depth:
+                    del stack[depth:]
+                    stack.append(action[stack[-1] * n_terminals + error_column] - 1)
+                    recovering = 3
+                    continue
             
-            # Procesar segun el tipo de accion
-            if action.type == ActionType.SHIFT:
-                # Accion de desplazamiento (shift)
-                if verbose:
-                    #print(f"ACCION s{action.value} con simbolo '{current_token}'")
-                    #print(f"-> shift a estado {action.value}")
-                    pass
-                
-                # Guardar el simbolo y nuevo estado en la pila
-                stack.append(current_token)
-                stack.append(action.value)
-                
-                # Avanzar al siguiente token
-                index += 1
-                
-            elif action.type == ActionType.REDUCE:
-                # Accion de reduccion (reduce)
-                # En algunas implementaciones, los indices de las reglas de produccion
-                # En una tabla SLR correctamente construida, el valor de la acción reduce (r#) debería
-                # ser el número de producción exacto en la gramática
-                
-                # Buscar la producción por su número en la gramática
-                production = None
-                
-                # Primero, buscar por número exacto de producción
-                for prod in self.grammar.production_list:
-                    if hasattr(prod, 'number') and prod.number == action.value:
-                        production = prod
+            # Modo panico: si el error vuelve a ocurrir donde termino la ultima
+            # recuperacion, se busca desde el token siguiente para avanzar siempre.
+            # Se intenta reanudar en el token de sincronizacion y, si no tiene accion
+            # en ningun estado de la pila, justo despues de el (p. ej. el ';' cierra
+            # la sentencia erronea y el analisis sigue con la siguiente)
+            start = index if index > last_recovery else index + 1
+            resume = -1
+            for j in range(start, len(input_tokens)):
+                if columns[j] not in sync:
+                    continue
+                for k in ((j,) if columns[j] == end_column else (j, j + 1)):
+                    if _resume_stack(compiled, stack, columns[k]):
+                        resume = k
                         break
-                
-                # Si no se encontró, buscar por índice en la lista
-                if production is None and action.value < len(self.grammar.production_list):
-                    production = self.grammar.production_list[action.value]
-                
-                # Si aún no se encuentra, buscar por otros métodos
-                if production is None:
-                    for i, prod in enumerate(self.grammar.production_list):
-                        # También buscar por índice implícito
-                        if i == action.value:
-                            production = prod
-                            break
-                        # O por algún atributo id si existe
-                        elif hasattr(prod, 'id') and prod.id == action.value:
-                            production = prod
-                            break
-                
-                # Si todavía no se encontró, reportar error
-                if production is None:
-                    error_msg = f"Error: No se encontró producción para la acción r{action.value}"
-                    if verbose:
-                        print(f"ERROR: {error_msg}")
-                    return False, error_msg
-                
-                if verbose:
-                    #print(f"ACCION r{action.value} con produccion {production}")
-                    #print(f"-> reduce por {production.left} -> {' '.join(production.right)}")
-                    pass
-
-                
-                # Remover 2*len(right) elementos de la pila (simbolo y estado por cada simbolo)
-                symbols_to_remove = len(production.right)
-                if symbols_to_remove > 0:
-                    stack = stack[:-(2*symbols_to_remove)]
-                
-                # Obtener el estado superior actual despues de la reduccion
-                current_state = stack[-1]
-                
-                # Obtener el nuevo estado desde GOTO[estado, no-terminal]
-                goto_state = self.table.get_goto(current_state, production.left)
-                
-                if goto_state is None:
-                    error_msg = f"Error: No hay transicion GOTO desde estado {current_state} con {production.left}"
-                    if verbose:
-                        print(f"ERROR: {error_msg}")
-                    return False, error_msg
-                
-                # Agregar el no-terminal y el nuevo estado a la pila
-                stack.append(production.left)
-                stack.append(goto_state)
-                
-                if verbose:
-                    #print(f"-> GOTO({current_state}, {production.left}) = {goto_state}")
-                    pass
-                
-            elif action.type == ActionType.ACCEPT:
-                # Accion de aceptacion (accept)
-                if verbose:
-                    print(f"ACCION accept")
-                    print("\n!Cadena aceptada por el analizador sintactico!")
-                return True, "Cadena aceptada"
-                
-            elif action.type == ActionType.ERROR:
-                # Error sintactico
-                error_msg = f"Error sintactico en estado {current_state} con token '{current_token}'"
-                if verbose:
-                    print(f"ERROR: {error_msg}")
-                return False, error_msg
+                if resume >= 0:
+                    break
+            if resume < 0:
+                return False, errors
+            index = last_recovery = resume
+            recovering = 3
+    
+    def parse(self, tokens: List[str], verbose: bool = True,
+              observer: Optional[ParseObserver] = None) -> Tuple[bool, str]:
+        """
+        Analiza una secuencia de tokens usando el algoritmo LR.
+        
+        Args:
+            tokens: Lista de tokens a analizar
+            verbose: Si es True, muestra el encabezado y el resultado del analisis
+            observer: Observador de parse_trace que recibe cada shift/reduce/accept/error
             
-            # Imprimir la pila actual
-            if verbose:
-                stack_str = ""
-                for i, item in enumerate(stack):
-                    if i % 2 == 0:  # Es un estado
-                        stack_str += f"{item} "
-                    else:  # Es un simbolo
-                        stack_str += f"{item} "
-                #print(f"tual: {stack_str}")
-                
-                # Mostrar los simbolos restantes
-                remaining = " ".join(input_tokens[index:])
-                #print(f"Entrada restante: {remaining}")
+        Returns:
+            Tuple[bool, str]: (exito, mensaje de resultado)
+        """
+        compiled = self._compiled_table()
+        if verbose:
+            print("\n========== ANALISIS SINTACTICO LR ==========")
+            print("="*45)
+        if observer is None:
+            # Camino sin traza: el mismo ciclo que parse_many
+            result = _parse_batch(compiled, (tokens,))[0]
+        else:
+            result = _parse_traced(compiled, tokens, observer)
+        if verbose:
+            _print_result(result)
+        return result
 
 def parse_input(slr_table, grammar, input_tokens, verbose=True):
     """
@@ -6,8 +6,9 @@ Core de la solución sin funcionalidades extra.
 
 import os
 import sys
+from array import array
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
 
 try:
     import pandas as pd
@@ -388,6 +389,276 @@ def build_slr_table_for_lr0(states, grammar, follow_sets):
     
     return table
 
+class CompiledSLRTable:
+    """
+    Versión compilada de SLRTable para el ciclo de parsing: ACTION y GOTO como arreglos
+    planos de enteros indexados por estado * columnas + columna, sin objetos Action ni
+    tuplas como llaves.
+
+    Codificación de ACTION:
+        0                  error
+        s + 1 (> 0)        shift al estado s
+        -(p + 1) (< 0)     reduce por la producción de índice denso p; reducir por la
+                           producción aumentada (accept_production) es ACCEPT
+    GOTO vale -1 cuando no hay transición.
+
+    Las producciones se numeran en forma densa (0..n-1, orden de production_list), ya
+    que augment_grammar las numera como idx * 10 + rule_idx. production_numbers guarda
+    el número original de cada una.
+    """
+    ERROR = 0
+
+    def __init__(self, terminals, non_terminals, n_states, action, goto,
+                 production_arity, production_lhs, productions, accept_production):
+        self.terminals = terminals                      # lista de terminales ('$' al final)
+        self.non_terminals = non_terminals              # lista de no terminales
+        self.terminal_ids = {t: i for i, t in enumerate(terminals)}
+        self.non_terminal_ids = {nt: i for i, nt in enumerate(non_terminals)}
+        self.n_states = n_states
+        self.n_terminals = len(terminals)
+        self.n_non_terminals = len(non_terminals)
+        self.action = action                            # array('i')
+        self.goto = goto                                # array('i')
+        self.production_arity = production_arity        # array('i'): largo del lado derecho
+        self.production_lhs = production_lhs            # array('i'): id del no terminal izquierdo
+        self.productions = productions                  # objetos Production (para mensajes)
+        self.production_numbers = [p.number for p in productions]
+        self.accept_production = accept_production
+
+    def close(self):
+        """
+        Libera los arreglos y cierra el segmento o mmap de una tabla cargada con
+        attach_compiled_table/load_compiled_table (no elimina el segmento).
+        """
+        owner = getattr(self, 'shared_memory', None)
+        if owner is not None:
+            for view in (self.action, self.goto, self.production_arity, self.production_lhs):
+                view.release()
+            owner.close()
+            self.shared_memory = None
+
+    def action_code(self, state_id, terminal):
+        """Código ACTION para un estado y terminal (0 si el terminal no existe)."""
+        column = self.terminal_ids.get(terminal)
+        if column is None:
+            return self.ERROR
+        return self.action[state_id * self.n_terminals + column]
+
+    def goto_state(self, state_id, non_terminal):
+        """Estado GOTO, o None si no hay transición."""
+        target = self.goto[state_id * self.n_non_terminals + self.non_terminal_ids[non_terminal]]
+        return target if target >= 0 else None
+
+    def get_action(self, state_id, terminal):
+        """Misma interfaz que SLRTable.get_action (decodifica a Action)."""
+        code = self.action_code(state_id, terminal)
+        if code > 0:
+            return Action(ActionType.SHIFT, code - 1)
+        if code < 0:
+            production = -code - 1
+            if production == self.accept_production:
+                return Action(ActionType.ACCEPT)
+            return Action(ActionType.REDUCE, self.production_numbers[production])
+        return Action(ActionType.ERROR)
+
+
+def compile_slr_table(table, grammar):
+    """
+    Compila una SLRTable (de build_slr_table_for_lr0) y su gramática aumentada a un
+    CompiledSLRTable.
+
+    Args:
+        table: SLRTable construida
+        grammar: Grammar aumentada (con production_list)
+
+    Returns:
+        CompiledSLRTable
+    """
+    productions = list(grammar.production_list)
+    dense_index = {prod.number: i for i, prod in enumerate(productions)}
+    start = productions[0].left if productions else None
+    accept_production = next((i for i, prod in enumerate(productions) if prod.number == 0), 0)
+
+    terminals = set(grammar.terminals)
+    terminals.update(terminal for _, terminal in table.action_table)
+    terminals.discard('$')
+    terminals = sorted(terminals) + ['$']
+
+    non_terminals = set(grammar.non_terminals)
+    non_terminals.update(nt for _, nt in table.goto_table)
+    non_terminals = sorted(non_terminals, key=lambda nt: (nt != start, nt))
+
+    states = [state for state, _ in table.action_table] + [state for state, _ in table.goto_table]
+    n_states = max(len(getattr(table.automaton, 'states', [])), max(states, default=-1) + 1)
+
+    terminal_ids = {t: i for i, t in enumerate(terminals)}
+    non_terminal_ids = {nt: i for i, nt in enumerate(non_terminals)}
+
+    action = array('i', [CompiledSLRTable.ERROR]) * (n_states * len(terminals))
+    for (state_id, terminal), act in table.action_table.items():
+        index = state_id * len(terminals) + terminal_ids[terminal]
+        if act.type == ActionType.SHIFT:
+            action[index] = act.value + 1
+        elif act.type == ActionType.REDUCE:
+            action[index] = -(dense_index[act.value] + 1)
+        elif act.type == ActionType.ACCEPT:
+            action[index] = -(accept_production + 1)
+
+    goto = array('i', [-1]) * (n_states * len(non_terminals))
+    for (state_id, non_terminal), target in table.goto_table.items():
+        goto[state_id * len(non_terminals) + non_terminal_ids[non_terminal]] = target
+
+    production_arity = array('i', [len(prod.right) for prod in productions])
+    production_lhs = array('i', [non_terminal_ids[prod.left] for prod in productions])
+
+    return CompiledSLRTable(terminals, non_terminals, n_states, action, goto,
+                            production_arity, production_lhs, productions, accept_production)
+
+# Firma y versión del bloque exportado por export_compiled_table/share_compiled_table
+TABLE_MAGIC = b"SLRT\x01"
+# Los arreglos del bloque empiezan en offsets múltiplos de este valor
+_TABLE_ALIGN = 8
+
+
+def _aligned(size):
+    return -(-size // _TABLE_ALIGN) * _TABLE_ALIGN
+
+
+def _table_block(compiled):
+    """
+    Serializa un CompiledSLRTable a un bloque autodescriptivo:
+        firma | largo del encabezado (uint32 little-endian) | encabezado JSON |
+        relleno | ACTION | GOTO | aridad | lado izquierdo
+    Los arreglos quedan en orden de bytes nativo, alineados a _TABLE_ALIGN; el
+    encabezado guarda terminales, no terminales, producciones y el (offset, largo)
+    de cada arreglo, con offsets relativos al fin del encabezado.
+
+    Returns:
+        Tuple[bytes, List[bytes]]: encabezado (ya con relleno) y datos de los arreglos
+    """
+    import json
+
+    parts = [array('i', part).tobytes() for part in
+             (compiled.action, compiled.goto, compiled.production_arity, compiled.production_lhs)]
+    layout = []
+    offset = 0
+    for data in parts:
+        layout.append([offset, len(data) // 4])
+        offset += _aligned(len(data))
+    metadata = {
+        'terminals': list(compiled.terminals),
+        'non_terminals': list(compiled.non_terminals),
+        'n_states': compiled.n_states,
+        'accept_production': compiled.accept_production,
+        'productions': [[p.left, list(p.right), p.number, getattr(p, 'action', None)]
+                        for p in compiled.productions],
+        'byteorder': sys.byteorder,
+        'layout': layout,
+    }
+    encoded = json.dumps(metadata).encode('utf-8')
+    header = TABLE_MAGIC + len(encoded).to_bytes(4, 'little') + encoded
+    header += bytes(_aligned(len(header)) - len(header))
+    return header, parts
+
+
+def _write_block(buffer, header, parts):
+    buffer[:len(header)] = header
+    offset = len(header)
+    for data in parts:
+        buffer[offset:offset + len(data)] = data
+        offset += _aligned(len(data))
+
+
+def _block_size(header, parts):
+    return len(header) + sum(_aligned(len(data)) for data in parts)
+
+
+def _table_from_buffer(buffer, owner):
+    """
+    Construye un CompiledSLRTable cuyos arreglos son memoryviews de sólo lectura sobre
+    buffer (no se copia la tabla). owner (segmento o mmap) queda referenciado por la
+    tabla en el atributo shared_memory para que el buffer siga vivo.
+    """
+    import json
+    from lr0_automaton2 import Production
+
+    view = memoryview(buffer).toreadonly()
+    if bytes(view[:len(TABLE_MAGIC)]) != TABLE_MAGIC:
+        raise ValueError("El bloque no contiene una tabla SLR exportada")
+    start = len(TABLE_MAGIC) + 4
+    length = int.from_bytes(view[len(TABLE_MAGIC):start], 'little')
+    metadata = json.loads(bytes(view[start:start + length]).decode('utf-8'))
+    if metadata['byteorder'] != sys.byteorder:
+        raise ValueError("La tabla SLR exportada usa otro orden de bytes")
+
+    base = _aligned(start + length)
+    arrays = [view[base + offset:base + offset + 4 * size].cast('i')
+              for offset, size in metadata['layout']]
+    productions = [Production(left, right, number, action)
+                   for left, right, number, action in metadata['productions']]
+    compiled = CompiledSLRTable(metadata['terminals'], metadata['non_terminals'],
+                                metadata['n_states'], *arrays, productions,
+                                metadata['accept_production'])
+    compiled.shared_memory = owner
+    return compiled
+
+
+def share_compiled_table(compiled):
+    """
+    Copia un CompiledSLRTable a un segmento de multiprocessing.shared_memory, para que
+    varios procesos usen una sola copia física de la tabla.
+
+    Args:
+        compiled: CompiledSLRTable
+
+    Returns:
+        Tuple[SharedMemory, str]: el segmento (quien lo crea debe llamar close() y
+        unlink() al terminar) y su nombre para attach_compiled_table
+    """
+    from multiprocessing import shared_memory
+
+    header, parts = _table_block(compiled)
+    shm = shared_memory.SharedMemory(create=True, size=_block_size(header, parts))
+    _write_block(shm.buf, header, parts)
+    return shm, shm.name
+
+
+def attach_compiled_table(name):
+    """
+    Se conecta al segmento creado por share_compiled_table y devuelve un
+    CompiledSLRTable de sólo lectura sobre la memoria compartida.
+    """
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=name)
+    return _table_from_buffer(shm.buf, shm)
+
+
+def export_compiled_table(compiled, path):
+    """
+    Escribe el bloque de un CompiledSLRTable en un archivo (mismo formato que el
+    segmento de share_compiled_table), para cargarlo con load_compiled_table.
+    """
+    header, parts = _table_block(compiled)
+    block = bytearray(_block_size(header, parts))
+    _write_block(block, header, parts)
+    with open(path, 'wb') as f:
+        f.write(block)
+
+
+def load_compiled_table(path):
+    """
+    Carga una tabla exportada con export_compiled_table a través de un mmap de sólo
+    lectura: los procesos que cargan el mismo archivo comparten las páginas del
+    sistema operativo y la carga no depende del tamaño de la tabla.
+    """
+    import mmap
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _table_from_buffer(mapped, mapped)
+
+
 def print_table_ascii(table):
     """Imprime la tabla SLR de forma legible usando solo caracteres ASCII"""
     print("\n=== TABLA SLR(1) ===")
@@ -487,110 +758,170 @@ def print_table_ascii(table):
 class SLRParser:
     """
     Parser SLR(1) que utiliza la tabla para analizar cadenas.
+
+    La entrada se recorre con un índice (sin copiar ni desplazar la lista) y la pila
+    guarda sólo estados. Sin observador (parse_trace) el ciclo no registra ni imprime
+    nada; trace=K conserva los últimos K pasos con un RingObserver.
     """
     def __init__(self, table):
         self.table = table
-        self.grammar = table.grammar
+        # build_slr_table_for_lr0 guarda un adaptador con la gramática en .grammar
+        grammar = table.grammar
+        self.grammar = getattr(grammar, 'grammar', grammar)
+        # Producción por número (los reduce de la tabla llevan el número de producción)
+        self.productions = {}
+        for index, production in enumerate(self.grammar.production_list):
+            self.productions[getattr(production, 'number', index)] = production
+        self.step_count = 0
 
-    def parse(self, tokens):
+    def parse(self, tokens, trace=None, verbose=False, observer=None):
         """
         Analiza una cadena de tokens usando el algoritmo SLR(1).
-        
+
+        El análisis termina siempre: cada shift consume un token y, entre dos shifts,
+        una gramática no cíclica sólo admite una cantidad acotada de reducciones
+        (a lo sumo una por producción y nivel de la pila). Superar esa cota indica una
+        derivación cíclica (A =>+ A) y se reporta como error.
+
         Args:
             tokens: Lista de tokens (strings)
-            
+            trace: Cantidad de pasos a conservar (los últimos K); None no registra pasos
+            verbose: Si es True, muestra cada paso (PrintObserver)
+            observer: Observador de parse_trace que recibe cada evento
+
         Returns:
-            tuple: (success: bool, steps: list, error_msg: str)
+            tuple: (success: bool, steps: list, error_msg: str). steps son los dicts
+            del RingObserver; el total de pasos queda en self.step_count.
         """
-        # Agregar $ al final si no está
-        if not tokens or tokens[-1] != '$':
-            tokens = tokens + ['$']
-        
-        # Inicializar pila y buffer
+        from parse_trace import RingObserver, PrintObserver, MultiObserver
+
+        ring = RingObserver(trace) if trace else None
+        if verbose:
+            print(f"\nIniciando análisis SLR(1) de: {' '.join(t for t in tokens if t != '$')}")
+        observers = [o for o in (observer, ring, PrintObserver() if verbose else None) if o is not None]
+        if not observers:
+            success, message = self._run(tokens)
+        else:
+            traced = observers[0] if len(observers) == 1 else MultiObserver(*observers)
+            success, message = self._run_traced(tokens, traced)
+        if verbose:
+            shown = f"Cadena aceptada en {self.step_count} pasos" if success else message
+            print(f"\n{'✓' if success else '✗'} {shown}")
+        return success, list(ring.steps) if ring is not None else [], message
+
+    def _run(self, tokens):
+        """Ciclo sin traza. Devuelve (success, message)."""
+        n_tokens = len(tokens)
+        # El '$' final se agrega de forma virtual
+        if n_tokens and tokens[-1] == '$':
+            n_tokens -= 1
+
+        action_table = self.table.action_table
+        goto_table = self.table.goto_table
+        productions = self.productions
+        max_reductions_per_level = len(productions) + 1
+        error_action = Action(ActionType.ERROR)
+        SHIFT = ActionType.SHIFT
+        REDUCE = ActionType.REDUCE
+        ACCEPT = ActionType.ACCEPT
+
         stack = [0]  # Pila de estados (comienza con estado 0)
-        buffer = tokens[:]  # Buffer de entrada
-        steps = []  # Pasos del análisis
+        index = 0
         step_num = 0
-        
-        print(f"\nIniciando análisis SLR(1) de: {' '.join(tokens[:-1])}")
-        print(f"{'Paso':<5} {'Pila':<15} {'Entrada':<15} {'Acción'}")
-        print("─" * 50)
-        
-        while True:
-            step_num += 1
-            current_state = stack[-1]
-            current_token = buffer[0] if buffer else '$'
-            
-            # Obtener acción de la tabla
-            action = self.table.get_action(current_state, current_token)
-            
-            # Formatear estado actual para mostrar
-            # Mostrar solo los estados para simplicidad en la visualización
-            states_only = [str(stack[i]) for i in range(0, len(stack), 2) if i < len(stack)]
-            stack_str = ' '.join(states_only)
-            buffer_str = ' '.join(buffer)
-            
-            print(f"{step_num:<5} {stack_str:<15} {buffer_str:<15} {action}")
-            
-            step_info = {
-                'step': step_num,
-                'stack': stack[:],
-                'buffer': buffer[:],
-                'action': str(action)
-            }
-            steps.append(step_info)
-            
-            if action.type == ActionType.SHIFT:
-                # Shift: mover token a la pila y cambiar de estado
-                # En SLR, la pila alterna: estado, símbolo, estado, símbolo...
-                stack.append(current_token)  # Agregar símbolo
-                stack.append(action.value)   # Agregar nuevo estado
-                buffer.pop(0)
-                
-            elif action.type == ActionType.REDUCE:
-                # Reduce: aplicar producción
-                production = self.grammar.production_list[action.value]
-                
-                # Quitar 2 * len(right) elementos de la pila (símbolo + estado por cada símbolo)
-                symbols_to_remove = len(production.right)
-                if symbols_to_remove > 0:
-                    for _ in range(symbols_to_remove * 2):  # 2 elementos por símbolo
-                        if len(stack) > 1:  # Mantener al menos el estado inicial
-                            stack.pop()
-                
-                # Estado actual después de la reducción
+        reductions = 0  # Reducciones desde el último shift
+        try:
+            while True:
+                step_num += 1
                 current_state = stack[-1]
-                
-                # Buscar transición GOTO
-                goto_state = self.table.get_goto(current_state, production.left)
-                if goto_state is None:
-                    error_msg = f"Error: No hay transición GOTO desde estado {current_state} con {production.left}"
-                    print(f"\n✗ {error_msg}")
-                    return False, steps, error_msg
-                
-                # Agregar el no-terminal y el nuevo estado
-                stack.append(production.left)  # Agregar no-terminal
-                stack.append(goto_state)       # Agregar nuevo estado
-                print(f"      Reducir por: {production}")
-                
-            elif action.type == ActionType.ACCEPT:
-                # Accept: análisis exitoso
-                print(f"\n✓ Cadena aceptada en {step_num} pasos")
-                return True, steps, "Análisis exitoso"
-                
-            elif action.type == ActionType.ERROR:
-                # Error: análisis fallido
-                error_msg = f"Error de sintaxis en estado {current_state} con token '{current_token}'"
-                print(f"\n✗ {error_msg}")
-                return False, steps, error_msg
-            
-            # Prevenir bucles infinitos
-            if step_num > 1000:
-                error_msg = "Error: Demasiados pasos, posible bucle infinito"
-                print(f"\n✗ {error_msg}")
-                return False, steps, error_msg
-        
-        return False, steps, "Error desconocido"
+                current_token = tokens[index] if index < n_tokens else '$'
+                action = action_table.get((current_state, current_token), error_action)
+                action_type = action.type
+                if action_type == SHIFT:
+                    stack.append(action.value)
+                    index += 1
+                    reductions = 0
+                elif action_type == REDUCE:
+                    production = productions.get(action.value)
+                    if production is None:
+                        return False, f"Error: No se encontró producción para la acción r{action.value}"
+                    # Quitar un estado por cada símbolo del lado derecho
+                    symbols_to_remove = len(production.right)
+                    if symbols_to_remove:
+                        del stack[-symbols_to_remove:]
+                    current_state = stack[-1]
+                    goto_state = goto_table.get((current_state, production.left))
+                    if goto_state is None:
+                        return False, f"Error: No hay transición GOTO desde estado {current_state} con {production.left}"
+                    stack.append(goto_state)
+                    reductions += 1
+                    if reductions > max_reductions_per_level * len(stack):
+                        return False, f"Error: Derivación cíclica al reducir por {production} sin consumir entrada"
+                elif action_type == ACCEPT:
+                    return True, "Análisis exitoso"
+                else:
+                    return False, f"Error de sintaxis en estado {current_state} con token '{current_token}'"
+        finally:
+            self.step_count = step_num
+
+    def _run_traced(self, tokens, observer):
+        """Ciclo de _run que llama al observador en cada evento."""
+        n_tokens = len(tokens)
+        if n_tokens and tokens[-1] == '$':
+            n_tokens -= 1
+
+        action_table = self.table.action_table
+        goto_table = self.table.goto_table
+        productions = self.productions
+        max_reductions_per_level = len(productions) + 1
+        error_action = Action(ActionType.ERROR)
+
+        stack = [0]
+        index = 0
+        step_num = 0
+        reductions = 0
+        try:
+            while True:
+                step_num += 1
+                current_state = stack[-1]
+                current_token = tokens[index] if index < n_tokens else '$'
+                action = action_table.get((current_state, current_token), error_action)
+                action_type = action.type
+                if action_type == ActionType.SHIFT:
+                    stack.append(action.value)
+                    observer.shift(current_state, current_token, action.value, stack)
+                    index += 1
+                    reductions = 0
+                elif action_type == ActionType.REDUCE:
+                    production = productions.get(action.value)
+                    if production is None:
+                        message = f"Error: No se encontró producción para la acción r{action.value}"
+                        observer.error(current_state, current_token, message, stack)
+                        return False, message
+                    symbols_to_remove = len(production.right)
+                    if symbols_to_remove:
+                        del stack[-symbols_to_remove:]
+                    top = stack[-1]
+                    goto_state = goto_table.get((top, production.left))
+                    if goto_state is None:
+                        message = f"Error: No hay transición GOTO desde estado {top} con {production.left}"
+                        observer.error(top, current_token, message, stack)
+                        return False, message
+                    stack.append(goto_state)
+                    observer.reduce(current_state, production, goto_state, stack)
+                    reductions += 1
+                    if reductions > max_reductions_per_level * len(stack):
+                        message = f"Error: Derivación cíclica al reducir por {production} sin consumir entrada"
+                        observer.error(goto_state, current_token, message, stack)
+                        return False, message
+                elif action_type == ActionType.ACCEPT:
+                    observer.accept(current_state, stack)
+                    return True, "Análisis exitoso"
+                else:
+                    message = f"Error de sintaxis en estado {current_state} con token '{current_token}'"
+                    observer.error(current_state, current_token, message, stack)
+                    return False, message
+        finally:
+            self.step_count = step_num
 
 def analyze_slr_grammar(grammar_file, test_strings=None):
     """
@@ -635,11 +966,11 @@ def analyze_slr_grammar(grammar_file, test_strings=None):
         for i, test_string in enumerate(test_strings, 1):
             print(f"\n--- Prueba {i}: {test_string} ---")
             tokens = test_string.split() if isinstance(test_string, str) else test_string
-            success, steps, message = parser.parse(tokens)
+            success, steps, message = parser.parse(tokens, verbose=True)
             results.append({
                 'input': test_string,
                 'success': success,
-                'steps': len(steps),
+                'steps': parser.step_count,
                 'message': message
             })
     
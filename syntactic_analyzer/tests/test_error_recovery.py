@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la recuperación de errores (LRParser.parse_with_recovery).
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing_LR import LRParser
+from parser_generator import build_slr_from_yalp
+
+# Lista de asignaciones; la producción `stmt: error SEMICOLON` marca el punto de
+# sincronización al estilo yacc
+STATEMENTS_YALP = """
+%token ID
+%token NUMBER
+%token ASSIGNOP
+%token SEMICOLON
+%token PLUS
+%token TIMES
+%token LPAREN
+%token RPAREN
+
+program:
+    stmts
+;
+stmts:
+    stmts stmt
+  | stmt
+;
+stmt:
+    ID ASSIGNOP expr SEMICOLON
+{error_rule};
+expr:
+    expr PLUS term
+  | term
+;
+term:
+    term TIMES factor
+  | factor
+;
+factor:
+    LPAREN expr RPAREN
+  | ID
+  | NUMBER
+;
+"""
+
+OK = ['ID', 'ASSIGNOP', 'NUMBER', 'PLUS', 'ID', 'SEMICOLON']
+BAD_OPERAND = ['ID', 'ASSIGNOP', 'PLUS', 'SEMICOLON']
+BAD_ORDER = ['ID', 'NUMBER', 'ASSIGNOP', 'ID', 'SEMICOLON']
+UNCLOSED = ['ID', 'ASSIGNOP', 'LPAREN', 'ID', 'SEMICOLON']
+
+
+def build_parser(error_rule):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statements.yalp")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(STATEMENTS_YALP.replace("{error_rule}", error_rule))
+        grammar, table = build_slr_from_yalp(path)
+    assert not table.has_conflicts()
+    return grammar, LRParser(table, grammar)
+
+
+def check_all_errors_reported(parser):
+    success, errors = parser.parse_with_recovery(OK + OK)
+    assert success and errors == []
+
+    tokens = OK + BAD_OPERAND + OK + BAD_ORDER + OK + UNCLOSED + OK
+    success, errors = parser.parse_with_recovery(tokens)
+    assert not success
+    assert len(errors) == 3, errors
+    positions = [int(message.rsplit(' ', 1)[1].rstrip(')')) for message in errors]
+    assert [tokens[p] for p in positions] == ['PLUS', 'NUMBER', 'SEMICOLON'], errors
+    # El primer error es el mismo que reporta parse
+    assert errors[0].startswith(parser.parse(tokens, verbose=False)[1])
+
+    success, errors = parser.parse_with_recovery(BAD_OPERAND * 20)
+    assert len(errors) == 20
+    assert len(parser.parse_with_recovery(BAD_OPERAND * 20, max_errors=5)[1]) == 5
+    return True
+
+
+def test_error_productions():
+    """Recuperación con la producción stmt: error SEMICOLON"""
+    print("\n=== TEST: Producciones de error ===")
+    grammar, parser = build_parser("  | error SEMICOLON\n")
+    assert 'error' in grammar.terminals
+    return check_all_errors_reported(parser)
+
+
+def test_panic_mode():
+    """Sin producciones de error se sincroniza en SEMICOLON (modo pánico)"""
+    print("\n=== TEST: Modo pánico ===")
+    grammar, parser = build_parser("")
+    assert 'error' not in grammar.terminals
+    check_all_errors_reported(parser)
+    # Sin tokens de sincronización sólo queda el fin de entrada
+    success, errors = parser.parse_with_recovery(OK + BAD_OPERAND + OK + BAD_ORDER, sync_tokens=())
+    assert not success and len(errors) == 1
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Producciones de error", test_error_productions),
+        ("Modo pánico", test_panic_mode),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el árbol de expresión compacto (estructuras.ArbolCompacto): se
+compara con el árbol de nodos Node y los visitantes sobre las reglas incluidas.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el generador de AFD
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import estructuras
+import parser_regex
+import shuntingyard as sy
+import ERtoAFD2
+from nullableVisitor import NullableVisitor
+from firstPosVisitor import FirstPosVisitor
+from lastPosVisitor import LastPosVisitor
+from followPosVisitor import FollowPosVisitor
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES = os.path.join(REPO, "output", "final_infix.txt")
+
+# Reglas con '+' y '?' sobre átomos de varios nodos (la copia del átomo usa clonar)
+EXTRA_RULES = [
+    "((a|b)c)+# --> AB",
+    "(x(y|z)*)?w# --> XYZ",
+    "((a|ε)+b)?# --> OPT",
+]
+
+
+def load_rules():
+    """Reglas de final_infix.txt (salida de yalex_parser) más EXTRA_RULES."""
+    with open(RULES, "r", encoding="utf-8") as f:
+        return f.read().strip().splitlines() + EXTRA_RULES
+
+
+def rule_source(expr):
+    """La regla como la arma construir_afd_regla: (núcleo)#"""
+    return f"({expr[:expr.rfind('#')]})#"
+
+
+def node_tree(source):
+    """Árbol de nodos con posiciones, nullable, firstpos, lastpos y la tabla followpos."""
+    root = estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens(source))
+    ERtoAFD2.assign_pos_ids(root, 1)
+    visitors = [NullableVisitor(), FirstPosVisitor(), LastPosVisitor(), FollowPosVisitor()]
+    for visitor in visitors:
+        root.accept(visitor)
+    return root, visitors[3].get_followpos_table()
+
+
+def compact_tree(arbol):
+    """Numera y calcula las posiciones de un ArbolCompacto. Devuelve (árbol, followpos)."""
+    arbol.asignar_posiciones(1)
+    return arbol, arbol.calcular_posiciones()
+
+
+def assert_same_nodes(node, view, rule):
+    """Mismo valor, pos_id, nullable, firstpos y lastpos en todo el árbol."""
+    if node is None:
+        assert view is None, rule
+        return
+    assert view is not None, rule
+    assert node.value == view.value, (rule, node.value, view.value)
+    assert node.pos_id == view.pos_id, (rule, node.value)
+    assert node.nullable == view.nullable, (rule, node.value)
+    assert node.firstpos == view.firstpos, (rule, node.value)
+    assert node.lastpos == view.lastpos, (rule, node.value)
+    assert_same_nodes(node.left, view.left, rule)
+    assert_same_nodes(node.right, view.right, rule)
+
+
+def dfa_key(afd):
+    """El AFD sin depender del orden de las listas de estados."""
+    return (set(afd["estados"]), afd["alfabeto"], afd["transiciones"], afd["inicial"], set(afd["aceptacion"]))
+
+
+def test_positions_match_visitors():
+    """nullable, firstpos, lastpos y followpos del árbol compacto coinciden con los visitantes"""
+    print("\n=== TEST: Posiciones del árbol compacto ===")
+    rules = load_rules()
+    for expr in rules:
+        source = rule_source(expr)
+        root, followpos = node_tree(source)
+        compacts = [
+            estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens(source), compacto=True),
+            parser_regex.construir_arbol_regex(source, compacto=True),
+        ]
+        for arbol in compacts:
+            arbol, siguientes = compact_tree(arbol)
+            assert_same_nodes(root, arbol.nodo(), expr)
+            assert arbol.tabla_followpos(siguientes) == followpos, expr
+            # El AFD sin minimizar es el mismo (estados como frozenset de pos_id)
+            assert dfa_key(ERtoAFD2.construir_afd_compacto(arbol, siguientes)) == \
+                dfa_key(ERtoAFD2.construir_afd(root, followpos)), expr
+    print(f"  {len(rules)} reglas iguales con ambos árboles")
+    return True
+
+
+def test_minimized_dfas_match():
+    """construir_afd_regla da el mismo AFD minimizado con compacto=True y con Node"""
+    print("\n=== TEST: AFD minimizado con el árbol compacto ===")
+    rules = load_rules()
+    pos_nodes = pos_compact = 1
+    for expr in rules:
+        con_nodos = ERtoAFD2.construir_afd_regla(expr, pos_nodes, log=lambda *partes: None)
+        compacto = ERtoAFD2.construir_afd_regla(expr, pos_compact, compacto=True, log=lambda *partes: None)
+        # (nombre_token, root, pos_siguiente, afd_min, estado_a_token_min, offset_siguiente)
+        assert con_nodos[0] == compacto[0], expr
+        assert con_nodos[2:] == compacto[2:], expr
+        pos_nodes, pos_compact = con_nodos[5], compacto[5]
+    print(f"  {len(rules)} AFD minimizados iguales")
+    return True
+
+
+def shape(node):
+    if node is None:
+        return None
+    return (node.value, shape(node.left), shape(node.right))
+
+
+def test_clone_subtree():
+    """clonar copia el bloque postorden del subárbol con los hijos desplazados"""
+    print("\n=== TEST: Clonar subárbol ===")
+    # x|((a|b).c)*: el subárbol (a|b).c no empieza en el índice 0
+    arbol = estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens("x|((a|b)c)*"), compacto=True)
+    concat = arbol.izq[arbol.der[arbol.raiz]]
+    assert arbol.valor(concat) == '.', arbol.valor(concat)
+    size = len(arbol)
+    copia = arbol.clonar(concat)
+    assert len(arbol) == size + 5
+    assert shape(arbol.nodo(copia)) == shape(arbol.nodo(concat))
+    # La copia no comparte nodos con el original
+    assert min(arbol.izq[copia], arbol.der[copia]) >= size
+
+    # X+ y X? desde el descenso recursivo (con clonar) dan el mismo árbol que la expansión
+    for source in ("((a|b)c)+", "(x(y|z)*)?w", "((a|ε)+b)?"):
+        expected = shape(estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens(source)))
+        assert shape(parser_regex.construir_arbol_regex(source, compacto=True).nodo()) == expected, source
+        assert shape(parser_regex.construir_arbol_regex(source)) == expected, source
+    print("  copias iguales al subárbol original")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Posiciones del árbol compacto", test_positions_match_visitors),
+        ("AFD minimizado", test_minimized_dfas_match),
+        ("Clonar subárbol", test_clone_subtree),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las acciones { ... } de las reglas del .yal (yalex_parser,
+escaner.compilar_acciones y el lexer generado).
+"""
+
+import sys
+import os
+import io
+import contextlib
+import importlib.util
+import inspect
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el escáner y el generador de lexers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import escaner
+import generador_lexer
+import yalex_parser
+from lexical_interface import LineIndex
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+# Acción con un bloque anidado, escrita como en el .yal (la primera línea va pegada a '{')
+NESTED_ACTION = """if lexema.startswith('0'):
+        valor = 0
+    else:
+        valor = int(lexema)"""
+
+YAL = """let delim = [' ''\\t''\\n']
+let ws = delim+
+let digit = ['0'-'9']
+let number = digit+
+
+rule tokens =
+ws          { return WS }
+| number    { valor = int(lexema); return NUMBER }
+| '{'       { return LBRACE }
+| ['}' ']'] { x = 'return'; return RBRACKET }
+
+"""
+
+
+def number_dfa():
+    """AFD a mano: NUMBER = [0-9]+ y WS = ' '+."""
+    digits = {c: "n" for c in "0123456789"}
+    return escaner.compilar_afd({
+        "inicial": "s",
+        "transiciones": {"s": dict(digits, **{" ": "w"}), "n": dict(digits), "w": {" ": "w"}},
+        "aceptacion": ["n", "w"],
+        "token_type_map": {"n": "NUMBER", "w": "WS"},
+    })
+
+
+def load_generated(source, name):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, name + ".py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def test_nested_action_block():
+    """Una acción de varias líneas conserva la sangría de sus bloques"""
+    print("\n=== TEST: Acción con bloque anidado ===")
+    afd = number_dfa()
+    acciones = {"NUMBER": NESTED_ACTION}
+
+    tabla = escaner.compilar_acciones(afd, acciones)
+    valores = [valor for _, _, valor in escaner.escanear_con_acciones(afd, b"007 42", tabla)]
+    assert valores == [0, " ", 42], valores
+
+    generated = load_generated(generador_lexer.generar_codigo_lexer(afd, acciones=acciones), "lexer_acciones")
+    assert [valor for _, _, valor in generated.tokenizar_valores("007 42")] == [0, " ", 42]
+
+    # Un bloque cuyo cuerpo quedó al nivel de la primera línea se sangra un nivel
+    assert escaner.normalizar_sangria("if lexema:\n      valor = 1") == "if lexema:\n    valor = 1"
+    print("  acción compilada y en el lexer generado")
+    return True
+
+
+def test_action_braces_in_patterns():
+    """Una '{' o '}' dentro de un literal o una clase no se toma como inicio de la acción"""
+    print("\n=== TEST: Llaves dentro del patrón ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        yal_file = os.path.join(tmp, "llaves.yal")
+        with open(yal_file, "w", encoding="utf-8") as f:
+            f.write(YAL)
+        with contextlib.redirect_stdout(io.StringIO()):
+            header, acciones = yalex_parser.leer_acciones_yal(yal_file)
+            reglas = yalex_parser.extraer_reglas_char_por_char(
+                yalex_parser.delete_comments(yalex_parser.leer_archivo_char_por_char(yal_file)))
+
+    assert acciones == {"NUMBER": "valor = int(lexema)", "RBRACKET": "x = 'return'"}, acciones
+    assert yalex_parser.accion_de_regla("| '{'       { return LBRACE }") == ("| '{'", "LBRACE", "")
+    tokens = [regla.split("=", 1)[0].replace("->", "").strip()
+              for regla in yalex_parser.procesar_reglas(reglas, {})]
+    assert tokens == ["WS", "NUMBER", "LBRACE", "RBRACKET"], tokens
+    print(f"  acciones: {sorted(acciones)}")
+    return True
+
+
+def test_action_positions():
+    """Las acciones con linea/columna reciben la posición de escaner.IndiceLineas en ambos lexers"""
+    print("\n=== TEST: Posición en las acciones ===")
+    afd = number_dfa()
+    acciones = {"NUMBER": "valor = (linea, columna)"}
+    # El AFD sólo tiene espacios: los saltos de línea son ERROR, que no tiene acción
+    texto = "1 22\r\n333\r4\n 55"
+    expected = [(1, 1), (1, 3), (2, 1), (3, 1), (4, 2)]
+
+    tabla = escaner.compilar_acciones(afd, acciones)
+    valores = [valor for _, token, valor in escaner.escanear_con_acciones(afd, texto.encode("utf-8"), tabla)
+               if token == "NUMBER"]
+    assert valores == expected, valores
+
+    codigo = generador_lexer.generar_codigo_lexer(afd, acciones=acciones)
+    generated = load_generated(codigo, "lexer_posiciones")
+    valores = [valor for _, token, valor in generated.tokenizar_valores(texto) if token == "NUMBER"]
+    assert valores == expected, valores
+    # El lexer generado lleva la misma clase que el escáner y lexical_interface
+    assert inspect.getsource(escaner.IndiceLineas) in codigo
+    assert issubclass(LineIndex, escaner.IndiceLineas)
+    print(f"  posiciones: {expected}")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Acción con bloque anidado", test_nested_action_block),
+        ("Llaves dentro del patrón", test_action_braces_in_patterns),
+        ("Posición en las acciones", test_action_positions),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
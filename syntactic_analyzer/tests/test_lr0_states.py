@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los estados del autómata LR(0) (lr0_automaton2.build_lr0_automaton).
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lr0_automaton2 import goto
+from parser_generator import build_slr_from_yalp
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+# Cantidad de estados de las gramáticas incluidas, con los estados identificados por
+# producción y posición del punto (antes se unían estados que sólo diferían en el punto)
+EXPECTED_STATES = {
+    "slr-1.yalp": 12,
+    "slr-2.yalp": 21,
+    "slr-3.yalp": 15,
+    "slr-4.yalp": 41,
+}
+
+
+def item_key(items):
+    return frozenset((item.production.number, item.dot_position) for item in items)
+
+
+def test_state_counts():
+    """Las gramáticas incluidas producen la cantidad de estados esperada, sin conflictos"""
+    print("\n=== TEST: Cantidad de estados LR(0) ===")
+    for name, expected in EXPECTED_STATES.items():
+        grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, name))
+        states = table.automaton.states
+        assert len(states) == expected, (name, len(states))
+        assert not table.has_conflicts(), name
+        print(f"  {name}: {len(states)} estados")
+    return True
+
+
+def test_transitions_match_goto():
+    """Cada transición lleva al estado con exactamente los ítems de GOTO, y no hay estados repetidos"""
+    print("\n=== TEST: Transiciones LR(0) ===")
+    for name in EXPECTED_STATES:
+        grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, name))
+        states = table.automaton.states
+        keys = [item_key(state.items) for state in states]
+        assert len(set(keys)) == len(keys), name
+        for state in states:
+            for symbol, target in state.transitions.items():
+                assert item_key(goto(state.items, symbol, grammar)) == keys[target], (name, state.number, symbol)
+        print(f"  {name}: transiciones verificadas")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Cantidad de estados", test_state_counts),
+        ("Transiciones", test_transitions_match_goto),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la construcción de los AFD por regla en paralelo
+(ERtoAFD2.ERtoAFD_por_regla con procesos > 1): el resultado debe ser idéntico al del
+recorrido secuencial, nombres de estado incluidos.
+"""
+
+import sys
+import os
+import io
+import json
+import contextlib
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el generador de AFD
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ERtoAFD2
+from AFD_minimo import desplazar_estados
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES = os.path.join(REPO, "output", "final_infix.txt")
+
+
+def load_rules():
+    with open(RULES, "r", encoding="utf-8") as f:
+        return f.read().strip().splitlines() + ["((a|b)c)+# --> AB"]
+
+
+class RecordingStage:
+    """Etapa de visualización que guarda lo registrado en lugar de renderizarlo."""
+
+    def __init__(self):
+        self.registered = []
+
+    def registrar(self, fabrica, archivo, *args, **kwargs):
+        self.registered.append((archivo, describe(args[0]), kwargs))
+
+
+def describe(obj):
+    """Árbol como (valor, pos_id, firstpos, lastpos, izq, der); un AFD se deja igual."""
+    if isinstance(obj, dict):
+        return obj
+    if obj is None:
+        return None
+    return (obj.value, obj.pos_id, sorted(obj.firstpos), sorted(obj.lastpos),
+            describe(obj.left), describe(obj.right))
+
+
+def build(rules, procesos, compacto=False):
+    stage = RecordingStage()
+    with contextlib.redirect_stdout(io.StringIO()) as salida:
+        result = ERtoAFD2.ERtoAFD_por_regla(rules, compacto=compacto, procesos=procesos, visualizacion=stage)
+    return result, stage.registered, salida.getvalue()
+
+
+def test_parallel_matches_serial():
+    """procesos=1 y procesos>1 dan los mismos AFD minimizados, árboles y mensajes"""
+    print("\n=== TEST: AFD por regla en paralelo ===")
+    rules = load_rules()
+    for compacto in (False, True):
+        serial = build(rules, 1, compacto)
+        for procesos in (2, 3):
+            parallel = build(rules, procesos, compacto)
+            # (afd_list, contador): estados, transiciones y aceptación con los mismos nombres
+            assert parallel[0] == serial[0], (compacto, procesos)
+            # Árboles con las posiciones desplazadas al rango global y los mismos archivos
+            assert parallel[1] == serial[1], (compacto, procesos)
+            assert parallel[2] == serial[2], (compacto, procesos)
+    afd_list, counter = serial[0]
+    print(f"  {len(afd_list)} AFD iguales, contador final {counter}")
+    return True
+
+
+def test_canonical_state_numbering():
+    """minimizar_AFD numera los estados igual sin importar el orden de los conjuntos"""
+    print("\n=== TEST: Numeración canónica ===")
+    script = (
+        "import sys, io, json, contextlib\n"
+        f"sys.path.insert(0, {REPO!r})\n"
+        "import ERtoAFD2\n"
+        f"rules = open({RULES!r}, encoding='utf-8').read().strip().splitlines()\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    afd_list, counter = ERtoAFD2.ERtoAFD_por_regla(rules)\n"
+        "print(json.dumps([[sorted(afd['transiciones'].items()), afd['inicial'], sorted(afd['aceptacion']), token]\n"
+        "                  for afd, token in afd_list] + [counter], sort_keys=True, ensure_ascii=False))\n"
+    )
+    outputs = set()
+    for seed in ("0", "1", "12345"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, check=True)
+        outputs.add(result.stdout.decode("utf-8").strip().splitlines()[-1])
+    assert len(outputs) == 1, "los nombres de estado dependen de PYTHONHASHSEED"
+
+    # desplazar_estados sobre la numeración local da la numeración con el offset global
+    for expr in load_rules():
+        local = ERtoAFD2.construir_afd_regla(expr, 1, 0, log=lambda *partes: None)
+        global_ = ERtoAFD2.construir_afd_regla(expr, 1, 40, log=lambda *partes: None)
+        # (nombre_token, root, pos_siguiente, afd_min, estado_a_token_min, offset_siguiente)
+        assert desplazar_estados(local[3], local[4], 40) == (global_[3], global_[4]), expr
+    print(f"  {len(json.loads(outputs.pop())) - 1} AFD iguales con 3 semillas de hash")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("AFD por regla en paralelo", test_parallel_matches_serial),
+        ("Numeración canónica", test_canonical_state_numbering),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el análisis por lotes (LRParser.parse_many).
+"""
+
+import sys
+import os
+import io
+import random
+import contextlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing_LR import LRParser
+from parser_generator import build_slr_from_yalp
+from slr_table import (compile_slr_table, share_compiled_table, attach_compiled_table,
+                       export_compiled_table, load_compiled_table)
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+SLR1_CASES = [
+    ['ID'],
+    ['ID', 'PLUS', 'ID', 'TIMES', 'LPAREN', 'ID', 'PLUS', 'ID', 'RPAREN'],
+    ['LPAREN', 'ID', 'RPAREN', 'TIMES', 'ID', '$'],
+    ['ID', 'PLUS'],
+    ['PLUS', 'ID'],
+    ['LPAREN', 'ID'],
+    ['ID', 'ASSIGNOP', 'ID'],
+]
+
+
+def random_cases(n, seed=7):
+    rng = random.Random(seed)
+    symbols = ['ID', 'PLUS', 'TIMES', 'LPAREN', 'RPAREN']
+    return [[rng.choice(symbols) for _ in range(rng.randint(1, 12))] for _ in range(n)]
+
+
+def expected_results(parser, cases):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [parser.parse(tokens, verbose=False) for tokens in cases]
+
+
+def test_parse_many_matches_parse():
+    """parse_many da los mismos resultados y mensajes que parse"""
+    print("\n=== TEST: parse_many ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+
+    cases = SLR1_CASES + random_cases(500)
+    results = parser.parse_many(cases)
+    assert results == expected_results(parser, cases)
+    # Acepta cualquier iterable, no sólo listas
+    assert parser.parse_many(tuple(tokens) for tokens in SLR1_CASES) == results[:len(SLR1_CASES)]
+    assert parser.parse_many([[]]) == [parser.parse(['$'], verbose=False)]
+    print(f"  {len(cases)} entradas, {sum(ok for ok, _ in results)} aceptadas")
+    return True
+
+
+def test_parse_many_process_pool():
+    """Con un pool de procesos la tabla se comparte y el orden se conserva"""
+    print("\n=== TEST: parse_many con procesos ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+
+    cases = random_cases(2000, seed=11)
+    assert parser.parse_many(cases, processes=2, chunk_size=300) == parser.parse_many(cases)
+    print(f"  {len(cases)} entradas en 2 procesos")
+    return True
+
+
+def test_shared_compiled_table():
+    """La tabla exportada (memoria compartida o archivo) se carga sin copiarla"""
+    print("\n=== TEST: Tabla compartida ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    compiled = compile_slr_table(table, grammar)
+    cases = SLR1_CASES + random_cases(200, seed=3)
+    expected = LRParser(compiled, grammar).parse_many(cases)
+
+    shm, name = share_compiled_table(compiled)
+    try:
+        shared = attach_compiled_table(name)
+        assert shared.action.readonly
+        assert list(shared.action) == list(compiled.action)
+        assert list(shared.goto) == list(compiled.goto)
+        assert [str(p) for p in shared.productions] == [str(p) for p in compiled.productions]
+        assert LRParser(shared, grammar).parse_many(cases) == expected
+        shared.close()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "slr1.tbl")
+        export_compiled_table(compiled, path)
+        loaded = load_compiled_table(path)
+        assert loaded.get_action(0, 'ID').type == compiled.get_action(0, 'ID').type
+        assert LRParser(loaded, grammar).parse_many(cases) == expected
+        loaded.close()
+    print(f"  {len(compiled.action)} entradas ACTION compartidas")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("parse_many", test_parse_many_matches_parse),
+        ("parse_many con procesos", test_parse_many_process_pool),
+        ("Tabla compartida", test_shared_compiled_table),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
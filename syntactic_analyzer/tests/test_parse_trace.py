@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los observadores del análisis (parse_trace).
+"""
+
+import sys
+import os
+import io
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parsing_LR
+from parsing_LR import LRParser
+from parser_generator import build_slr_from_yalp
+from parse_trace import ParseObserver, PrintObserver, BinaryTraceRecorder, replay_trace
+from slr_table import SLRParser
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+SLR1_CASES = [
+    ['ID', 'PLUS', 'ID', 'TIMES', 'LPAREN', 'ID', 'PLUS', 'ID', 'RPAREN'],
+    ['ID', 'PLUS'],
+    ['LPAREN', 'ID', 'RPAREN', 'TIMES', 'ID'],
+    ['ID', 'ASSIGNOP', 'ID'],
+]
+
+
+class EventList(ParseObserver):
+    """Guarda los eventos como tuplas, con una copia de la pila"""
+    def __init__(self):
+        self.events = []
+
+    def shift(self, state, token, target, stack):
+        self.events.append(('shift', state, token, target, tuple(stack)))
+
+    def reduce(self, state, production, target, stack):
+        number = production if isinstance(production, int) else production.number
+        self.events.append(('reduce', state, number, target, tuple(stack)))
+
+    def accept(self, state, stack):
+        self.events.append(('accept', state, tuple(stack)))
+
+    def error(self, state, token, message, stack):
+        self.events.append(('error', state, token, message, tuple(stack)))
+
+
+def test_observer_does_not_change_result():
+    """Con y sin observador el resultado es el mismo"""
+    print("\n=== TEST: Observador ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+
+    for tokens in SLR1_CASES:
+        observer = EventList()
+        assert parser.parse(tokens, verbose=False, observer=observer) == parser.parse(tokens, verbose=False)
+        kinds = [event[0] for event in observer.events]
+        assert kinds[-1] in ('accept', 'error')
+        assert kinds.count('shift') <= len(tokens)
+
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        parser.parse(SLR1_CASES[0], verbose=True, observer=PrintObserver())
+    assert "acc" in out.getvalue() and "Cadena aceptada" in out.getvalue()
+    return True
+
+
+def test_binary_trace_replay():
+    """La traza binaria reproduce los mismos eventos y pilas"""
+    print("\n=== TEST: Traza binaria ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+
+    live = EventList()
+    buffer = io.BytesIO()
+    recorder = BinaryTraceRecorder(buffer)
+    for tokens in SLR1_CASES:
+        parser.parse(tokens, verbose=False, observer=live)
+        parser.parse(tokens, verbose=False, observer=recorder)
+    recorder.close()
+
+    replayed = EventList()
+    assert replay_trace(buffer.getvalue(), replayed) == len(live.events)
+    assert replayed.events == live.events
+
+    # Con la gramática, reduce recibe el objeto Production
+    productions = []
+    class Reductions(ParseObserver):
+        def reduce(self, state, production, target, stack):
+            productions.append(production)
+    replay_trace(buffer.getvalue(), Reductions(), grammar)
+    assert all(hasattr(production, 'left') for production in productions)
+    print(f"  {len(live.events)} eventos en {len(buffer.getvalue())} bytes")
+    return True
+
+
+def test_slr_parser_observer():
+    """SLRParser llama al observador con los mismos eventos que cuenta step_count"""
+    print("\n=== TEST: Observador en SLRParser ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = SLRParser(table)
+
+    observer = EventList()
+    success, steps, _ = parser.parse(SLR1_CASES[0], observer=observer)
+    assert success and steps == []
+    assert len(observer.events) == parser.step_count
+    return True
+
+
+def test_verbose_parse_is_untraced():
+    """parse(verbose=True) sin observador usa el ciclo sin traza y muestra el resultado"""
+    print("\n=== TEST: parse verbose sin traza ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+
+    def no_trace(*args):
+        raise AssertionError("parse sin observador no debe usar _parse_traced")
+
+    traced = parsing_LR._parse_traced
+    parsing_LR._parse_traced = no_trace
+    try:
+        for tokens in SLR1_CASES:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                success, message = parser.parse(tokens)
+            if success:
+                assert "ACCION accept" in out.getvalue()
+            else:
+                assert f"ERROR: {message}" in out.getvalue()
+    finally:
+        parsing_LR._parse_traced = traced
+    print(f"  {len(SLR1_CASES)} cadenas sin pasar por _parse_traced")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Observador", test_observer_does_not_change_result),
+        ("Traza binaria", test_binary_trace_replay),
+        ("Observador en SLRParser", test_slr_parser_observer),
+        ("parse verbose sin traza", test_verbose_parse_is_untraced),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la tabla SLR compilada y el parser generado.
+"""
+
+import sys
+import os
+import io
+import contextlib
+import importlib.util
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slr_table import compile_slr_table, ActionType
+from parsing_LR import LRParser
+from parser_generator import build_slr_from_yalp, generate_parser
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+# Cadenas de prueba para slr-1 (E -> E + T | T, T -> T * F | F, F -> ( E ) | id)
+SLR1_CASES = [
+    ['ID'],
+    ['ID', 'PLUS', 'ID', 'TIMES', 'LPAREN', 'ID', 'PLUS', 'ID', 'RPAREN'],
+    ['LPAREN', 'ID', 'RPAREN', 'TIMES', 'ID'],
+    ['ID', 'PLUS'],
+    ['PLUS', 'ID'],
+    ['LPAREN', 'ID'],
+    ['ID', 'ASSIGNOP', 'ID'],
+    [],
+]
+
+
+def load_generated(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compiled_table_matches_table():
+    """La tabla compilada decodifica las mismas acciones que SLRTable"""
+    print("\n=== TEST: Tabla SLR compilada ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    compiled = compile_slr_table(table, grammar)
+
+    for (state, terminal), action in table.action_table.items():
+        decoded = compiled.get_action(state, terminal)
+        assert decoded.type == action.type, (state, terminal)
+        if action.type in (ActionType.SHIFT, ActionType.REDUCE):
+            assert decoded.value == action.value, (state, terminal)
+
+    for (state, non_terminal), target in table.goto_table.items():
+        assert compiled.goto_state(state, non_terminal) == target
+
+    assert compiled.get_action(0, 'NO_EXISTE').type == ActionType.ERROR
+    print(f"  {len(table.action_table)} entradas ACTION y {len(table.goto_table)} GOTO verificadas")
+    return True
+
+
+def test_generated_parser_matches_lr_parser():
+    """El parser generado da el mismo resultado y mensaje que LRParser"""
+    print("\n=== TEST: Parser generado ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    lr_parser = LRParser(table, grammar)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "slr1_parser.py")
+        generate_parser(table, grammar, output)
+        generated = load_generated(output, "slr1_parser")
+
+    for tokens in SLR1_CASES:
+        if tokens:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = lr_parser.parse(tokens, verbose=False)
+            assert generated.parse(tokens) == expected, tokens
+        result = generated.parse(tokens)
+        print(f"  {' '.join(tokens) or '(vacía)':<55} {'ACEPTADA' if result[0] else 'RECHAZADA'}")
+
+    assert generated.parse(SLR1_CASES[1]) == (True, "Cadena aceptada")
+    assert not generated.parse(SLR1_CASES[3])[0]
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Tabla SLR compilada", test_compiled_table_matches_table),
+        ("Parser generado", test_generated_parser_matches_lr_parser),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
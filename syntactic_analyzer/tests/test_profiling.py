@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el perfilado opcional del generador de analizadores léxicos
+(perfilado.py): reporte JSON con etapas y contadores, contadores de los procesos
+trabajadores sumados con combinar, y etapa() sin efecto con el perfilado apagado.
+"""
+
+import sys
+import os
+import io
+import json
+import contextlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el generador de AFD
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import perfilado
+import ERtoAFD2
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES = os.path.join(REPO, "output", "final_infix.txt")
+
+# Etapas que construir_afd_regla mide una vez por regla
+RULE_STAGES = ("shunting_yard", "arbol_expresion", "visitantes", "construir_afd", "minimizar_AFD")
+
+
+def profiled_build(path, procesos):
+    """Construye los AFD por regla con el perfilado activo. Devuelve el reporte escrito."""
+    with open(RULES, "r", encoding="utf-8") as f:
+        rules = f.read().strip().splitlines()
+    perfil = perfilado.iniciar("prueba", path)
+    perfil.anotar("procesos", procesos)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with perfilado.etapa("afd_por_regla"):
+            afd_list, _ = ERtoAFD2.ERtoAFD_por_regla(rules, procesos=procesos)
+        assert perfilado.terminar() == path
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f), len(afd_list)
+
+
+def test_report_stages_and_counters():
+    """El reporte JSON tiene las etapas y contadores de la construcción"""
+    print("\n=== TEST: Reporte de perfilado ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        report, n_rules = profiled_build(os.path.join(tmp, "perfil", "serial.json"), 1)
+    assert perfilado.activo() is None
+    assert report["programa"] == "prueba" and report["datos"] == {"procesos": 1}
+    assert report["etapas"]["afd_por_regla"]["llamadas"] == 1
+    for stage in RULE_STAGES:
+        assert report["etapas"][stage]["llamadas"] == n_rules, stage
+        assert report["etapas"][stage]["segundos"] >= 0, stage
+    counters = report["contadores"]
+    assert counters["reglas"] == n_rules
+    assert counters["posiciones"] > 0 and counters["particiones"] > 0
+    assert counters["rondas_refinamiento"] >= n_rules
+    print(f"  {len(report['etapas'])} etapas, contadores: {sorted(counters)}")
+    return True
+
+
+def test_worker_reports_merged():
+    """Con procesos > 1 los contadores de los trabajadores se suman con combinar"""
+    print("\n=== TEST: Perfilado con procesos trabajadores ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        serial, n_rules = profiled_build(os.path.join(tmp, "serial.json"), 1)
+        parallel, _ = profiled_build(os.path.join(tmp, "paralelo.json"), 3)
+    # Los contadores no dependen de en qué proceso se construyó cada regla
+    assert parallel["contadores"] == serial["contadores"], (parallel["contadores"], serial["contadores"])
+    for stage in RULE_STAGES:
+        assert parallel["etapas"][stage]["llamadas"] == n_rules, stage
+
+    perfil = perfilado.Perfil()
+    perfil.contar("reglas", 2)
+    perfil.sumar_etapa("minimizar_AFD", 0.5)
+    perfil.combinar({"etapas": {"minimizar_AFD": {"llamadas": 3, "segundos": 0.25},
+                                "visitantes": {"llamadas": 1, "segundos": 0.125}},
+                     "contadores": {"reglas": 3, "estados": 7}})
+    report = perfil.reporte()
+    assert report["etapas"] == {"minimizar_AFD": {"llamadas": 4, "segundos": 0.75},
+                                "visitantes": {"llamadas": 1, "segundos": 0.125}}
+    assert report["contadores"] == {"reglas": 5, "estados": 7}
+    print(f"  contadores iguales a la construcción secuencial ({n_rules} reglas)")
+    return True
+
+
+def test_disabled_is_noop():
+    """Con el perfilado apagado etapa() y contar() no registran nada"""
+    print("\n=== TEST: Perfilado apagado ===")
+    old = os.environ.pop(perfilado.VARIABLE_ENTORNO, None)
+    try:
+        assert perfilado.iniciar("prueba") is None
+        assert perfilado.activo() is None
+        # Siempre el mismo context manager vacío, sin medir ni guardar nada
+        assert perfilado.etapa("a") is perfilado.etapa("b")
+        with perfilado.etapa("a"):
+            perfilado.contar("reglas")
+        assert perfilado.terminar() is None
+
+        perfil = perfilado.activar("prueba")
+        assert perfil.reporte()["etapas"] == {} and perfil.reporte()["contadores"] == {}
+        perfilado.desactivar()
+
+        # PERFIL_LEXER=DIRECTORIO activa el perfilado con DIRECTORIO/<programa>.json
+        os.environ[perfilado.VARIABLE_ENTORNO] = "perfiles"
+        assert perfilado.ruta_reporte("ERtoAFD2") == os.path.join("perfiles", "ERtoAFD2.json")
+        assert perfilado.ruta_reporte("ERtoAFD2", "otro.json") == "otro.json"
+    finally:
+        os.environ.pop(perfilado.VARIABLE_ENTORNO, None)
+        if old is not None:
+            os.environ[perfilado.VARIABLE_ENTORNO] = old
+    print("  etapa() y contar() sin efecto")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Reporte de perfilado", test_report_stages_and_counters),
+        ("Procesos trabajadores", test_worker_reports_merged),
+        ("Perfilado apagado", test_disabled_is_noop),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el front end de expresiones regulares: los tokens tipados de
+shuntingyard (tokenizar_regex, insertar_concatenacion, expandir_operadores y la forma
+postfix) y el descenso recursivo de parser_regex.
+"""
+
+import sys
+import os
+import io
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el front end de expresiones regulares
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import estructuras
+import parser_regex
+import shuntingyard as sy
+import ERtoAFD2
+import yalex_parser
+from shuntingyard import Token, LITERAL, EPSILON, OP, LPAREN, RPAREN
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES = os.path.join(REPO, "output", "final_infix.txt")
+
+
+def shape(node):
+    if node is None:
+        return None
+    return (node.value, shape(node.left), shape(node.right))
+
+
+def lit(valor):
+    return Token(LITERAL, valor)
+
+
+def tokens(*valores):
+    """
+    Lista de tokens tipados: '(' y ')' son paréntesis, '|', '.', '*', '+' y '?'
+    operadores, 'ε' la cadena vacía y el resto literales (un Token se toma tal cual,
+    para los literales que coinciden con un operador).
+    """
+    tipos = {'(': LPAREN, ')': RPAREN, 'ε': EPSILON}
+    resultado = []
+    for valor in valores:
+        if isinstance(valor, Token):
+            resultado.append(valor)
+        elif valor in '|.*+?' and len(valor) == 1:
+            resultado.append(Token(OP, valor))
+        else:
+            resultado.append(Token(tipos.get(valor, LITERAL), valor))
+    return resultado
+
+
+def test_tokenize():
+    """Escapes, literales entre comillas y operadores se convierten en tokens tipados"""
+    print("\n=== TEST: tokenizar_regex ===")
+    cases = [
+        # Escapes dentro y fuera de comillas, comilla y barra invertida escapadas
+        (r"'\n'\t'\''", [lit('\n'), lit('\t'), lit("'")]),
+        (r"'\\'", [lit('\\')]),
+        (r"'\'", [lit('\\')]),
+        # Un operador entre comillas es un literal
+        ("a'+''|''.'", [lit('a'), lit('+'), lit('|'), lit('.')]),
+        # Un literal de varios caracteres es un grupo con sus caracteres
+        ("'ab'c", tokens('(', 'a', 'b', ')', 'c')),
+        # Cualquier otro carácter es un literal
+        (":=#", tokens(':', '=', '#')),
+        ("(a|ε)*", tokens('(', 'a', '|', 'ε', ')', '*')),
+    ]
+    for infix, expected in cases:
+        assert sy.tokenizar_regex(infix) == expected, (infix, sy.tokenizar_regex(infix))
+    try:
+        sy.tokenizar_regex("'ab")
+    except ValueError:
+        print(f"  {len(cases)} expresiones tokenizadas")
+        return True
+    assert False, "se esperaba ValueError por la comilla sin cerrar"
+
+
+def test_implicit_concatenation():
+    """Se inserta '.' entre operandos adyacentes y se descartan los grupos vacíos"""
+    print("\n=== TEST: insertar_concatenacion ===")
+    cases = [
+        ("ab", tokens('a', '.', 'b')),
+        ("a*(b)c?", tokens('a', '*', '.', '(', 'b', ')', '.', 'c', '?')),
+        ("a|bε", tokens('a', '|', 'b', '.', 'ε')),
+        ("a()b", tokens('a', '.', 'b')),
+        ("'.'x", [lit('.'), Token(OP, '.'), lit('x')]),
+    ]
+    for infix, expected in cases:
+        result = sy.insertar_concatenacion(sy.tokenizar_regex(infix))
+        assert result == expected, (infix, result)
+    print(f"  {len(cases)} expresiones")
+    return True
+
+
+def test_expand_operators():
+    """X+ se reescribe como (X.X*) y X? como (X|ε), sobre el átomo completo"""
+    print("\n=== TEST: expandir_operadores ===")
+    cases = [
+        # Sólo se repite el átomo anterior: b+ y no ab+
+        ("ab+", tokens('a', '.', '(', 'b', '.', 'b', '*', ')')),
+        ("(ab)?", tokens('(', '(', 'a', '.', 'b', ')', '|', 'ε', ')')),
+        ("a*+", tokens('(', 'a', '*', '.', 'a', '*', '*', ')')),
+    ]
+    for infix, expected in cases:
+        result = sy.expandir_operadores(sy.insertar_concatenacion(sy.tokenizar_regex(infix)))
+        assert result == expected, (infix, result)
+    for infix in ("+a", "a|?"):
+        try:
+            sy.expandir_operadores(sy.insertar_concatenacion(sy.tokenizar_regex(infix)))
+        except ValueError:
+            continue
+        assert False, f"se esperaba ValueError para {infix!r}"
+    print(f"  {len(cases)} expansiones")
+    return True
+
+
+def test_postfix_tokens():
+    """La forma postfix tipada de expresiones con escapes, clases expandidas, '+' y '?'"""
+    print("\n=== TEST: Postfix tipado ===")
+    # Una clase del .yal llega expandida por yalex_parser como unión de literales
+    digits = yalex_parser.expand_range("['0'-'2']")
+    signs = yalex_parser.expand_range("['+''-']")
+    assert digits == "(0|1|2)" and signs == "('+'|'-')", (digits, signs)
+    cases = [
+        ("ab+", tokens('a', 'b', 'b', '*', '.', '.')),
+        ("a(b|c)?d", tokens('a', 'b', 'c', '|', 'ε', '|', '.', 'd', '.')),
+        (digits + "+", tokens('0', '1', '|', '2', '|', '0', '1', '|', '2', '|', '*', '.')),
+        ("E" + signs + "?", [lit('E'), lit('+'), lit('-'), Token(OP, '|'), Token(EPSILON, 'ε'),
+                             Token(OP, '|'), Token(OP, '.')]),
+        (r"('\n'|'\t')x#", [lit('\n'), lit('\t'), Token(OP, '|'), lit('x'), Token(OP, '.'),
+                            lit('#'), Token(OP, '.')]),
+        ("'a.'|:=", [lit('a'), lit('.'), Token(OP, '.'), lit(':'), lit('='), Token(OP, '.'), Token(OP, '|')]),
+    ]
+    for infix, expected in cases:
+        result = sy.convertir_infix_a_postfix_tokens(infix)
+        assert result == expected, (infix, result)
+        # Sólo quedan los operadores que entiende el árbol
+        assert all(token.valor in '|.*' for token in result if token.tipo == OP), infix
+    for infix in ("(ab", "ab)"):
+        try:
+            sy.convertir_infix_a_postfix_tokens(infix)
+        except ValueError:
+            continue
+        assert False, f"se esperaba ValueError para {infix!r}"
+    print(f"  {len(cases)} expresiones")
+    return True
+
+
+def test_postfix_text_roundtrip():
+    """El postfix de texto construye el mismo árbol que la lista de tokens tipados"""
+    print("\n=== TEST: Postfix de texto ===")
+    with open(RULES, "r", encoding="utf-8") as f:
+        rules = f.read().strip().splitlines()
+    for expr in rules + [r"('\''|'\\')n", "'*''?'"]:
+        source = f"({expr[:expr.rfind('#')]})#" if "#" in expr else expr
+        postfix = sy.convertir_infix_a_postfix_tokens(source)
+        texto = sy.convert_infix_to_postfix(source)
+        assert texto == sy.postfix_a_texto(postfix)
+        assert shape(estructuras.build_expression_tree(texto)) == \
+            shape(estructuras.build_expression_tree(postfix)), expr
+    print(f"  {len(rules) + 2} expresiones")
+    return True
+
+
+def build_rules(rules, frontend, compacto):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ERtoAFD2.ERtoAFD_por_regla(rules, compacto=compacto, frontend=frontend)
+
+
+def test_frontends_same_dfa():
+    """El descenso recursivo y Shunting Yard dan el mismo árbol y el mismo AFD por regla"""
+    print("\n=== TEST: Front ends equivalentes ===")
+    with open(RULES, "r", encoding="utf-8") as f:
+        rules = f.read().strip().splitlines()
+    rules += ["((a|b)c)+# --> AB", "(x(y|z)*)?w# --> XYZ", "('\\''|'\\\\')+n?# --> ESC"]
+    for expr in rules:
+        source = f"({expr[:expr.rfind('#')]})#"
+        expected = shape(estructuras.build_expression_tree(sy.convertir_infix_a_postfix_tokens(source)))
+        assert shape(parser_regex.construir_arbol_regex(source)) == expected, expr
+    for compacto in (False, True):
+        # Mismos AFD minimizados, con los mismos nombres de estado, y el mismo contador final
+        assert build_rules(rules, "descendente", compacto) == build_rules(rules, "shunting", compacto)
+    print(f"  {len(rules)} reglas con el mismo AFD")
+    return True
+
+
+def test_frontend_errors():
+    """Una expresión mal formada es un ValueError descriptivo en el descenso recursivo"""
+    print("\n=== TEST: Errores del descenso recursivo ===")
+    cases = [
+        ("(ab", "paréntesis desbalanceados"),
+        ("(a|b))", "token inesperado ')'"),
+        ("a|", "'|' debe tener operandos"),
+        ("|a", "'|' debe tener operandos"),
+        ("(a|)b", "'|' debe tener operandos"),
+        ("*a", "token inesperado '*'"),
+        ("()*", "'*' debe estar precedido por un operando"),
+        ("()", "la expresión está vacía"),
+        ("'ab", "no cerrado"),
+    ]
+    for infix, message in cases:
+        for compacto in (False, True):
+            try:
+                parser_regex.construir_arbol_regex(infix, compacto=compacto)
+            except ValueError as e:
+                assert message in str(e), (infix, str(e))
+                continue
+            assert False, f"se esperaba ValueError para {infix!r}"
+    # ERtoAFD_por_regla rechaza un front end desconocido
+    try:
+        ERtoAFD2.ERtoAFD_por_regla(["(a)# --> A"], frontend="lalr")
+    except ValueError:
+        print(f"  {len(cases)} expresiones rechazadas")
+        return True
+    assert False, "se esperaba ValueError por el front end desconocido"
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("tokenizar_regex", test_tokenize),
+        ("insertar_concatenacion", test_implicit_concatenation),
+        ("expandir_operadores", test_expand_operators),
+        ("Postfix tipado", test_postfix_tokens),
+        ("Postfix de texto", test_postfix_text_roundtrip),
+        ("Front ends equivalentes", test_frontends_same_dfa),
+        ("Errores del descenso recursivo", test_frontend_errors),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los modos del escáner léxico (escaner.py): cada modo se compara
+con escanear_bytes sobre el texto completo en memoria.
+"""
+
+import sys
+import os
+import io
+import importlib.util
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el escáner y el generador de lexers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import escaner
+import generador_lexer
+from lexical_interface import TokenBuffer
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+# Entradas con CRLF, CR sueltos, caracteres no ASCII (que inician o no un token),
+# tramos de errores y '<<<<' (el token '<+>' obliga a releer sin la tabulación)
+SAMPLES = [
+    "x := 3;\r\n",
+    "año := 10;\rb:=2;\r\n\r\nc := año;\n",
+    "€€ x := ?? 1;\n@@@;  € ñ:=\r",
+    "<<<<<<<<<<<< <<> <<<>\r\n<<",
+    ":::= ; ::\r\r\n",
+    "",
+]
+
+# Entradas con bytes que no son UTF-8 válido (inicio inválido, continuación suelta,
+# secuencia truncada) y los tokens esperados sin agrupar: cada byte inválido es un ERROR
+# y su lexema es el escape sustituto (errors='surrogateescape')
+INVALID_SAMPLES = [
+    (b"ab \xff\xfe ab", [("ab", "ID"), (" ", "WS"), ("\udcff", "ERROR"), ("\udcfe", "ERROR"),
+                         (" ", "WS"), ("ab", "ID")]),
+    (b"\x80", [("\udc80", "ERROR")]),
+    (b"\xe2\x82", [("\udce2", "ERROR"), ("\udc82", "ERROR")]),
+    (b"x\xe2\x82:=\xc3\xb1\xc3\r\n\xf0\x9f\x98",
+     [("x", "ID"), ("\udce2", "ERROR"), ("\udc82", "ERROR"), (":=", "ASSIGNOP"), ("ñ", "ID"),
+      ("\udcc3", "ERROR"), ("\n", "WS"), ("\udcf0", "ERROR"), ("\udc9f", "ERROR"), ("\udc98", "ERROR")]),
+]
+
+
+def sample_dfa():
+    """
+    AFD a mano con los tokens: WS = [ \\n]+, ID = [a-zñ]+, NUMBER = [0-9]+,
+    ASSIGNOP = ':=', SEMICOLON = ';' y ARROW = '<'+'>'.
+    """
+    letras = {c: "id" for c in "abcdefghijklmnopqrstuvwxyzñ"}
+    digitos = {c: "num" for c in "0123456789"}
+    inicio = dict(letras, **digitos)
+    inicio.update({" ": "ws", "\n": "ws", ":": "dos_puntos", ";": "semi", "<": "menor"})
+    return escaner.compilar_afd({
+        "inicial": "inicio",
+        "transiciones": {
+            "inicio": inicio,
+            "ws": {" ": "ws", "\n": "ws"},
+            "id": dict(letras),
+            "num": dict(digitos),
+            "dos_puntos": {"=": "asignar"},
+            "asignar": {},
+            "semi": {},
+            "menor": {"<": "menor", ">": "flecha"},
+            "flecha": {},
+        },
+        "aceptacion": ["ws", "id", "num", "asignar", "semi", "flecha"],
+        "token_type_map": {"ws": "WS", "id": "ID", "num": "NUMBER", "asignar": "ASSIGNOP",
+                           "semi": "SEMICOLON", "flecha": "ARROW"},
+    })
+
+
+def expected_tokens(afd, text):
+    """(lexema, token) de escanear_bytes sobre el texto completo."""
+    data = text.encode("utf-8")
+    return [(escaner.lexema(data, inicio, fin), afd.nombres_token[id_token])
+            for id_token, inicio, fin in escaner.escanear_bytes(afd, data)]
+
+
+def test_flat_dfa_matches_bytes():
+    """AFDPlano y el lexer generado dan los mismos tokens que escanear_bytes"""
+    print("\n=== TEST: Tablas planas ===")
+    afd = sample_dfa()
+    plano = escaner.aplanar_afd(afd)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lexer_muestra.py")
+        generador_lexer.generar_lexer(afd, path)
+        spec = importlib.util.spec_from_file_location("lexer_muestra", path)
+        generated = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(generated)
+
+    for text in SAMPLES:
+        expected = expected_tokens(afd, text)
+        for memo in (False, True):
+            assert list(plano.tokenizar(text, memo)) == expected, (text, memo)
+            assert list(generated.tokenizar(text, memo)) == expected, (text, memo)
+    assert list(plano.tokenizar("x := 3;\r\n"))[-1] == ("\n", "WS")
+    print(f"  {len(SAMPLES)} entradas iguales a escanear_bytes")
+    return True
+
+
+def write_samples(tmp):
+    """Escribe cada entrada de SAMPLES en binario (conserva \\r\\n y \\r). Devuelve las rutas."""
+    paths = []
+    for k, text in enumerate(SAMPLES):
+        path = os.path.join(tmp, f"entrada_{k}.txt")
+        with open(path, "wb") as f:
+            f.write(text.encode("utf-8"))
+        paths.append(path)
+    return paths
+
+
+def test_mmap_matches_bytes():
+    """escanear_mmap sobre el archivo da los mismos tokens que escanear_bytes en memoria"""
+    print("\n=== TEST: Escaneo con mmap ===")
+    afd = sample_dfa()
+    with tempfile.TemporaryDirectory() as tmp:
+        for text, path in zip(SAMPLES, write_samples(tmp)):
+            expected = expected_tokens(afd, text)
+            for memo in (False, True):
+                assert list(escaner.escanear_mmap(afd, path, memo)) == expected, (text, memo)
+            # El archivo de tokens es el mismo que con la lista en memoria
+            salida = os.path.join(tmp, "tokens.txt")
+            esperado = os.path.join(tmp, "esperado.txt")
+            escaner.simular_archivo_mmap(afd, path, salida)
+            escaner.escribir_tokens(expected, esperado)
+            with open(salida, "rb") as f, open(esperado, "rb") as g:
+                assert f.read() == g.read(), text
+
+        # Un byte inválido en medio del archivo no corta el escaneo en streaming: es un
+        # ERROR y los tokens siguientes se escriben igual (también en formato binario)
+        for k, (data, expected) in enumerate(INVALID_SAMPLES):
+            path = os.path.join(tmp, f"invalida_{k}.txt")
+            with open(path, "wb") as f:
+                f.write(data + b" fin\n")
+            expected = expected + [(" ", "WS"), ("fin", "ID"), ("\n", "WS")]
+            for memo in (False, True):
+                assert list(escaner.escanear_mmap(afd, path, memo)) == expected, (data, memo)
+            salida = os.path.join(tmp, "tokens.txt")
+            esperado = os.path.join(tmp, "esperado.txt")
+            assert escaner.simular_archivo_mmap(afd, path, salida) == len(expected)
+            escaner.escribir_tokens(expected, esperado)
+            with open(salida, "rb") as f, open(esperado, "rb") as g:
+                assert f.read() == g.read(), data
+            # El formato binario guarda los bytes originales y se vuelve a leer igual
+            escaner.simular_archivo_mmap(afd, path, salida, binario=True)
+            buffer = TokenBuffer.from_binary_file(salida)
+            assert [(token.value, token.token_type) for token in buffer] == expected, data
+            buffer.source.close()
+    print(f"  {len(SAMPLES) + len(INVALID_SAMPLES)} archivos iguales a escanear_bytes")
+    return True
+
+
+def test_blocks_match_bytes():
+    """escanear_flujo da los mismos tokens con cualquier tamaño de bloque"""
+    print("\n=== TEST: Escaneo por bloques ===")
+    afd = sample_dfa()
+    for text in SAMPLES:
+        expected = expected_tokens(afd, text)
+        for size in (1, 2, 3, 5, 8, 1 << 16):
+            # Flujo binario: se decodifica con saltos de línea universales, aunque el
+            # \r y el \n de un \r\n queden en bloques distintos
+            tokens = list(escaner.escanear_flujo(afd, io.BytesIO(text.encode("utf-8")), size))
+            assert tokens == expected, (text, size)
+
+    # Lexemas que cruzan el borde entre bloques: 'abcdef' y ':=' se parten en 3 bloques
+    blocks = ["abc", "def :", "= 12", "3"]
+    assert list(escaner.escanear_bloques(afd, blocks)) == [
+        ("abcdef", "ID"), (" ", "WS"), (":=", "ASSIGNOP"), (" ", "WS"), ("123", "NUMBER")]
+    # Si el recorrido cruza bloques y no acepta, se vuelve al inicio del lexema (en un bloque anterior)
+    assert list(escaner.escanear_bloques(afd, ["<<", "<", "x"])) == [
+        ("<", "ERROR"), ("<", "ERROR"), ("<", "ERROR"), ("x", "ID")]
+    assert list(escaner.escanear_bloques(afd, ["<<", "<", ">"])) == [("<<<>", "ARROW")]
+    print(f"  {len(SAMPLES)} entradas iguales a escanear_bytes con 6 tamaños de bloque")
+    return True
+
+
+class CountingRow(dict):
+    """Fila de transiciones que cuenta las consultas (pasos del AFD)"""
+    steps = 0
+
+    def get(self, key, default=None):
+        CountingRow.steps += 1
+        return dict.get(self, key, default)
+
+
+def test_memo_matches_bytes():
+    """La tabulación de Reps da los mismos tokens en tiempo lineal"""
+    print("\n=== TEST: Escaneo con memo ===")
+    afd = sample_dfa()
+    for text in SAMPLES + ["<" * 50 + ">" + "<" * 50]:
+        data = text.encode("utf-8")
+        assert list(escaner.escanear_bytes(afd, data, memo=True)) == list(escaner.escanear_bytes(afd, data)), text
+
+    # '<' * n sin '>': cada reinicio recorre el resto de la entrada sin la tabulación
+    n = 400
+    data = b"<" * n
+    afd.transiciones = [CountingRow(row) for row in afd.transiciones]
+    steps = {}
+    for memo in (False, True):
+        CountingRow.steps = 0
+        tokens = list(escaner.escanear_bytes(afd, data, memo=memo))
+        assert len(tokens) == n and all(id_token == escaner.ID_ERROR for id_token, _, _ in tokens)
+        steps[memo] = CountingRow.steps
+    assert steps[False] > n * n // 4, steps
+    assert steps[True] <= 3 * n, steps
+    print(f"  pasos del AFD con n={n}: {steps[False]} sin memo, {steps[True]} con memo")
+    return True
+
+
+def test_shards_match_bytes():
+    """Unir fragmentos cortados en cualquier carácter (también dentro de un token) da los mismos tokens"""
+    print("\n=== TEST: Escaneo por fragmentos ===")
+    afd = sample_dfa()
+    text = "".join(SAMPLES) + "abc  \n\n  def := <<<>;\r\n" * 3
+    data = text.encode("utf-8")
+    expected = list(escaner.escanear_bytes(afd, data))
+    # Offsets de inicio de carácter (un corte no puede partir un carácter UTF-8)
+    starts = [i for i in range(1, len(data)) if data[i] & 0xC0 != 0x80]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "entrada.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+        # Los fragmentos se escanean en este proceso con las mismas funciones del pool
+        escaner._iniciar_trabajador(afd, path, False)
+        try:
+            cuts_list = [[0, k, len(data)] for k in starts]
+            cuts_list += [[0, starts[j], starts[j + 4], len(data)] for j in range(0, len(starts) - 4, 5)]
+            for cuts in cuts_list:
+                fragments = [escaner._escanear_fragmento(r) for r in zip(cuts, cuts[1:])]
+                joined = list(escaner._unir_fragmentos(afd, data, cuts, fragments, False))
+                assert joined == expected, cuts
+        finally:
+            escaner._trabajador["datos"].close()
+            escaner._trabajador["archivo"].close()
+            escaner._trabajador.clear()
+
+        # Con procesos reales (cortes alineados a saltos de línea)
+        pairs = [(escaner.lexema(data, inicio, fin), afd.nombres_token[id_token])
+                 for id_token, inicio, fin in expected]
+        assert list(escaner.escanear_paralelo(afd, path, procesos=3)) == pairs
+    print(f"  {len(cuts_list)} particiones iguales a escanear_bytes")
+    return True
+
+
+def test_grouped_errors():
+    """Con agrupar_errores cada tramo sin token es un solo ERROR, en todos los modos"""
+    print("\n=== TEST: Errores agrupados ===")
+    afd = sample_dfa()
+    with tempfile.TemporaryDirectory() as tmp:
+        for text, path in zip(SAMPLES, write_samples(tmp)):
+            data = text.encode("utf-8")
+            expected = list(escaner.unir_errores(expected_tokens(afd, text)))
+            for memo in (False, True):
+                tokens = [(escaner.lexema(data, inicio, fin), afd.nombres_token[id_token])
+                          for id_token, inicio, fin in escaner.escanear_bytes(afd, data, memo, 0, True)]
+                assert tokens == expected, (text, memo)
+                assert list(escaner.escanear_mmap(afd, path, memo, agrupar_errores=True)) == expected
+            for size in (1, 3, 1 << 16):
+                tokens = escaner.escanear_flujo(afd, io.BytesIO(data), size)
+                assert list(escaner.unir_errores(tokens)) == expected, (text, size)
+
+    # Tramos con caracteres que no inician un token ('€', '?') y que sí ('<', ':')
+    data = "€€ x := ?? 1;\n@@@:<:".encode("utf-8")
+    errors = [escaner.lexema(data, inicio, fin)
+              for id_token, inicio, fin in escaner.escanear_bytes(afd, data, agrupar_errores=True)
+              if id_token == escaner.ID_ERROR]
+    assert errors == ["€€", "??", "@@@:<:"], errors
+    print(f"  {len(SAMPLES)} entradas iguales a unir_errores(escanear_bytes)")
+    return True
+
+
+def test_invalid_bytes():
+    """Un byte que no es UTF-8 válido es un ERROR de un byte en todos los modos, sin excepciones"""
+    print("\n=== TEST: Bytes inválidos ===")
+    afd = sample_dfa()
+    with tempfile.TemporaryDirectory() as tmp:
+        for k, (data, expected) in enumerate(INVALID_SAMPLES):
+            grouped = list(escaner.unir_errores(expected))
+            path = os.path.join(tmp, f"invalida_{k}.txt")
+            with open(path, "wb") as f:
+                f.write(data)
+            for memo in (False, True):
+                for agrupar, esperado in ((False, expected), (True, grouped)):
+                    tokens = [(escaner.lexema(data, inicio, fin), afd.nombres_token[id_token])
+                              for id_token, inicio, fin in escaner.escanear_bytes(afd, data, memo, 0, agrupar)]
+                    assert tokens == esperado, (data, memo, agrupar)
+                    assert list(escaner.escanear_mmap(afd, path, memo, agrupar_errores=agrupar)) == esperado
+            for size in (1, 2, 1 << 16):
+                tokens = list(escaner.escanear_flujo(afd, io.BytesIO(data), size))
+                assert tokens == expected, (data, size)
+                assert list(escaner.unir_errores(tokens)) == grouped, (data, size)
+    print(f"  {len(INVALID_SAMPLES)} entradas con bytes inválidos")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Tablas planas", test_flat_dfa_matches_bytes),
+        ("Escaneo con mmap", test_mmap_matches_bytes),
+        ("Escaneo por bloques", test_blocks_match_bytes),
+        ("Escaneo con memo", test_memo_matches_bytes),
+        ("Escaneo por fragmentos", test_shards_match_bytes),
+        ("Errores agrupados", test_grouped_errors),
+        ("Bytes inválidos", test_invalid_bytes),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
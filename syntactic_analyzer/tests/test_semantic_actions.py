@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las acciones semánticas y la pila de valores de LRParser.
+"""
+
+import sys
+import os
+import io
+import contextlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing_LR import LRParser, compile_semantic_action
+from parser_generator import build_slr_from_yalp
+from yapar_parser2 import YalpParser
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+# Gramática de slr-1 con acciones declaradas en el .yalp
+YALP_WITH_ACTIONS = """
+%token ID
+%token PLUS
+%token TIMES
+%token LPAREN RPAREN
+
+expression:
+    expression PLUS term    { $1 + $3 }
+  | term
+;
+term:
+    term TIMES factor       { $1 * $3 }
+  | factor
+;
+factor:
+    LPAREN expression RPAREN { $2 }
+  | ID                       { int($1) }
+;
+"""
+
+# 2 + 3 * (4 + 5)
+TOKENS = ['ID', 'PLUS', 'ID', 'TIMES', 'LPAREN', 'ID', 'PLUS', 'ID', 'RPAREN']
+VALUES = ['2', '+', '3', '*', '(', '4', '+', '5', ')']
+
+
+def find_production(grammar, left, right):
+    for prod in grammar.production_list:
+        if prod.left == left and prod.right == right:
+            return prod.number
+    raise KeyError(f"{left} -> {' '.join(right)}")
+
+
+def test_registered_actions_build_ast():
+    """Las acciones registradas por número de producción construyen un AST"""
+    print("\n=== TEST: Acciones registradas ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = LRParser(table, grammar)
+    parser.register_action(find_production(grammar, 'expression', ['expression', 'PLUS', 'term']),
+                           lambda left, op, right: ('+', left, right))
+    parser.register_action(find_production(grammar, 'term', ['term', 'TIMES', 'factor']),
+                           lambda left, op, right: ('*', left, right))
+    parser.register_action(find_production(grammar, 'factor', ['LPAREN', 'expression', 'RPAREN']),
+                           lambda lparen, expr, rparen: expr)
+
+    success, message, value = parser.parse_with_actions(TOKENS, VALUES)
+    print(f"  {message}: {value}")
+    assert success and message == "Cadena aceptada"
+    assert value == ('+', '2', ('*', '3', ('+', '4', '5')))
+
+    # Sin acciones el valor es el del primer símbolo ($$ = $1)
+    success, _, value = LRParser(table, grammar).parse_with_actions(['ID'], ['7'])
+    assert success and value == '7'
+    return True
+
+
+def test_yalp_actions_evaluate():
+    """Las acciones { ... } del .yalp se compilan y evalúan la expresión"""
+    print("\n=== TEST: Acciones declaradas en el .yalp ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        yalp_file = os.path.join(tmp, "calc.yalp")
+        with open(yalp_file, "w", encoding="utf-8") as f:
+            f.write(YALP_WITH_ACTIONS)
+        grammar, table = build_slr_from_yalp(yalp_file)
+
+    # Las acciones no agregan símbolos a las producciones
+    assert grammar.productions['factor'] == [['LPAREN', 'expression', 'RPAREN'], ['ID']]
+    parser = LRParser(table, grammar)
+    success, message, value = parser.parse_with_actions(TOKENS, VALUES)
+    print(f"  2 + 3 * (4 + 5) = {value}")
+    assert success and value == 29
+
+    # Los errores se reportan igual que en parse
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = parser.parse(['ID', 'PLUS'], verbose=False)
+    assert parser.parse_with_actions(['ID', 'PLUS'], ['1', '+'])[:2] == expected
+    return True
+
+
+def test_compile_semantic_action():
+    """$i fuera del lado derecho es un error al compilar la acción"""
+    print("\n=== TEST: Compilación de acciones ===")
+    assert compile_semantic_action("$1 - $2", 2)(5, 3) == 2
+    assert compile_semantic_action("abs($1)", 1, {'abs': abs})(-4) == 4
+    try:
+        compile_semantic_action("$3", 2)
+    except ValueError:
+        return True
+    assert False, "se esperaba ValueError"
+
+
+def test_action_on_empty_alternative():
+    """Una acción en una alternativa vacía es un error del .yalp, no se descarta"""
+    print("\n=== TEST: Acción en alternativa vacía ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        yalp_file = os.path.join(tmp, "vacia.yalp")
+        with open(yalp_file, "w", encoding="utf-8") as f:
+            f.write(YALP_WITH_ACTIONS.replace("  | ID                       { int($1) }",
+                                              "  | ID                       { int($1) }\n  | { 0 }"))
+        try:
+            YalpParser().parse_file(yalp_file)
+        except ValueError as e:
+            print(f"  {e}")
+            assert "factor" in str(e)
+            return True
+    assert False, "se esperaba ValueError"
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Acciones registradas", test_registered_actions_build_ast),
+        ("Acciones del .yalp", test_yalp_actions_evaluate),
+        ("Compilación de acciones", test_compile_semantic_action),
+        ("Acción en alternativa vacía", test_action_on_empty_alternative),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para SLRParser sobre entradas largas y con registro de pasos acotado.
+"""
+
+import sys
+import os
+import io
+import random
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slr_table import SLRParser
+from parsing_LR import LRParser
+from parser_generator import build_slr_from_yalp
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+
+def long_expression(n_terms):
+    """ID + ID * ( ID + ID ) + ... con n_terms términos"""
+    tokens = ['ID']
+    for i in range(n_terms - 1):
+        if i % 3 == 2:
+            tokens += ['PLUS', 'LPAREN', 'ID', 'TIMES', 'ID', 'RPAREN']
+        else:
+            tokens += ['TIMES' if i % 2 else 'PLUS', 'ID']
+    return tokens
+
+
+def test_long_input():
+    """Entradas de miles de tokens se aceptan (sin límite fijo de pasos)"""
+    print("\n=== TEST: Entrada larga ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = SLRParser(table)
+
+    tokens = long_expression(5000)
+    success, steps, message = parser.parse(tokens)
+    assert success, message
+    assert steps == []
+    assert parser.step_count > 1000
+    print(f"  {len(tokens)} tokens aceptados en {parser.step_count} pasos")
+
+    success, _, message = parser.parse(tokens + ['RPAREN'])
+    assert not success and "RPAREN" in message
+    return True
+
+
+def test_trace_ring_buffer():
+    """trace=K conserva sólo los últimos K pasos"""
+    print("\n=== TEST: Registro de pasos ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = SLRParser(table)
+
+    tokens = long_expression(50)
+    success, steps, _ = parser.parse(tokens, trace=8)
+    assert success
+    assert len(steps) == 8
+    assert [step['step'] for step in steps] == list(range(parser.step_count - 7, parser.step_count + 1))
+    assert steps[-1]['kind'] == 'accept' and steps[-1]['symbol'] == '$'
+    assert [step['kind'] for step in steps[-4:-1]] == ['reduce'] * 3
+    return True
+
+
+def test_matches_lr_parser():
+    """Mismo resultado que LRParser sobre entradas aleatorias"""
+    print("\n=== TEST: SLRParser vs LRParser ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    parser = SLRParser(table)
+    lr_parser = LRParser(table, grammar)
+
+    rng = random.Random(5)
+    symbols = ['ID', 'PLUS', 'TIMES', 'LPAREN', 'RPAREN']
+    cases = [[rng.choice(symbols) for _ in range(rng.randint(1, 10))] for _ in range(300)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for tokens in cases:
+            assert parser.parse(tokens)[0] == lr_parser.parse(tokens, verbose=False)[0], tokens
+    print(f"  {len(cases)} entradas")
+    return True
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("Entrada larga", test_long_input),
+        ("Registro de pasos", test_trace_ring_buffer),
+        ("SLRParser vs LRParser", test_matches_lr_parser),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el buffer columnar de tokens de lexical_interface.
+"""
+
+import sys
+import os
+import ast
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Raíz del repositorio, para el escritor de tokens binarios del escáner
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from lexical_interface import TokenBuffer, TokenFileReader, LexicalToken, LineIndex, BINARY_MAGIC
+import escaner
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+
+def test_buffer_from_token_file():
+    """El buffer lee los mismos tokens que read_detailed_tokens_from_file"""
+    print("\n=== TEST: TokenBuffer desde archivo de tokens ===")
+    tokens_file = os.path.join(RESOURCES, "tokens_yalp4.txt")
+    detailed = TokenFileReader.read_detailed_tokens_from_file(tokens_file)
+    buffer = TokenFileReader.read_token_buffer_from_file(tokens_file)
+
+    assert len(buffer) == len(detailed)
+    for token, view in zip(detailed, buffer):
+        assert view.token_type == token.token_type
+        assert view.line == token.line
+        # El lector de texto deja el valor escapado; el buffer lo decodifica
+        assert view.value == ast.literal_eval(f"'{token.value}'")
+    # Cada nombre de token se guarda una sola vez
+    assert len(buffer.token_names) == len(set(t.token_type for t in detailed))
+    assert buffer.token_types() == [t.token_type for t in detailed]
+    print(f"  {len(buffer)} tokens, {len(buffer.token_names)} tipos distintos")
+    return True
+
+
+def test_buffer_from_scan_positions():
+    """Offsets del escáner: lexemas por corte y línea/columna en caracteres"""
+    print("\n=== TEST: TokenBuffer desde el escáner ===")
+    source = "x := 5;\r\nñu := x\n"
+    # (id_token, inicio, fin) en bytes, como escaner.escanear_bytes
+    data = source.encode('utf-8')
+    names = ["ERROR", "ID", "WS", "ASSIGNOP", "NUMBER", "SEMICOLON"]
+    spans = [(1, 0, 1), (2, 1, 2), (3, 2, 4), (2, 4, 5), (4, 5, 6), (5, 6, 7), (2, 7, 9),
+             (1, 9, 12), (2, 12, 13), (3, 13, 15), (2, 15, 16), (1, 16, 17), (2, 17, 18)]
+    buffer = TokenBuffer.from_scan(data, spans, names)
+
+    values = [view.value for view in buffer]
+    assert "".join(values) == source.replace("\r\n", "\n")
+    assert buffer[7].value == "ñu" and (buffer[7].line, buffer[7].column) == (2, 1)
+    assert (buffer[9].line, buffer[9].column) == (2, 4)
+    assert (buffer[-1].line, buffer[-1].column) == (2, 8)
+    assert buffer[4].to_token() == LexicalToken("NUMBER", "5", 1, 6)
+    print(f"  {[(v.token_type, v.line, v.column) for v in buffer if v.token_type != 'WS']}")
+    return True
+
+
+def test_bulk_reader():
+    """El lector por bloques da los mismos tokens que el lector línea por línea"""
+    print("\n=== TEST: Lector por bloques ===")
+    tokens_file = os.path.join(RESOURCES, "tokens_yalp2.txt")
+    expected = TokenFileReader.read_tokens_from_file(tokens_file)
+    assert TokenFileReader.read_tokens_bulk(tokens_file) == expected
+
+    detailed = TokenFileReader.read_detailed_tokens_from_file(tokens_file)
+    # Bloques pequeños: las líneas quedan partidas entre bloques
+    ids, names = TokenFileReader.read_token_ids_from_file(tokens_file, block_size=37)
+    assert [names[token_id] for token_id in ids] == [t.token_type for t in detailed]
+    print(f"  {len(ids)} tokens, {len(names)} tipos")
+    return True
+
+
+def test_line_index():
+    """Índice de líneas con \\n, \\r\\n y \\r sueltos, columnas en caracteres"""
+    print("\n=== TEST: LineIndex ===")
+    data = "a\r\nbé\rc\n\nd".encode('utf-8')
+    index = LineIndex(data)
+    assert list(index.starts) == [0, 3, 7, 9, 10]
+    assert index.position(0) == (1, 1)
+    assert index.position(data.index("é".encode('utf-8')) + 2) == (2, 3)
+    assert index.position(data.index(b"c")) == (3, 1)
+    assert index.position(len(data) - 1) == (5, 1)
+    assert LineIndex("x\ny").position(2) == (2, 1)
+    print(f"  inicios de línea: {list(index.starts)}")
+    return True
+
+
+def test_binary_token_file():
+    """El formato binario conserva tipos y lexemas y se lee igual que el de texto"""
+    print("\n=== TEST: Archivo binario de tokens ===")
+    tokens_file = os.path.join(RESOURCES, "tokens_yalp4.txt")
+    text_buffer = TokenFileReader.read_token_buffer_from_file(tokens_file)
+    pairs = [(view.value, view.token_type) for view in text_buffer]
+    # Lexemas con saltos de línea, comillas, no ASCII y uno de más de 127 bytes
+    pairs += [("\n\n", "WS"), ("'", "ERROR"), ("ñandú", "ID"), ("x" * 300, "ID")]
+    names = ["ERROR"] + sorted(set(token for _, token in pairs) - {"ERROR"})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_file = os.path.join(tmp, "tokens.tokb")
+        text_file = os.path.join(tmp, "tokens.txt")
+        assert escaner.escribir_tokens_binario(pairs, binary_file, names) == len(pairs)
+        buffer = TokenFileReader.read_token_buffer_from_file(binary_file)
+        assert [(view.value, view.token_type) for view in buffer] == pairs
+        assert TokenFileReader.read_tokens_from_file(binary_file) == [
+            token for _, token in pairs if token not in TokenFileReader.IGNORED_TOKENS]
+
+        # La exportación de texto es la del escáner
+        buffer.write_text(text_file)
+        escaner.escribir_tokens(pairs, os.path.join(tmp, "expected.txt"))
+        with open(text_file, encoding="utf-8") as f, open(os.path.join(tmp, "expected.txt"), encoding="utf-8") as g:
+            assert f.read() == g.read()
+        size = os.path.getsize(binary_file)
+
+        # Posiciones a partir de los lexemas concatenados
+        text = "".join(value for value, _ in pairs)
+        last = len(pairs) - 1
+        start = len(text) - len(pairs[last][0])
+        line = text.count("\n", 0, start) + 1
+        assert buffer.position(last) == (line, start - text.rfind("\n", 0, start))
+        # Cerrar el mmap antes de borrar el directorio
+        buffer.source.close()
+    print(f"  {len(pairs)} tokens en {size} bytes")
+    return True
+
+
+def test_binary_format_shared():
+    """Escritor y lector usan el formato de escaner: varints largos y registros truncados"""
+    print("\n=== TEST: Formato binario compartido ===")
+    assert BINARY_MAGIC is escaner.MAGIA_BINARIA
+    # Más de 127 tipos (ids de dos bytes) y lexemas de más de 127 bytes
+    names = ["ERROR"] + [f"T{i}" for i in range(200)]
+    pairs = [("a" * (i % 3) * 70, f"T{i}") for i in range(0, 200, 7)] + [("\udcff", "ERROR")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_file = os.path.join(tmp, "tokens.tokb")
+        escaner.escribir_tokens_binario(pairs, binary_file, names)
+        with open(binary_file, "rb") as f:
+            data = f.read()
+        read_names, pos = escaner.leer_encabezado_binario(data)
+        assert read_names == names
+        ids, starts, ends = [], [], []
+        assert escaner.leer_registros_binario(data, pos, ids, starts, ends) == len(data)
+        assert [(data[start:end].decode("utf-8", "surrogateescape"), names[token_id])
+                for token_id, start, end in zip(ids, starts, ends)] == pairs
+
+        # Un archivo cortado dentro de los registros es un error, no un IndexError
+        cut_file = os.path.join(tmp, "cortado.tokb")
+        cuts = [cut for cut in range(pos + 1, len(data)) if cut not in ends]
+        for cut in cuts:
+            with open(cut_file, "wb") as f:
+                f.write(data[:cut])
+            try:
+                TokenBuffer.from_binary_file(cut_file).source.close()
+            except ValueError as e:
+                assert "truncado" in str(e), cut
+                continue
+            assert False, f"se esperaba ValueError con el archivo cortado en {cut}"
+        with open(cut_file, "wb") as f:
+            f.write(b"TOKB\x02")
+        try:
+            TokenBuffer.from_binary_file(cut_file)
+        except ValueError:
+            print(f"  {len(pairs)} tokens, {len(cuts)} cortes rechazados")
+            return True
+    assert False, "se esperaba ValueError por la versión desconocida"
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("TokenBuffer desde archivo", test_buffer_from_token_file),
+        ("TokenBuffer desde escáner", test_buffer_from_scan_positions),
+        ("Lector por bloques", test_bulk_reader),
+        ("LineIndex", test_line_index),
+        ("Archivo binario", test_binary_token_file),
+        ("Formato binario compartido", test_binary_format_shared),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
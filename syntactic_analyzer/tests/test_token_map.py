@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para CompiledTokenMap (traducción de tokens del léxico a terminales).
+"""
+
+import sys
+import os
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexical_interface import CompiledTokenMap, LexicalInterface, TokenFileReader
+from parser_generator import build_slr_from_yalp
+from slr_table import compile_slr_table
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+
+def test_map_matches_token_mapper():
+    """El mapa compilado da los mismos terminales que TokenMapper.filter_tokens_for_syntax"""
+    print("\n=== TEST: CompiledTokenMap vs TokenMapper ===")
+    grammar, table = build_slr_from_yalp(os.path.join(RESOURCES, "slr-2.yalp"))
+    compiled = compile_slr_table(table, grammar)
+    tokens_file = os.path.join(RESOURCES, "tokens_yalp2.txt")
+
+    interface = LexicalInterface()
+    expected = interface.load_tokens_from_file(tokens_file)
+    terminal_ids, token_map = interface.load_terminal_ids_from_file(tokens_file, compiled.terminals)
+
+    assert token_map.terminals == compiled.terminals
+    assert [compiled.terminals[i] for i in terminal_ids] == expected
+    ids, names = TokenFileReader.read_token_ids_from_file(tokens_file)
+    assert token_map.map_names(ids) == expected
+    print(f"  {len(ids)} tokens del léxico -> {len(terminal_ids)} terminales")
+    return True
+
+
+def test_validation_and_special_tokens():
+    """Tokens sin terminal fallan al construir; ERROR pasa como UNKNOWN y WS se descarta"""
+    print("\n=== TEST: Validación del mapa ===")
+    grammar, _ = build_slr_from_yalp(os.path.join(RESOURCES, "slr-1.yalp"))
+    token_map = CompiledTokenMap.for_grammar(["ERROR", "ID", "WS", "PLUS", "IDENTIFIER"], grammar)
+    ids = array('H', [1, 2, 3, 2, 4, 0])
+    mapped = token_map.map_ids(ids)
+    assert [token_map.terminals[i] if i >= 0 else i for i in mapped] == \
+        ["ID", "PLUS", "ID", CompiledTokenMap.UNKNOWN]
+    assert token_map.map_names(ids) == ["ID", "PLUS", "ID", "ERROR"]
+    assert token_map.map_ids([1, 2]) == array('h', [token_map.terminal_ids["ID"]])
+
+    try:
+        CompiledTokenMap.for_grammar(["ID", "NUMBER", "ASSIGN"], grammar)
+    except ValueError as e:
+        print(f"  {e}")
+        assert "NUMBER" in str(e) and "ASSIGN -> ASSIGNOP" in str(e)
+        return True
+    assert False, "se esperaba ValueError"
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    tests = [
+        ("CompiledTokenMap vs TokenMapper", test_map_matches_token_mapper),
+        ("Validación del mapa", test_validation_and_special_tokens),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            success = test_func()
+        except AssertionError as e:
+            print(f"\n✗ {test_name}: FALLÓ {e}")
+            success = False
+        results.append((test_name, success))
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} pruebas pasaron")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
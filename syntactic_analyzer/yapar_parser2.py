@@ -1,7 +1,11 @@
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Set
 
+# Terminal reservado para la recuperación de errores (como en yacc): una producción
+# como `stmt: error SEMICOLON` indica dónde reanudar después de un error sintáctico
+ERROR_TOKEN = 'error'
+
 @dataclass
 class Grammar:
     terminals: Set[str]
@@ -9,16 +13,25 @@ class Grammar:
     productions: Dict[str, List[List[str]]]
     start_symbol: str
     ignored_tokens: Set[str]
+    # Acciones semánticas { ... } por no terminal e índice de la alternativa
+    actions: Dict[str, Dict[int, str]] = field(default_factory=dict)
 
     def to_dict(self):
         """Convert the Grammar object to a dictionary for JSON serialization"""
-        return {
+        data = {
             'terminals': list(self.terminals),
             'non_terminals': list(self.non_terminals),
             'productions': self.productions,
             'start_symbol': self.start_symbol,
             'ignored_tokens': list(self.ignored_tokens)
         }
+        # Sólo se escribe la llave si la gramática declara acciones
+        if self.actions:
+            data['actions'] = {
+                nt: {str(idx): code for idx, code in actions.items()}
+                for nt, actions in self.actions.items()
+            }
+        return data
 
 class YalpParser:
     def __init__(self):
@@ -27,6 +40,7 @@ class YalpParser:
         self.productions = {}
         self.start_symbol = None
         self.ignored_tokens = set()
+        self.actions = {}
     
     def is_whitespace(self, c):
         """Check if a character is whitespace"""
@@ -49,13 +63,20 @@ class YalpParser:
         content = self.remove_comments(content)
         self.process_content(content)
         
+        # The reserved error token is a terminal when a production uses it
+        if ERROR_TOKEN not in self.non_terminals and any(
+                ERROR_TOKEN in production
+                for productions in self.productions.values() for production in productions):
+            self.terminals.add(ERROR_TOKEN)
+        
         # Create and return Grammar object
         return Grammar(
             terminals=self.terminals,
             non_terminals=self.non_terminals,
             productions=self.productions,
             start_symbol=self.start_symbol,
-            ignored_tokens=self.ignored_tokens
+            ignored_tokens=self.ignored_tokens,
+            actions=self.actions
         )
     
     def remove_comments(self, content: str) -> str:
@@ -148,6 +169,7 @@ class YalpParser:
         
         i = start_idx
         productions_for_nt = []
+        actions_for_nt = {}
         current_production = []
         
         # Skip whitespace before first production
@@ -179,6 +201,16 @@ class YalpParser:
                 symbol = content[symbol_start:i]
                 if symbol:  # Only add non-empty symbols
                     current_production.append(symbol)
+            
+            # Handle semantic action block { ... } of the current production
+            elif content[i] == '{':
+                if not current_production:
+                    # Las alternativas vacías se descartan, así que la acción no tendría producción
+                    raise ValueError(
+                        f"Acción semántica en una alternativa vacía de '{non_terminal}' "
+                        f"en la posición {i}")
+                i, code = self.read_action_block(content, i)
+                actions_for_nt[len(productions_for_nt)] = code
             else:
                 i += 1  # Skip other characters
         
@@ -189,12 +221,31 @@ class YalpParser:
         # Store the productions for this non-terminal
         if productions_for_nt:
             self.productions[non_terminal] = productions_for_nt
+        if actions_for_nt:
+            self.actions[non_terminal] = actions_for_nt
         
         # Skip the semicolon
         if i < len(content) and content[i] == ';':
             i += 1
         
         return i
+    
+    def read_action_block(self, content: str, start_idx: int):
+        """
+        Read a brace-balanced action block starting at content[start_idx] == '{'.
+        Returns the index after the closing brace and the stripped code.
+        """
+        depth = 0
+        i = start_idx
+        while i < len(content):
+            if content[i] == '{':
+                depth += 1
+            elif content[i] == '}':
+                depth -= 1
+                if depth == 0:
+                    return i + 1, content[start_idx + 1:i].strip()
+            i += 1
+        raise ValueError(f"Acción semántica sin cerrar en la posición {start_idx}")
 
 def parse_yalp_file(file_path: str) -> Grammar:
     """Parse a .yalp file and return a Grammar object"""
@@ -0,0 +1,89 @@
+"""
+Etapa de visualización opcional del generador de analizadores léxicos.
+
+Generar las imágenes (árboles de expresión, AFD por regla, AFN global, AFD final)
+lanza un proceso `dot` por archivo, que tarda mucho más que construir los autómatas.
+Por eso el renderizado sólo ocurre si se pide explícitamente (--render o la variable
+de entorno RENDER_GRAPHVIZ=1). Cuando está deshabilitada, la etapa no construye ni
+siquiera el código DOT.
+
+Uso:
+    etapa = EtapaVisualizacion(habilitada=True)
+    etapa.registrar(afd_a_dot, "output/afd/afd_min", afd, token_type=...)
+    ...
+    etapa.esperar()
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import perfilado
+
+try:
+    import graphviz
+except ImportError:
+    graphviz = None
+
+VARIABLE_ENTORNO = "RENDER_GRAPHVIZ"
+VALORES_VERDADEROS = {"1", "true", "si", "sí", "yes", "on"}
+
+
+def render_habilitado(valor=None):
+    """Indica si el renderizado está pedido (por argumento o por la variable de entorno)."""
+    if valor is not None:
+        return bool(valor)
+    return os.environ.get(VARIABLE_ENTORNO, "").strip().lower() in VALORES_VERDADEROS
+
+
+class EtapaVisualizacion:
+    """
+    Acumula los grafos a renderizar. El DOT se construye al registrar (así refleja el
+    estado del autómata en ese momento) y el `dot` se ejecuta en un pool de hilos en
+    segundo plano; esperar() bloquea hasta que terminan todos.
+    """
+
+    def __init__(self, habilitada=None, max_hilos=4):
+        self.habilitada = render_habilitado(habilitada)
+        if self.habilitada and graphviz is None:
+            print("La biblioteca 'graphviz' no está instalada; no se generarán imágenes.")
+            self.habilitada = False
+        self.max_hilos = max_hilos
+        self._ejecutor = None
+        self._pendientes = []
+
+    def registrar(self, fabrica, archivo, *args, **kwargs):
+        """
+        Registra un grafo: fabrica(*args, **kwargs) debe devolver un graphviz.Digraph.
+        No hace nada si la etapa está deshabilitada.
+        """
+        if not self.habilitada:
+            return
+        with perfilado.etapa("visualizacion_dot"):
+            dot = fabrica(*args, **kwargs)
+        perfilado.contar("imagenes")
+        directorio = os.path.dirname(archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        if self._ejecutor is None:
+            self._ejecutor = ThreadPoolExecutor(max_workers=self.max_hilos)
+        self._pendientes.append((archivo, self._ejecutor.submit(_renderizar, dot, archivo)))
+
+    def esperar(self):
+        """Espera a que terminen los renderizados pendientes. Devuelve los archivos generados."""
+        generados = []
+        for archivo, futuro in self._pendientes:
+            try:
+                generados.append(futuro.result())
+            except Exception as e:
+                print(f"Error al generar {archivo}: {e}")
+        self._pendientes = []
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown()
+            self._ejecutor = None
+        if generados:
+            print(f"Se generaron {len(generados)} imágenes.")
+        return generados
+
+
+def _renderizar(dot, archivo):
+    return dot.render(archivo, format="png", cleanup=True)
@@ -1,6 +1,8 @@
 import sys
 import os
-os.makedirs("output", exist_ok=True)
+import re
+
+import perfilado
 
 def leer_archivo_char_por_char(ruta_archivo):
     """Lee un archivo carácter por carácter y devuelve su contenido como string."""
@@ -208,26 +210,6 @@ def extraer_trailer_char_por_char(yalex_code):
     
     return trailer, yalex_code
 
-#NOMBRE YALEX
-if len(sys.argv) > 1:
-    yalex = sys.argv[1]
-else:
-    yalex = 'output/yalexs/slr-4.yal'
-
-# Llamamos a yalex_parser una sola vez y guardamos los resultados
-header, expresiones, reglas, trailer = yalex_parser(yalex)
-
-with open("output/info_current_yal.txt", "w", encoding="utf-8") as f:
-    f.write("header:\n" + header + "\n\n")
-    f.write("EXPRESIONES ENCONTRADAS:\n")
-    for exp in expresiones:
-        f.write(exp + "\n")
-    f.write("\nREGLAS ENCONTRADAS:\n")
-    for reg in reglas:
-        f.write(reg + "\n")
-    f.write("\ntrailer:\n" + trailer + "\n")
-
-
 # despues de extraer yal.
 def expand_definitions_recursivo(definiciones):
     """Expande todas las definiciones recursivamente."""
@@ -520,14 +502,65 @@ def expand_printable_chars():
     union = '|'.join("'" + c + "'" for c in printable_chars)
     return '(' + union + ')'
     
+def separar_accion(regla):
+    """
+    Separa una regla en (patrón, acción): la acción es el texto entre la primera '{'
+    que no está dentro de un literal ('...' o "...") ni de una clase [...] y la última
+    '}'. Si la regla no tiene acción devuelve (regla, None).
+    """
+    i = 0
+    while i < len(regla):
+        c = regla[i]
+        if c == "'":
+            _, i = extraer_literal(regla, i)
+        elif c == '"':
+            _, i = extraer_literal_doble(regla, i)
+        elif c == '[':
+            # Clase de caracteres: puede contener literales con ']' o '{'
+            i += 1
+            while i < len(regla) and regla[i] != ']':
+                if regla[i] == "'":
+                    _, i = extraer_literal(regla, i)
+                elif regla[i] == '"':
+                    _, i = extraer_literal_doble(regla, i)
+                else:
+                    i += 1
+            i += 1
+        elif c == '{':
+            fin = regla.rfind('}')
+            return regla[:i].strip(), regla[i + 1:fin if fin > i else len(regla)]
+        else:
+            i += 1
+    return regla.strip(), None
+
+_RETURN = re.compile(r"\breturn\b")
+
+def accion_de_regla(regla):
+    """
+    Devuelve (patrón, token, código) de una regla con acción { ... return TOKEN }, o
+    None si no tiene. El token y el código se separan en el último return: el código
+    es lo que va antes (sin el ';' final).
+    """
+    patron, accion = separar_accion(regla)
+    if accion is None:
+        return None
+    ultimo = None
+    for ultimo in _RETURN.finditer(accion):
+        pass
+    if ultimo is None:
+        return None
+    token = accion[ultimo.end():].strip().rstrip(';').strip()
+    codigo = accion[:ultimo.start()].strip().rstrip(';').strip()
+    return patron, token, codigo
+
 def procesar_reglas(reglas, definiciones_expandidas):
     """Procesa las reglas y expande las referencias usando las definiciones."""
     reglas_procesadas = []
     for regla in reglas:
         # Si la regla contiene acción (indicada por '{' y 'return')
-        if '{' in regla and 'return' in regla:
-            patron = regla[:regla.find('{')].strip()
-            token = regla[regla.find('return') + 6:].replace('}', '').strip()
+        accion = accion_de_regla(regla)
+        if accion is not None:
+            patron, token, _ = accion
         else:
             # Si no tiene acción, se toma la regla completa
             patron = regla.strip()
@@ -549,6 +582,30 @@ def procesar_reglas(reglas, definiciones_expandidas):
 
     return reglas_procesadas
 
+def extraer_acciones(reglas):
+    """
+    Devuelve {token: código} con el cuerpo de las acciones { ... } que hacen algo más que
+    'return TOKEN'. El código es el que va antes del último return (separado por ';') y
+    el token el que va después (ver accion_de_regla). Las acciones que sólo retornan el token no se
+    incluyen.
+    """
+    acciones = {}
+    for regla in reglas:
+        accion = accion_de_regla(regla)
+        if accion is None:
+            continue
+        _, token, codigo = accion
+        if codigo:
+            acciones[token] = codigo
+    return acciones
+
+def leer_acciones_yal(archivo_yal):
+    """Lee un .yal y devuelve (header, {token: código de la acción})."""
+    yalex_code = delete_comments(leer_archivo_char_por_char(archivo_yal))
+    header, yalex_code = extraer_header(yalex_code)
+    reglas = extraer_reglas_char_por_char(yalex_code)
+    return header, extraer_acciones(reglas)
+
 def generar_expresion_infix(reglas_procesadas):
     """Genera la gran expresión infix final con anotación del token."""
     especiales = {'+', '-', '*', '/', '(', ')', '|', '?', ':', ';', '=', '<'}
@@ -576,44 +633,88 @@ def generar_final_infix_total(reglas_procesadas):
     
     return final_expr
 
-with open('output/info_current_yal.txt', 'r', encoding='utf-8') as f:
-    contenido = f.read()
+# Programa principal: procesa el .yal y genera los archivos de output/
+# Con --perfil ARCHIVO (o PERFIL_LEXER=directorio) escribe el reporte de perfilado.
+def main(argv=None):
+    argv = list(sys.argv if argv is None else argv)
+    ruta_perfil = None
+    if "--perfil" in argv:
+        i = argv.index("--perfil")
+        ruta_perfil = argv[i + 1]
+        del argv[i:i + 2]
+    os.makedirs("output", exist_ok=True)
+
+    #NOMBRE YALEX
+    if len(argv) > 1:
+        yalex = argv[1]
+    else:
+        yalex = 'output/yalexs/slr-4.yal'
 
-# Extraer solo la sección de expresiones
-expresiones = extraer_expresiones_del_txt(contenido)
-# Convertir a diccionario de definiciones
-definiciones = procesar_expresiones(expresiones)
+    perfil = perfilado.iniciar("yalex_parser", ruta_perfil)
+    if perfil is not None:
+        perfil.anotar("yal", yalex)
 
+    # Llamamos a yalex_parser una sola vez y guardamos los resultados
+    with perfilado.etapa("yalex_parser"):
+        header, expresiones, reglas, trailer = yalex_parser(yalex)
 
-# Expandir las definiciones de forma recursiva
-expandidas = expand_definitions_recursivo(definiciones)
+    with open("output/info_current_yal.txt", "w", encoding="utf-8") as f:
+        f.write("header:\n" + header + "\n\n")
+        f.write("EXPRESIONES ENCONTRADAS:\n")
+        for exp in expresiones:
+            f.write(exp + "\n")
+        f.write("\nREGLAS ENCONTRADAS:\n")
+        for reg in reglas:
+            f.write(reg + "\n")
+        f.write("\ntrailer:\n" + trailer + "\n")
 
-# Extraer las reglas (de la parte de REGLAS ENCONTRADAS del archivo)
-reglas = extraer_reglas_del_txt(contenido)
+    with open('output/info_current_yal.txt', 'r', encoding='utf-8') as f:
+        contenido = f.read()
 
-# Procesar las reglas y expandir
-reglas_procesadas = procesar_reglas(reglas, expandidas)
+    # Extraer solo la sección de expresiones
+    expresiones = extraer_expresiones_del_txt(contenido)
+    # Convertir a diccionario de definiciones
+    definiciones = procesar_expresiones(expresiones)
 
-infix_final = generar_expresion_infix(reglas_procesadas)
 
-# Guardar definiciones y reglas en el mismo archivo
-with open('output/processed_definitions.txt', 'w', encoding='utf-8') as f:
-    f.write("---- Processed Definitions ----\n")
-    for nombre, expr in expandidas.items():
-        f.write(f"  -> {nombre} = {expr}\n")
+    # Expandir las definiciones de forma recursiva
+    with perfilado.etapa("expandir_definiciones"):
+        expandidas = expand_definitions_recursivo(definiciones)
+    perfilado.contar("definiciones", len(expandidas))
 
-    f.write("\n---- Rules processed ----\n")
-    for regla in reglas_procesadas:
-        f.write(f"  {regla}\n")
+    # Extraer las reglas (de la parte de REGLAS ENCONTRADAS del archivo)
+    reglas = extraer_reglas_del_txt(contenido)
+
+    # Procesar las reglas y expandir
+    with perfilado.etapa("procesar_reglas"):
+        reglas_procesadas = procesar_reglas(reglas, expandidas)
+    perfilado.contar("reglas", len(reglas_procesadas))
+
+    infix_final = generar_expresion_infix(reglas_procesadas)
+
+    # Guardar definiciones y reglas en el mismo archivo
+    with open('output/processed_definitions.txt', 'w', encoding='utf-8') as f:
+        f.write("---- Processed Definitions ----\n")
+        for nombre, expr in expandidas.items():
+            f.write(f"  -> {nombre} = {expr}\n")
+
+        f.write("\n---- Rules processed ----\n")
+        for regla in reglas_procesadas:
+            f.write(f"  {regla}\n")
+
+        f.write("\n---- Infix final ----\n")
+        f.write(infix_final)
+
+    with open('output/final_infix.txt', 'w', encoding='utf-8') as f:
+        f.write(infix_final)
 
-    f.write("\n---- Infix final ----\n")
-    f.write(infix_final)
+    infix_final = generar_final_infix_total(reglas_procesadas)
+    infix_final = convertir_puntos_a_literal(infix_final)
 
-with open('output/final_infix.txt', 'w', encoding='utf-8') as f:
-    f.write(infix_final)
+    with open('output/final_infix.txt', 'w', encoding='utf-8') as f:
+        f.write(infix_final)
+    perfilado.terminar()
 
-infix_final = generar_final_infix_total(reglas_procesadas)
-infix_final = convertir_puntos_a_literal(infix_final)
 
-with open('output/final_infix.txt', 'w', encoding='utf-8') as f:
-    f.write(infix_final)
\ No newline at end of file
+if __name__ == "__main__":
+    main()